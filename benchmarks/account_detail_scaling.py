@@ -0,0 +1,42 @@
+"""
+Times parse_account_detail on synthetic account pages of increasing size, the time per holding should stay flat.
+
+    PYTHONPATH=. python3 benchmarks/account_detail_scaling.py [--sizes 10 100 1000] [--parser lxml]
+"""
+import argparse
+import time
+
+from generators import generate_account_detail
+from hargreaves.account.models import AccountSummary
+from hargreaves.account.parsers.parsers import parse_account_detail
+from hargreaves.utils.soup import ParserBackend
+
+
+def measure(count: int, parser: ParserBackend, runs: int) -> float:
+    account_detail_html, account_detail_csv = generate_account_detail(count)
+    account_summary = AccountSummary(account_id=1, account_type='SIPP')
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        account_detail = parse_account_detail(account_detail_html, account_detail_csv, account_summary, parser=parser)
+        timings.append(time.perf_counter() - started)
+        assert len(account_detail.investments) == count
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='parse_account_detail scaling benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 250, 500, 1000])
+    parser.add_argument('--parser', default=ParserBackend.HTML_PARSER.value,
+                        choices=[backend.value for backend in ParserBackend])
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'holdings':>10} {'total ms':>10} {'ms/holding':>12}")
+    for count in args.sizes:
+        seconds = measure(count, ParserBackend(args.parser), args.runs)
+        print(f"{count:>10} {seconds * 1000:>10.1f} {seconds * 1000 / count:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
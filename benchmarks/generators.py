@@ -0,0 +1,142 @@
+"""
+Synthetic HL pages for the benchmarks, shaped like the fixtures under tests/unit
+"""
+import json
+import random
+import string
+
+HOLDING_ROW = """
+<tr>
+    <td>
+        <div>
+            <a class="link-headline" href="https://online.hl.co.uk/my-accounts/security_movements/sedol/{sedol}"
+               title="View trading history"><span class="text-bold">{name}</span></a>
+            <br/><span class="text-mini">Ord 1p</span>
+        </div>
+    </td>
+    <td class="align-right">{units}</td>
+    <td class="align-right streaming-price-metric"><span class="detail">{price}</span></td>
+    <td class="align-right">
+        <span id="live_price_value_{ticker}" class="box-block"><span class="detail">{value}</span></span>
+    </td>
+    <td class="align-right"><span class="detail">{cost}</span></td>
+    <td class="align-right day-change">
+        <span id="ls-change-{ticker}" class="positive detail">1.00</span>
+        <span id="ls-perc-{ticker}" class="positive detail">0.10</span>
+    </td>
+    <td class="actions-field align-center align-middle">
+        <div class="icon-container">
+            <a href="https://online.hl.co.uk/my-accounts/security_details/sedol/{sedol}" title="View factsheet"
+               class="factsheet-button"></a>
+            <a href="https://online.hl.co.uk/my-accounts/security_deal/sedol/{sedol}"
+               title="Place a deal or conversion" class="deal-button"></a>
+        </div>
+    </td>
+</tr>"""
+
+
+def _code(rng: random.Random, length: int) -> str:
+    return ''.join(rng.choice(string.ascii_uppercase + string.digits) for _ in range(length))
+
+
+def generate_holdings(count: int, seed: int = 1) -> list:
+    """
+    :return: a list of (ticker, sedol, name) tuples with unique tickers and SEDOL codes
+    """
+    rng = random.Random(seed)
+    holdings = []
+    tickers = set()
+    while len(holdings) < count:
+        ticker = _code(rng, 4)
+        if ticker in tickers:
+            continue
+        tickers.add(ticker)
+        holdings.append((ticker, _code(rng, 7), f'Security {len(holdings)} plc'))
+    return holdings
+
+
+def generate_account_detail(count: int, seed: int = 1):
+    """
+    An account summary page and its CSV with count holdings
+    :return: (html, csv)
+    """
+    holdings = generate_holdings(count, seed)
+    rows = ''.join(HOLDING_ROW.format(ticker=f'{ticker}-L' if index % 2 else ticker, sedol=sedol, name=name,
+                                      units=100, price='123.45', value='123.45', cost='100.00')
+                   for index, (ticker, sedol, name) in enumerate(holdings))
+    html = f"""<html><head><title>Account summary</title></head><body>
+<table class="holdings-table"><tbody>{rows}</tbody></table>
+</body></html>"""
+
+    csv_lines = ['HL SIPP, , , ,', 'Client Name:,Mr Joe Bloggs, , ,', '',
+                 'Stock value:,"12,345.67", , ,', 'Total cash:,"1,925.44", , ,',
+                 'Amount available to invest:,"1,900.44", , ,', 'Total value:,"14,271.11", , ,', '',
+                 'Code,Stock,Units held,Price (pence),Value (£),Cost (£),Gain/loss (£),Gain/loss (%),']
+    csv_lines += [f'"{ticker}","{name}","100","123.45","123.45","100.00","23.45","23.45"'
+                  for ticker, sedol, name in holdings]
+    csv_lines += ['"","Totals","","","12,345.67","10,000.00","2,345.67","23.45"', '']
+    return html, '\n'.join(csv_lines)
+
+
+PENDING_ORDER_ROW = """
+<input type="hidden" name="{order_id}_trade_type[]" value="{trade_type}" />
+<input type="hidden" name="{order_id}_sedol[]" value="{sedol}" />
+<input type="hidden" name="{order_id}_stoktitle[]" value="{name}" />
+<input type="hidden" name="{order_id}_quantity[]" value="100" />
+<input type="hidden" name="{order_id}_qty_is_money[]" value="0" />
+<tr class="row-odd" style="line-height: 1.58em;">
+    <td>23/03/22</td>
+    <td class="align-center">
+        <a href="https://online.hl.co.uk/my-accounts/security_details/sedol/{sedol}" class="link-headline">{sedol}</a>
+    </td>
+    <td class="text-right">100</td>
+    <td>
+        <a href="https://online.hl.co.uk/my-accounts/security_movements?sedol={sedol}"
+           class="link-headline show_link">{name}</a> NPV
+    </td>
+    <td class="align-center">{trade_type_name}</td>
+    <td class="text-right">-</td>
+    <td class="align-center align-nowrap">Pending</td>
+    <td class="actions-field">
+        <button name="cancel" value="cancel" alt="cancel" title="Cancel this pending order"
+                class="delete-button pointer icon-only"
+                onclick="document.getElementById('bref_eq').value='{order_id}'"/>
+    </td>
+</tr>"""
+
+
+def generate_pending_orders(count: int, seed: int = 1) -> str:
+    """
+    A pending orders page with count orders
+    """
+    rows = ''.join(PENDING_ORDER_ROW.format(order_id=151813955 + index, sedol=sedol, name=name,
+                                            trade_type='B' if index % 2 else 'S',
+                                            trade_type_name='Buy' if index % 2 else 'Sell')
+                   for index, (ticker, sedol, name) in enumerate(generate_holdings(count, seed)))
+    return f"""<html><head><title>Pending orders</title></head><body>
+<form method="post" action="https://online.hl.co.uk/my-accounts/pending_orders/account/70">
+<table class="hl-table" summary="Your current pending orders">
+<thead><tr>
+    <th>Order date</th><th>Code</th><th>Quantity</th><th>Stock</th><th>Order<br/>type</th><th>Limit<br/>price</th>
+    <th>Status</th><th>Cancel</th>
+</tr></thead>
+<tbody>{rows}</tbody>
+</table>
+</form>
+</body></html>"""
+
+
+def generate_search_results(count: int, seed: int = 1) -> str:
+    """
+    A JSONP search response with count docs, every other one without a stock_ticker
+    """
+    docs = []
+    for index, (ticker, sedol, name) in enumerate(generate_holdings(count, seed)):
+        doc = {'id': sedol, 'identifier': name, 'category': 'E', 'epic': ticker, 'internet_allowed': 'Y',
+               'score': 10.5, 'unit_type': 'E', 'loaded': '2022-03-23T00:00:00Z'}
+        if index % 2 == 0:
+            doc['stock_ticker'] = ticker
+        docs.append(doc)
+    response = {'responseHeader': {'status': 0, 'QTime': 2, 'params': {'q': 'benchmark', 'rows': str(count)}},
+                'response': {'numFound': count, 'start': 0, 'maxScore': 10.5, 'docs': docs}}
+    return f'search.handle_response({json.dumps(response, indent=2)})'
@@ -0,0 +1,60 @@
+"""
+Measures how long importing each hargreaves package takes in a fresh interpreter, and which heavy
+dependencies it drags in.
+
+    PYTHONPATH=. python3 benchmarks/import_time.py [--runs 10]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    'hargreaves',
+    'hargreaves.config',
+    'hargreaves.search',
+    'hargreaves.account',
+    'hargreaves.session',
+    'hargreaves.orders',
+    'hargreaves.deals',
+    'hargreaves.aio',
+    'hargreaves.search.clients',
+]
+
+HEAVY_DEPENDENCIES = ['bs4', 'requests', 'requests_tracker', 'urllib3']
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'loaded': [name for name in {heavy} if name in sys.modules]}}))
+"""
+
+
+def measure(module: str, runs: int) -> dict:
+    timings = []
+    loaded = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_DEPENDENCIES)],
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output)
+        timings.append(result['seconds'])
+        loaded = result['loaded']
+    return {'module': module, 'median_ms': statistics.median(timings) * 1000, 'loaded': loaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='hargreaves import time benchmark')
+    parser.add_argument('--runs', type=int, default=10, help='fresh interpreters per module')
+    args = parser.parse_args()
+
+    print(f"{'module':<30} {'median ms':>10}  heavy dependencies loaded")
+    for module in MODULES:
+        result = measure(module, args.runs)
+        print(f"{result['module']:<30} {result['median_ms']:>10.1f}  {', '.join(result['loaded']) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
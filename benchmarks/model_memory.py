@@ -0,0 +1,117 @@
+"""
+Measures the bytes each model instance holds on top of its field values, which is what a cache of thousands of
+positions or search results pays per entry.  The models are parsed from the fixtures under tests/unit, then cloned
+field by field, in the order their __init__ sets them, so that every clone shares the field values of the parsed one.
+
+    PYTHONPATH=. python3 benchmarks/model_memory.py [--count 10000]
+"""
+import argparse
+import tracemalloc
+import types
+from pathlib import Path
+
+from hargreaves.account.models import AccountSummary
+from hargreaves.account.parsers.parsers import parse_account_detail
+from hargreaves.config.models import ApiConfiguration
+from hargreaves.deals.models import DealRequest, DealResult
+from hargreaves.orders.manual.models import ManualOrder
+from hargreaves.orders.manual.parsers import parse_manual_order_entry_page, parse_manual_order_confirmation_page
+from hargreaves.orders.market.models import MarketOrder
+from hargreaves.orders.market.parsers import parse_market_order_entry_page, parse_market_order_quote_page, \
+    parse_market_order_confirmation_page
+from hargreaves.orders.models import OrderAmountType, OrderPositionType, OrderRequest
+from hargreaves.orders.pending.parsers import parse_pending_orders
+from hargreaves.search.clients import parse_search_results
+from hargreaves.search.models import InvestmentCategoryTypes
+
+FILES = Path(__file__).parent.parent / 'tests/unit'
+
+
+def read(file_name: str) -> str:
+    return (FILES / file_name).read_text()
+
+
+def prototypes() -> list:
+    account_summary = AccountSummary(account_id=55, account_type='SIPP')
+    account_detail = parse_account_detail(read('account/files/account-summary.html'),
+                                          read('account/files/account-summary.csv'), account_summary)
+    search_results = parse_search_results(read('search/files/search-results-found.jsonp'))
+    pending_orders = parse_pending_orders(70, read('orders/pending/files/pending-orders-2.html'))
+    market_position = parse_market_order_entry_page(
+        read('orders/market/files/all/market-order-entry-uk-equity.html'), InvestmentCategoryTypes.EQUITIES)
+    market_quote = parse_market_order_quote_page(
+        read('orders/market/files/buy/market-buy-order-quote-uk-equity.html'), InvestmentCategoryTypes.EQUITIES)
+    market_confirmation = parse_market_order_confirmation_page(
+        read('orders/market/files/buy/market-buy-order-confirmation-uk-equity.html'), InvestmentCategoryTypes.EQUITIES)
+    manual_position = parse_manual_order_entry_page(
+        read('orders/manual/files/all/manual-order-entry-uk-equity.html'), InvestmentCategoryTypes.EQUITIES)
+    manual_confirmation = parse_manual_order_confirmation_page(
+        read('orders/manual/files/buy/manual-buy-order-confirmation-uk-equity.html'), OrderAmountType.Quantity)
+    order_request = OrderRequest(sedol_code='B0YQ5W0', category_code=InvestmentCategoryTypes.EQUITIES,
+                                 position_type=OrderPositionType.Buy, position_percentage=2.5, account_id=55,
+                                 account_value=10000)
+
+    return [
+        account_summary,
+        account_detail,
+        account_detail.investments[0],
+        search_results[0],
+        pending_orders[0],
+        market_position,
+        MarketOrder(position=market_position, position_type=OrderPositionType.Buy,
+                    amount_type=OrderAmountType.Quantity, quantity=10, including_charges=False),
+        market_quote,
+        market_confirmation,
+        manual_position,
+        ManualOrder(position=manual_position, position_type=OrderPositionType.Buy,
+                    amount_type=OrderAmountType.Quantity, quantity=10, limit=None),
+        manual_confirmation,
+        order_request,
+        DealRequest(stock_ticker='GAW', account_id=55, position_type=OrderPositionType.Buy, position_percentage=2.5),
+        DealResult(order_request=order_request, order_confirmation=market_confirmation),
+        ApiConfiguration(username='user', password='password', date_of_birth='010170', secure_number='123456'),
+    ]
+
+
+def fields(instance) -> list:
+    """
+    The (name, value) of every field, from the instance __dict__ or, for slotted classes, from the slots
+    """
+    if hasattr(instance, '__dict__'):
+        return list(vars(instance).items())
+    return [(name, getattr(instance, name)) for cls in reversed(type(instance).__mro__)
+            for name, member in vars(cls).items() if isinstance(member, types.MemberDescriptorType)]
+
+
+def clone(prototype, prototype_fields: list):
+    instance = object.__new__(type(prototype))
+    for name, value in prototype_fields:
+        object.__setattr__(instance, name, value)
+    return instance
+
+
+def bytes_per_instance(prototype, count: int) -> float:
+    prototype_fields = fields(prototype)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    clones = [clone(prototype, prototype_fields) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list holding the clones is not part of an instance
+    list_bytes = clones.__sizeof__()
+    return (after - before - list_bytes) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Model memory benchmark')
+    parser.add_argument('--count', type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'model':<28} {'bytes/instance':>15} {'has __dict__':>13}")
+    for prototype in prototypes():
+        size = bytes_per_instance(prototype, args.count)
+        print(f"{type(prototype).__name__:<28} {size:>15.0f} {str(hasattr(prototype, '__dict__')):>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+"""
+Times every parser on the fixtures under tests/unit and on generated, scaled-up pages, and measures the peak memory
+each parse allocates.  The results can be saved as a JSON baseline, and a later run compared against it fails when a
+parser got slower, allocates more than the tolerance allows, or raises on a page which it parsed in the baseline.
+
+    PYTHONPATH=. python3 benchmarks/parser_suite.py [--parser lxml] [--only pending] [--save benchmarks/baseline.json]
+    PYTHONPATH=. python3 benchmarks/parser_suite.py --compare benchmarks/baseline.json [--time-tolerance 0.25]
+
+Every case is measured from the bytes of a response: 'text' decodes them first, as response.text would, and 'bytes'
+hands them to the parser with their encoding (case names ending in @bytes).
+
+Timings depend on the machine, so compare against a baseline saved on the same one.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import bs4
+
+from generators import generate_account_detail, generate_pending_orders, generate_search_results
+from hargreaves.account.models import AccountSummary
+from hargreaves.account.parsers.parsers import parse_account_list, parse_account_detail
+from hargreaves.authentication.login.step_one import parse_security_token
+from hargreaves.authentication.login.step_two import parse_secure_numbers
+from hargreaves.orders.manual.parsers import parse_manual_order_entry_page, parse_manual_order_confirmation_page
+from hargreaves.orders.market.parsers import parse_market_order_entry_page, parse_market_order_quote_page, \
+    parse_market_order_confirmation_page
+from hargreaves.orders.models import OrderAmountType
+from hargreaves.orders.pending.parsers import parse_pending_orders, parse_cancel_order_confirmation
+from hargreaves.search.clients import parse_search_results
+from hargreaves.search.models import InvestmentCategoryTypes
+from hargreaves.utils.soup import ParserBackend
+
+FILES = Path(__file__).parent.parent / 'tests/unit'
+
+ENCODING = 'utf-8'
+MARKUP_SUFFIXES = ('_html', '_csv', '_jsonp')
+INPUT_MODES = ('text', 'bytes')
+
+EQUITIES = InvestmentCategoryTypes.EQUITIES
+OVERSEAS = InvestmentCategoryTypes.OVERSEAS
+
+
+def read(file_name: str) -> str:
+    return (FILES / file_name).read_text()
+
+
+def account_summary() -> AccountSummary:
+    return AccountSummary(account_id=55, account_type='SIPP')
+
+
+def fixture_cases() -> list:
+    """
+    (name, parse function, keyword arguments, whether it takes a parser)
+    """
+    cases = [
+        ('account_list', parse_account_list, dict(my_accounts_html=read('account/files/my-accounts.html')), True),
+        ('account_detail', parse_account_detail, dict(
+            account_detail_html=read('account/files/account-summary.html'),
+            account_detail_csv=read('account/files/account-summary.csv'), account_summary=account_summary()), True),
+        ('security_token', parse_security_token, dict(
+            stage_one_html=read('authentication/files/stage-one-login-mock.html')), True),
+        ('secure_numbers', parse_secure_numbers, dict(
+            stage_two_html=read('authentication/files/stage-two-login-mock.html')), True),
+        ('pending_orders_0', parse_pending_orders, dict(
+            account_id=70, pending_orders_html=read('orders/pending/files/pending-orders-0.html')), True),
+        ('pending_orders_2', parse_pending_orders, dict(
+            account_id=70, pending_orders_html=read('orders/pending/files/pending-orders-2.html')), True),
+        ('cancel_order_confirmation', parse_cancel_order_confirmation, dict(
+            confirm_html=read('orders/pending/files/pending-order-cancel-1-out-of-2-confirmation.html')), True),
+        ('manual_order_entry_error', parse_manual_order_entry_page, dict(
+            order_html=read('orders/manual/files/all/manual-order-entry-error.html'), category_code=EQUITIES), True),
+        ('market_order_entry_uk', parse_market_order_entry_page, dict(
+            order_html=read('orders/market/files/all/market-order-entry-uk-equity.html'), category_code=EQUITIES),
+         True),
+        ('market_order_entry_uk_closed', parse_market_order_entry_page, dict(
+            order_html=read('orders/market/files/all/market-order-entry-uk-market-closed.html'),
+            category_code=EQUITIES), True),
+        ('market_order_quote_no_live_quote', parse_market_order_quote_page, dict(
+            quote_html=read('orders/market/files/all/market-order-quote-no-live-quote.html'), category_code=EQUITIES),
+         True),
+        ('market_order_confirmation_failed', parse_market_order_confirmation_page, dict(
+            confirm_html=read('orders/market/files/all/market-order-confirmation-failed.html'),
+            category_code=EQUITIES), True),
+        ('search_results_found', parse_search_results, dict(
+            results_jsonp=read('search/files/search-results-found.jsonp')), False),
+        ('search_results_not_found', parse_search_results, dict(
+            results_jsonp=read('search/files/search-results-not-found.jsonp')), False),
+    ]
+    for market, category_code in [('uk', EQUITIES), ('us', OVERSEAS)]:
+        cases.append((f'manual_order_entry_{market}', parse_manual_order_entry_page, dict(
+            order_html=read(f'orders/manual/files/all/manual-order-entry-{market}-equity.html'),
+            category_code=category_code), True))
+        for direction in ['buy', 'sell']:
+            cases += [
+                (f'manual_{direction}_order_confirmation_{market}', parse_manual_order_confirmation_page, dict(
+                    confirm_html=read(f'orders/manual/files/{direction}/'
+                                      f'manual-{direction}-order-confirmation-{market}-equity.html'),
+                    amount_type=OrderAmountType.Quantity), True),
+                (f'market_{direction}_order_quote_{market}', parse_market_order_quote_page, dict(
+                    quote_html=read(f'orders/market/files/{direction}/'
+                                    f'market-{direction}-order-quote-{market}-equity.html'),
+                    category_code=category_code), True),
+                (f'market_{direction}_order_confirmation_{market}', parse_market_order_confirmation_page, dict(
+                    confirm_html=read(f'orders/market/files/{direction}/'
+                                      f'market-{direction}-order-confirmation-{market}-equity.html'),
+                    category_code=category_code), True),
+            ]
+    return cases
+
+
+def scaled_cases(holdings_sizes: list, pending_sizes: list, search_sizes: list) -> list:
+    cases = []
+    for count in holdings_sizes:
+        account_detail_html, account_detail_csv = generate_account_detail(count)
+        cases.append((f'account_detail_x{count}', parse_account_detail, dict(
+            account_detail_html=account_detail_html, account_detail_csv=account_detail_csv,
+            account_summary=account_summary()), True))
+    for count in pending_sizes:
+        cases.append((f'pending_orders_x{count}', parse_pending_orders, dict(
+            account_id=70, pending_orders_html=generate_pending_orders(count)), True))
+    for count in search_sizes:
+        cases.append((f'search_results_x{count}', parse_search_results, dict(
+            results_jsonp=generate_search_results(count)), False))
+    return cases
+
+
+def as_content(kwargs: dict) -> dict:
+    """
+    The keyword arguments with every page as the bytes of response.content
+    """
+    return {name: value.encode(ENCODING) if name.endswith(MARKUP_SUFFIXES) else value for name, value in kwargs.items()}
+
+
+def call(parse_function, kwargs: dict, takes_parser: bool, parser: ParserBackend, input_mode: str):
+    try:
+        options = {'parser': parser} if takes_parser else {}
+        if input_mode == 'text':
+            kwargs = {name: value.decode(ENCODING) if isinstance(value, bytes) else value
+                      for name, value in kwargs.items()}
+        elif takes_parser:
+            options['encoding'] = ENCODING
+        return parse_function(**kwargs, **options)
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except BaseException as ex:
+        # the error pages are part of the corpus, raising is their expected outcome, see measure()
+        return ex
+
+
+def measure(parse_function, kwargs: dict, takes_parser: bool, parser: ParserBackend, input_mode: str,
+            runs: int) -> dict:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call(parse_function, kwargs, takes_parser, parser, input_mode)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    result = call(parse_function, kwargs, takes_parser, parser, input_mode)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'min_ms': round(min(timings) * 1000, 3),
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+        'peak_kib': round(peak / 1024, 1),
+        # the type of the error raised, None when the page parsed
+        'raises': type(result).__name__ if isinstance(result, BaseException) else None
+    }
+
+
+def compare(results: dict, baseline: dict, time_tolerance: float, memory_tolerance: float,
+            time_floor_ms: float) -> list:
+    """
+    :return: a description of every regression, slowdowns under time_floor_ms are timer noise and ignored
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline['results'].get(name)
+        if expected is None:
+            continue
+        # baselines saved before the outcome was recorded have no 'raises'
+        if 'raises' in expected and result['raises'] != expected['raises']:
+            regressions.append(f"{name}: raises {result['raises'] or 'nothing'}, "
+                               f"baseline raises {expected['raises'] or 'nothing'}")
+            # an error cut short is no faster nor slower than the parse it replaced
+            continue
+        if result['median_ms'] > max(expected['median_ms'] * (1 + time_tolerance),
+                                     expected['median_ms'] + time_floor_ms):
+            regressions.append(f"{name}: median {result['median_ms']:.2f} ms, baseline {expected['median_ms']:.2f} ms")
+        if result['peak_kib'] > expected['peak_kib'] * (1 + memory_tolerance):
+            regressions.append(f"{name}: peak {result['peak_kib']:.0f} KiB, baseline {expected['peak_kib']:.0f} KiB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parser benchmark suite')
+    parser.add_argument('--parser', default=ParserBackend.HTML_PARSER.value,
+                        choices=[backend.value for backend in ParserBackend])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--input', nargs='+', default=list(INPUT_MODES), choices=INPUT_MODES,
+                        help='decode the response bytes before parsing (text) or parse them directly (bytes)')
+    parser.add_argument('--only', help='only run the cases whose name contains this text')
+    parser.add_argument('--holdings', type=int, nargs='*', default=[10, 100, 1000])
+    parser.add_argument('--pending-orders', type=int, nargs='*', default=[10, 100, 1000])
+    parser.add_argument('--search-docs', type=int, nargs='*', default=[10, 100, 1000, 10000])
+    parser.add_argument('--save', help='write the results to this JSON baseline')
+    parser.add_argument('--compare', help='compare the results with this JSON baseline')
+    parser.add_argument('--time-tolerance', type=float, default=0.25, help='allowed slowdown, 0.25 is 25%%')
+    parser.add_argument('--memory-tolerance', type=float, default=0.10, help='allowed growth of the peak memory')
+    parser.add_argument('--time-floor-ms', type=float, default=0.5, help='slowdowns smaller than this are ignored')
+    args = parser.parse_args()
+    backend = ParserBackend(args.parser)
+
+    cases = fixture_cases() + scaled_cases(args.holdings, args.pending_orders, args.search_docs)
+    if args.only:
+        cases = [case for case in cases if args.only in case[0]]
+
+    results = {}
+    print(f"{'case':<40} {'min ms':>9} {'median ms':>10} {'peak KiB':>9}  raises")
+    for name, parse_function, kwargs, takes_parser in cases:
+        content_kwargs = as_content(kwargs)
+        for input_mode in args.input:
+            case_name = name if input_mode == 'text' else f'{name}@{input_mode}'
+            result = measure(parse_function, content_kwargs, takes_parser, backend, input_mode, args.runs)
+            results[case_name] = result
+            print(f"{case_name:<40} {result['min_ms']:>9.2f} {result['median_ms']:>10.2f} "
+                  f"{result['peak_kib']:>9.0f}  {result['raises'] or ''}")
+
+    report = {
+        'python': platform.python_version(),
+        'beautifulsoup4': bs4.__version__,
+        'parser': backend.value,
+        'runs': args.runs,
+        'results': results
+    }
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+            baseline_file.write('\n')
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get('parser') != backend.value:
+            print(f"The baseline was measured with {baseline.get('parser')}, not {backend.value}")
+            sys.exit(2)
+        regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance, args.time_floor_ms)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == '__main__':
+    main()
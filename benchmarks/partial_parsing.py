@@ -0,0 +1,64 @@
+"""
+Compares the time and peak memory of parsing the order pages in full against parsing only the fragments their
+parsers read.
+
+    PYTHONPATH=. python3 benchmarks/partial_parsing.py [--parser lxml] [--runs 20]
+"""
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+from hargreaves.orders.manual import parsers as manual_parsers
+from hargreaves.orders.market import parsers as market_parsers
+from hargreaves.orders.pending import parsers as pending_parsers
+from hargreaves.utils.soup import ParserBackend, make_soup
+
+FILES = Path(__file__).parent.parent / 'tests/unit/orders'
+
+PAGES = [
+    ('market order entry', 'market/files/all/market-order-entry-uk-equity.html', market_parsers.ORDER_ENTRY_FRAGMENTS),
+    ('market order quote', 'market/files/buy/market-buy-order-quote-uk-equity.html', market_parsers.QUOTE_FRAGMENTS),
+    ('market order confirmation', 'market/files/buy/market-buy-order-confirmation-uk-equity.html',
+     market_parsers.CONFIRMATION_FRAGMENTS),
+    ('manual order entry', 'manual/files/all/manual-order-entry-uk-equity.html', manual_parsers.ORDER_ENTRY_FRAGMENTS),
+    ('manual order confirmation', 'manual/files/buy/manual-buy-order-confirmation-uk-equity.html',
+     manual_parsers.CONFIRMATION_FRAGMENTS),
+    ('pending orders', 'pending/files/pending-orders-2.html', pending_parsers.PENDING_ORDERS_FRAGMENTS),
+]
+
+
+def measure(html: str, parser: ParserBackend, fragments, runs: int):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        make_soup(html, parser, fragments)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    soup = make_soup(html, parser, fragments)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del soup
+    return min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Full versus partial parsing of the order pages')
+    parser.add_argument('--parser', default=ParserBackend.HTML_PARSER.value,
+                        choices=[backend.value for backend in ParserBackend])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+    backend = ParserBackend(args.parser)
+
+    print(f"{'page':<26} {'full ms':>9} {'partial ms':>11} {'full KiB':>9} {'partial KiB':>12}")
+    for name, path, fragments in PAGES:
+        html = Path(FILES / path).read_text()
+        full_seconds, full_peak = measure(html, backend, None, args.runs)
+        partial_seconds, partial_peak = measure(html, backend, fragments, args.runs)
+        print(f"{name:<26} {full_seconds * 1000:>9.2f} {partial_seconds * 1000:>11.2f} "
+              f"{full_peak / 1024:>9.0f} {partial_peak / 1024:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Times parse_pending_orders on synthetic pending orders pages of increasing size, the time per order should stay flat.
+
+    PYTHONPATH=. python3 benchmarks/pending_orders_scaling.py [--sizes 10 100 1000] [--parser lxml]
+"""
+import argparse
+import time
+
+from generators import generate_pending_orders
+from hargreaves.orders.pending.parsers import parse_pending_orders
+from hargreaves.utils.soup import ParserBackend
+
+
+def measure(count: int, parser: ParserBackend, runs: int) -> float:
+    pending_orders_html = generate_pending_orders(count)
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        pending_orders = parse_pending_orders(account_id=70, pending_orders_html=pending_orders_html, parser=parser)
+        timings.append(time.perf_counter() - started)
+        assert len(pending_orders) == count
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='parse_pending_orders scaling benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 5000])
+    parser.add_argument('--parser', default=ParserBackend.HTML_PARSER.value,
+                        choices=[backend.value for backend in ParserBackend])
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'orders':>10} {'total ms':>10} {'ms/order':>12}")
+    for count in args.sizes:
+        seconds = measure(count, ParserBackend(args.parser), args.runs)
+        print(f"{count:>10} {seconds * 1000:>10.1f} {seconds * 1000 / count:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
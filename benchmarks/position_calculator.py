@@ -0,0 +1,64 @@
+"""
+Times PositionCalculator.calculate_basket, and calculate_basket_arrays when NumPy is installed, against calling
+PositionCalculator.calculate once per line, on random baskets of buys and sells, and checks that they give the same
+amount types and quantities.
+
+    PYTHONPATH=. python3 benchmarks/position_calculator.py [--sizes 10 100 1000 10000]
+"""
+import argparse
+import random
+import time
+
+from hargreaves.orders.models import OrderPositionType, PositionCalculator
+
+
+def generate_basket(count: int, seed: int = 1) -> tuple:
+    rnd = random.Random(seed)
+    position_types = [rnd.choice([OrderPositionType.Buy, OrderPositionType.Sell]) for _ in range(count)]
+    position_percentages = [round(rnd.uniform(0.1, 100), 2) for _ in range(count)]
+    account_values = [round(rnd.uniform(100, 1000000), 2) for _ in range(count)]
+    units_held = [float(rnd.randint(0, 100000)) for _ in range(count)]
+    return position_types, position_percentages, account_values, units_held
+
+
+def scalar(basket: tuple) -> tuple:
+    results = [PositionCalculator.calculate(*line) for line in zip(*basket)]
+    return [result[0] for result in results], [result[1] for result in results]
+
+
+def best_of(function, basket: tuple, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function(basket)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PositionCalculator basket benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        import numpy
+        print(f"numpy {numpy.__version__}")
+    except ImportError:
+        numpy = None
+        print("numpy is not installed, calculate_basket falls back to the scalar path")
+
+    print(f"{'lines':>8} {'scalar ms':>10} {'basket ms':>10} {'arrays ms':>10} {'speedup':>8}")
+    for count in args.sizes:
+        basket = generate_basket(count)
+        assert PositionCalculator.calculate_basket(*basket) == scalar(basket)
+        scalar_seconds = best_of(scalar, basket, args.runs)
+        basket_seconds = best_of(lambda lines: PositionCalculator.calculate_basket(*lines), basket, args.runs)
+        arrays_seconds = float('nan') if numpy is None else \
+            best_of(lambda lines: PositionCalculator.calculate_basket_arrays(*lines), basket, args.runs)
+        print(f"{count:>8} {scalar_seconds * 1000:>10.2f} {basket_seconds * 1000:>10.2f} "
+              f"{arrays_seconds * 1000:>10.2f} {scalar_seconds / basket_seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Times matching an instruction file of stock tickers against a cached search universe, with security_filter scanning
+the results for every line and with a SearchResultIndex built once.
+
+    PYTHONPATH=. python3 benchmarks/security_filter.py [--universe 10000] [--lines 5000]
+"""
+import argparse
+import random
+import time
+
+from generators import generate_search_results
+from hargreaves.search.clients import parse_search_results, security_filter
+from hargreaves.search.models import SearchResultIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description='security_filter benchmark')
+    parser.add_argument('--universe', type=int, default=10000)
+    parser.add_argument('--lines', type=int, default=5000)
+    args = parser.parse_args()
+
+    universe = parse_search_results(generate_search_results(args.universe))
+    # a plain list is scanned attribute by attribute, as a cached universe usually is
+    universe_list = list(universe)
+    queries = [(search_result.stock_ticker.lower(), None)
+               for search_result in random.Random(1).sample(universe_list, args.lines)]
+
+    for name, search_results in [('SearchResults', universe), ('list', universe_list)]:
+        started = time.perf_counter()
+        scanned = [security_filter(search_results, stock_ticker=stock_ticker) for stock_ticker, _ in queries]
+        scan_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        search_result_index = SearchResultIndex(search_results)
+        build_seconds = time.perf_counter() - started
+        indexed = search_result_index.filter_many(queries)
+        index_seconds = time.perf_counter() - started
+
+        assert [result.sedol_code for result in scanned] == [result.sedol_code for result in indexed]
+        print(f"{name:<14} {args.lines} lines x {args.universe} results: scan {scan_seconds * 1000:9.1f} ms, "
+              f"index {index_seconds * 1000:7.1f} ms (of which building {build_seconds * 1000:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,27 @@
 import logging
-from typing import List
+from typing import List, TYPE_CHECKING
 
-from .clients import AccountClient
+from .columnar import holding_columns, holdings_to_numpy, holdings_to_arrow
 from .models import AccountType, AccountSummary, AccountDetail
-from requests_tracker.session import IWebSession
+from ..utils.lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from requests_tracker.session import IWebSession
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'AccountClient': '.clients'
+})
+
 
-def get_account_summary(web_session: IWebSession) -> List[AccountSummary]:
+def get_account_summary(web_session: 'IWebSession') -> List[AccountSummary]:
+    from .clients import AccountClient
     return AccountClient().get_account_summary(web_session=web_session)
 
 
-def get_account_detail(web_session: IWebSession, account_summary: AccountSummary) -> AccountDetail:
+def get_account_detail(web_session: 'IWebSession', account_summary: AccountSummary) -> AccountDetail:
+    from .clients import AccountClient
     return AccountClient().get_account_detail(
         web_session=web_session,
         account_summary=account_summary)
@@ -1,12 +1,18 @@
 import logging
 from typing import List
 
+from requests import Response
+
 from ..account.models import AccountSummary, AccountDetail
 from ..account.parsers.parsers import parse_account_list, parse_account_detail
+from ..search.index import record_investments
 from requests_tracker.session import IWebSession
 
 logger = logging.getLogger(__name__)
 
+ACCOUNT_LIST_URL = 'https://online.hl.co.uk/my-accounts'
+ACCOUNT_DETAIL_CSV_URL = 'https://online.hl.co.uk/my-accounts/account_summary_csv/sort/stock/sortdir/asc'
+
 
 class IAccountClient:
 
@@ -24,21 +30,33 @@ class AccountClient(IAccountClient):
 
     def get_account_summary(self, web_session: IWebSession) -> List[AccountSummary]:
         logger.debug("Get account summary ...")
-        response = web_session.get('https://online.hl.co.uk/my-accounts')
-        return parse_account_list(response.text)
+        response = web_session.get(ACCOUNT_LIST_URL)
+        return parse_account_list(response.content, encoding=response.encoding)
 
     def get_account_detail(self, web_session: IWebSession, account_summary: AccountSummary) -> AccountDetail:
         account_id = account_summary.account_id
         logger.debug(f"Get account ({account_id}) detail page ...")
 
-        account_detail_html = web_session.get(
-            f"https://online.hl.co.uk/my-accounts/account_summary/account/{account_summary.account_id}").text
+        # the CSV is served for the account page last visited, so the two requests must stay in sequence
+        html_response = web_session.get(account_detail_url(account_id))
 
         logger.debug(f"Get account ({account_id}) detail CSV ...")
-        csv_response = web_session.get(
-            'https://online.hl.co.uk/my-accounts/account_summary_csv/sort/stock/sortdir/asc')
+        csv_response = web_session.get(ACCOUNT_DETAIL_CSV_URL)
+
+        return parse_account_detail_responses(html_response, csv_response, account_summary)
+
+
+def account_detail_url(account_id: int) -> str:
+    return f"https://online.hl.co.uk/my-accounts/account_summary/account/{account_id}"
 
-        csv_response.encoding = 'utf-8'  # avoids the 'DEBUG:chardet.charsetprobe' messages from csv reader
-        account_detail_csv = csv_response.text
 
-        return parse_account_detail(account_detail_html, account_detail_csv, account_summary)
+def parse_account_detail_responses(html_response: Response, csv_response: Response,
+                                   account_summary: AccountSummary) -> AccountDetail:
+    """
+    Parses the account page and holdings CSV, shared by the sync and async clients
+    """
+    # the raw bytes are parsed, the CSV is always UTF-8 so its encoding is never detected by chardet
+    account_detail = parse_account_detail(html_response.content, csv_response.content, account_summary,
+                                          encoding=html_response.encoding)
+    record_investments(account_detail.investments)
+    return account_detail
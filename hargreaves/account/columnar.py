@@ -0,0 +1,86 @@
+from typing import Dict, Iterable, List, Union
+
+from .models import AccountDetail
+
+# (column, Investment attribute) of a holding, account_id comes from the AccountDetail holding it
+HOLDING_COLUMNS = [
+    ('account_id', None),
+    ('stock_ticker', 'stock_ticker'),
+    ('sedol_code', 'sedol_code'),
+    ('units', 'units_held'),
+    ('price_pence', 'price_pence'),
+    ('value_gbp', 'value_gbp'),
+    ('cost_gbp', 'cost_gbp'),
+    ('gain_loss_gbp', 'gain_loss_gbp'),
+]
+
+_TEXT_COLUMNS = {'stock_ticker', 'sedol_code'}
+
+
+def _account_details(account_details: Union[AccountDetail, Iterable[AccountDetail]]) -> List[AccountDetail]:
+    if isinstance(account_details, AccountDetail):
+        return [account_details]
+    return list(account_details)
+
+
+def holding_columns(account_details: Union[AccountDetail, Iterable[AccountDetail]]) -> Dict[str, list]:
+    """
+    The holdings of one or more accounts as columns, one list per column of HOLDING_COLUMNS, and one row per holding
+    :param account_details: AccountDetail or a list of them, the holdings of every account are concatenated
+    :return: the column lists by column name
+    """
+    columns = {column: [] for column, _ in HOLDING_COLUMNS}
+    for account_detail in _account_details(account_details):
+        investments = account_detail.investments
+        columns['account_id'].extend([account_detail.account_id] * len(investments))
+        for column, attribute in HOLDING_COLUMNS[1:]:
+            columns[column].extend([getattr(investment, attribute) for investment in investments])
+    return columns
+
+
+def holdings_to_numpy(account_details: Union[AccountDetail, Iterable[AccountDetail]]):
+    """
+    The holdings of one or more accounts as a NumPy structured array, requires 'pip install numpy'
+    :param account_details: AccountDetail or a list of them
+    :return: numpy.ndarray with one record per holding and a field per column of HOLDING_COLUMNS
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("holdings_to_numpy requires numpy, 'pip install numpy'") from None
+
+    columns = holding_columns(account_details)
+    dtype = []
+    for column, _ in HOLDING_COLUMNS:
+        if column == 'account_id':
+            dtype.append((column, numpy.int64))
+        elif column in _TEXT_COLUMNS:
+            dtype.append((column, f'U{max((len(value) for value in columns[column]), default=1)}'))
+        else:
+            dtype.append((column, numpy.float64))
+
+    holdings = numpy.empty(len(columns['account_id']), dtype=dtype)
+    for column, _ in HOLDING_COLUMNS:
+        holdings[column] = columns[column]
+    return holdings
+
+
+def holdings_to_arrow(account_details: Union[AccountDetail, Iterable[AccountDetail]]):
+    """
+    The holdings of one or more accounts as an Arrow table, which pyarrow.parquet and pyarrow.feather write without
+    converting it, requires 'pip install pyarrow'
+    :param account_details: AccountDetail or a list of them
+    :return: pyarrow.Table with a column per column of HOLDING_COLUMNS
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("holdings_to_arrow requires pyarrow, 'pip install pyarrow'") from None
+
+    columns = holding_columns(account_details)
+    schema = pyarrow.schema([
+        (column, pyarrow.int64() if column == 'account_id' else
+         pyarrow.string() if column in _TEXT_COLUMNS else pyarrow.float64())
+        for column, _ in HOLDING_COLUMNS
+    ])
+    return pyarrow.Table.from_pydict(columns, schema=schema)
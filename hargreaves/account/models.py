@@ -9,6 +9,7 @@ class AccountType:
 
 
 class AccountSummary:
+    __slots__ = ('_account_id', '_account_type')
     _account_id: int
     _account_type: str
 
@@ -33,6 +34,10 @@ class AccountSummary:
 
 
 class Investment:
+    __slots__ = (
+        '_stock_ticker', '_security_name', '_sedol_code', '_units_held', '_price_pence', '_value_gbp', '_cost_gbp',
+        '_gain_loss_gbp', '_gain_loss_percentage'
+    )
     _stock_ticker: str
     _security_name: str
     _sedol_code: str
@@ -104,6 +109,10 @@ class Investment:
 
 
 class AccountDetail:
+    __slots__ = (
+        '__account_id', '__account_type', '__stock_value', '__total_cash', '__amount_available', '__total_value',
+        '__investments'
+    )
     __account_id: int
     __account_type: str
     __stock_value: float
@@ -159,3 +168,24 @@ class AccountDetail:
     @property
     def investments(self):
         return self.__investments
+
+    def holding_columns(self) -> dict:
+        """
+        The investments as one list per column, see hargreaves.account.columnar
+        """
+        from .columnar import holding_columns
+        return holding_columns(self)
+
+    def to_numpy(self):
+        """
+        The investments as a NumPy structured array, requires 'pip install numpy'
+        """
+        from .columnar import holdings_to_numpy
+        return holdings_to_numpy(self)
+
+    def to_arrow(self):
+        """
+        The investments as an Arrow table, requires 'pip install pyarrow'
+        """
+        from .columnar import holdings_to_arrow
+        return holdings_to_arrow(self)
@@ -1,17 +1,22 @@
+import bisect
 import csv
 import re
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
+from bs4 import Tag
 from io import StringIO
 
 from ...account.models import AccountSummary, AccountDetail, Investment
+from ...utils.soup import decode, make_soup, Markup, ParserBackend
 
+LIVE_PRICE_ID_PREFIX = 'live_price_value_'
 
-def parse_account_list(my_accounts_html: str) -> List[AccountSummary]:
+
+def parse_account_list(my_accounts_html: Markup, parser: ParserBackend = None,
+                       encoding: str = None) -> List[AccountSummary]:
     accounts = []
 
-    soup = BeautifulSoup(my_accounts_html, 'html.parser')
+    soup = make_soup(my_accounts_html, parser, encoding=encoding)
     rows = soup.select('table[class="accounts-table"] tbody tr')
     if len(rows) == 0:
         raise ValueError("List of accounts not present in response")
@@ -28,11 +33,13 @@ def parse_account_list(my_accounts_html: str) -> List[AccountSummary]:
     return accounts
 
 
-def parse_account_detail(account_detail_html: str, account_detail_csv: str, account_summary: AccountSummary) \
-        -> AccountDetail:
-    soup = BeautifulSoup(account_detail_html, 'html.parser')
+def parse_account_detail(account_detail_html: Markup, account_detail_csv: Markup, account_summary: AccountSummary,
+                         parser: ParserBackend = None, encoding: str = None) -> AccountDetail:
+    soup = make_soup(account_detail_html, parser, encoding=encoding)
+    live_prices = _LivePriceIndex(soup)
 
-    f = StringIO(account_detail_csv)
+    # HL serves the CSV as UTF-8, whatever the encoding of the page
+    f = StringIO(decode(account_detail_csv))
     reader = csv.reader(f, delimiter=',')
     try:
         in_holdings = False
@@ -56,7 +63,7 @@ def parse_account_detail(account_detail_html: str, account_detail_csv: str, acco
                     try:
                         # Fetch the stock symbol and SEDOL code from the HTML
                         # Could also be of the format live_price_value_$CODE-L
-                        live_price_value = soup.find(id=re.compile(f'^live_price_value_{row[0]}'))
+                        live_price_value = live_prices.find(row[0])
                         tr = live_price_value.parent.parent
                         # https://online.hl.co.uk/my-accounts/security_deal/sedol/2588173
                         href = tr.find("a", class_="deal-button")['href']
@@ -80,5 +87,35 @@ def parse_account_detail(account_detail_html: str, account_detail_csv: str, acco
                          )
 
 
+class _LivePriceIndex:
+    """
+    The 'live_price_value_$CODE' elements of the account page, found in a single pass over the document
+    """
+    _elements: Dict[str, Tuple[int, Tag]]  # code -> (position in the document, element)
+    _codes: List[str]
+
+    def __init__(self, soup):
+        self._elements = {}
+        for position, element in enumerate(soup.find_all(id=re.compile(f'^{LIVE_PRICE_ID_PREFIX}'))):
+            self._elements.setdefault(element['id'][len(LIVE_PRICE_ID_PREFIX):], (position, element))
+        self._codes = sorted(self._elements)
+
+    def find(self, stock_ticker: str) -> Optional[Tag]:
+        """
+        The element for the stock ticker, 'live_price_value_$CODE' or 'live_price_value_$CODE-L', otherwise the
+        first element in the document whose code starts with the stock ticker
+        """
+        for code in [stock_ticker, f'{stock_ticker}-L']:
+            if code in self._elements:
+                return self._elements[code][1]
+
+        candidates = []
+        index = bisect.bisect_left(self._codes, stock_ticker)
+        while index < len(self._codes) and self._codes[index].startswith(stock_ticker):
+            candidates.append(self._elements[self._codes[index]])
+            index += 1
+        return min(candidates, key=lambda candidate: candidate[0])[1] if candidates else None
+
+
 def _to_float(cell: str):
     return float(cell.replace(',', ''))
@@ -0,0 +1,59 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import Executor
+from typing import Optional, TYPE_CHECKING
+
+from ..config.models import ApiConfiguration
+from .. import session
+from ..utils.lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from requests_tracker.storage import ICookieStorage
+    from ..aio.session import AsyncLoggedInSession
+    from ..utils.pacing import IPacingPolicy
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'AsyncAccountClient': '.clients',
+    'AsyncAuthenticationClient': '.clients',
+    'AsyncManualOrderClient': '.clients',
+    'AsyncMarketOrderClient': '.clients',
+    'AsyncPendingOrdersClient': '.clients',
+    'AsyncSecuritySearchClient': '.clients',
+    'AsyncSessionClient': '.clients',
+    'AsyncSessionRefresher': '.refresher',
+    'AsyncLoggedInSession': '.session',
+    'AsyncWebSession': '.session',
+    'IAsyncWebSession': '.session'
+})
+
+
+async def create_session(
+        cookies_storage: 'ICookieStorage',
+        config: ApiConfiguration,
+        retry_count: int = 1,
+        timeout: float = 15.00,
+        executor: Optional[Executor] = None,
+        pacing_policy: 'IPacingPolicy' = None) -> 'AsyncLoggedInSession':
+    """
+    Creates an AsyncLoggedInSession that will automatically handle login redirects
+    :param cookies_storage:
+    :param config:
+    :param retry_count:
+    :param timeout:
+    :param executor: Optional, the executor to run requests on, by default the one shared by every session
+    :param pacing_policy: Optional, how long the clients wait between requests, see hargreaves.utils.pacing
+    :return:
+    """
+    from ..aio.session import AsyncLoggedInSession, shared_executor
+
+    logged_in_session = await asyncio.get_running_loop().run_in_executor(
+        shared_executor() if executor is None else executor,
+        functools.partial(session.create_session, cookies_storage=cookies_storage, config=config,
+                          retry_count=retry_count, timeout=timeout,
+                          pacing_policy=pacing_policy))
+    return AsyncLoggedInSession(
+        logged_in_session=logged_in_session,
+        executor=executor)
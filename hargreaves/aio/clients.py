@@ -0,0 +1,314 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Iterable, List, Optional
+
+from requests import Response
+
+from ..account.clients import ACCOUNT_LIST_URL, ACCOUNT_DETAIL_CSV_URL, account_detail_url, \
+    parse_account_detail_responses
+from ..account.models import AccountSummary, AccountDetail
+from ..account.parsers.parsers import parse_account_list
+from ..aio.session import AsyncWebSession, IAsyncWebSession
+from ..authentication.clients import login_security_token, login_step_one, login_step_two
+from ..config.models import ApiConfiguration
+from ..orders.manual import clients as manual
+from ..orders.manual.models import ManualOrder, ManualOrderPosition
+from ..orders.market import clients as market
+from ..orders.market.models import MarketOrderPosition, MarketOrderQuote, MarketOrderConfirmation, MarketOrder
+from ..orders.models import OrderRequest, IOrderConfirmation
+from ..orders.pending.clients import create_cancel_request, create_pending_orders_request, parse_cancel_response
+from ..orders.pending.models import PendingOrder
+from ..orders.pending.parsers import parse_pending_orders
+from ..search.clients import DEFAULT_RESOLVE_CONCURRENCY, create_search_request, in_order, is_page_at, \
+    next_page_offset, parse_search_response, security_filter, unique_tickers
+from ..search.index import SecurityIndex, indexed_search_results
+from ..search.models import InvestmentTypes, ResolvedSecurities, SearchResult, SearchResults
+from ..session.clients import check_keepalive_response, create_keepalive_request
+from ..utils import clock, pacing
+
+logger = logging.getLogger(__name__)
+
+# The request arguments and response handling are shared with the sync clients, only sending the requests and pausing
+# between them differ
+
+
+class AsyncAuthenticationClient:
+
+    async def login(self, web_session: AsyncWebSession, config: ApiConfiguration,
+                    redirect_response: Response = None) -> Response:
+        """
+        Logs in through the session, which must not log in itself, pausing between the steps without holding a thread
+        """
+        hl_vt = await web_session.run(login_security_token, web_session.web_session, redirect_response)
+
+        await clock.sleep_random_async(minimum=1, maximum=3)
+        secure_numbers_requested = await web_session.run(login_step_one, web_session.web_session, hl_vt, config)
+
+        await clock.sleep_random_async(minimum=1, maximum=3)
+        return await web_session.run(login_step_two, web_session.web_session, hl_vt, config, secure_numbers_requested)
+
+
+class AsyncSessionClient:
+
+    async def session_keepalive(self, web_session: IAsyncWebSession, sedol_code: str, session_hl_vt: str):
+        logger.debug("Perform 'Session Keepalive'")
+
+        await pacing.pause_async(web_session)
+
+        res = await web_session.get(**create_keepalive_request(sedol_code=sedol_code, session_hl_vt=session_hl_vt))
+        check_keepalive_response(res)
+
+
+class AsyncAccountClient:
+
+    async def get_account_summary(self, web_session: IAsyncWebSession) -> List[AccountSummary]:
+        logger.debug("Get account summary ...")
+        response = await web_session.get(ACCOUNT_LIST_URL)
+        return parse_account_list(response.content, encoding=response.encoding)
+
+    async def get_account_detail(self, web_session: IAsyncWebSession,
+                                 account_summary: AccountSummary) -> AccountDetail:
+        account_id = account_summary.account_id
+        logger.debug(f"Get account ({account_id}) detail page ...")
+
+        # the CSV is served for the account page last visited, so the two requests must stay in sequence
+        html_response = await web_session.get(account_detail_url(account_id))
+
+        logger.debug(f"Get account ({account_id}) detail CSV ...")
+        csv_response = await web_session.get(ACCOUNT_DETAIL_CSV_URL)
+
+        return parse_account_detail_responses(html_response, csv_response, account_summary)
+
+
+class AsyncSecuritySearchClient:
+    _security_index: Optional[SecurityIndex]
+
+    def __init__(self, security_index: SecurityIndex = None):
+        """
+        :param security_index: SecurityIndex - Optional, see SecuritySearchClient
+        """
+        self._security_index = security_index
+
+    async def investment_search(self, web_session: IAsyncWebSession, search_string: str,
+                                investment_types: list) -> List[SearchResult]:
+        indexed_results = indexed_search_results(search_string, investment_types, self._security_index)
+        if indexed_results is not None:
+            return indexed_results
+
+        logger.debug("Searching Securities ...")
+
+        return await self.search_page(web_session=web_session, search_string=search_string,
+                                      investment_types=investment_types)
+
+    async def search_page(self, web_session: IAsyncWebSession, search_string: str, investment_types: list,
+                          offset: int = 0) -> SearchResults:
+        await pacing.pause_async(web_session)
+
+        res = await web_session.get(**create_search_request(search_string=search_string,
+                                                            investment_types=investment_types, offset=offset))
+        return parse_search_response(res.content, self._security_index)
+
+    async def iter_investment_search(self, web_session: IAsyncWebSession, search_string: str,
+                                     investment_types: list, prefetch: bool = False) -> AsyncIterator[SearchResult]:
+        """
+        See SecuritySearchClient.iter_investment_search, the next page is prefetched by a task
+        """
+        next_page: Optional[asyncio.Task] = None
+        try:
+            offset = 0
+            page = await self.search_page(web_session=web_session, search_string=search_string,
+                                          investment_types=investment_types, offset=offset)
+            while is_page_at(page, offset):
+                next_offset = next_page_offset(page, offset)
+                if next_offset is not None and prefetch:
+                    next_page = asyncio.ensure_future(self.search_page(
+                        web_session=web_session, search_string=search_string, investment_types=investment_types,
+                        offset=next_offset))
+                for search_result in page:
+                    yield search_result
+                if next_offset is None:
+                    return
+                if next_page is None:
+                    page = await self.search_page(web_session=web_session, search_string=search_string,
+                                                  investment_types=investment_types, offset=next_offset)
+                else:
+                    page, next_page = await next_page, None
+                offset = next_offset
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def resolve_securities(self, web_session: IAsyncWebSession, stock_tickers: Iterable[str],
+                                 investment_types: list = InvestmentTypes.ALL,
+                                 max_concurrency: int = DEFAULT_RESOLVE_CONCURRENCY) -> ResolvedSecurities:
+        """
+        See SecuritySearchClient.resolve_securities, the searches are coroutines bounded by a semaphore
+        """
+        stock_tickers = unique_tickers(stock_tickers)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        results, errors, search_results = {}, {}, {}
+
+        async def resolve(stock_ticker: str):
+            try:
+                async with semaphore:
+                    search_results[stock_ticker] = await self.investment_search(
+                        web_session=web_session, search_string=stock_ticker, investment_types=investment_types)
+                results[stock_ticker] = security_filter(search_results=search_results[stock_ticker],
+                                                        stock_ticker=stock_ticker)
+            except (KeyboardInterrupt, SystemExit, asyncio.CancelledError):
+                raise
+            except BaseException as ex:
+                logger.debug(f"Could not resolve '{stock_ticker}': {ex!r}")
+                errors[stock_ticker] = ex
+
+        with pacing.spaced_pauses(asyncio.Lock()):
+            # the tasks created by gather inherit the lock, so they take turns at pausing
+            await asyncio.gather(*(resolve(stock_ticker) for stock_ticker in stock_tickers))
+        logger.debug(f"Resolved {len(results)} securities, {len(errors)} failed")
+        return ResolvedSecurities(results=in_order(results, stock_tickers), errors=in_order(errors, stock_tickers),
+                                  search_results=in_order(search_results, stock_tickers))
+
+
+class AsyncMarketOrderClient:
+    _session_client: AsyncSessionClient
+
+    def __init__(self, session_client: AsyncSessionClient):
+        self._session_client = session_client
+
+    async def get_current_position(self,
+                                   web_session: IAsyncWebSession,
+                                   account_id: int,
+                                   sedol_code: str,
+                                   category_code: str) -> MarketOrderPosition:
+        logger.debug("Get Current Position")
+
+        await pacing.pause_async(web_session)
+
+        res = await web_session.get(**market.create_current_position_request(account_id=account_id,
+                                                                             sedol_code=sedol_code))
+        return market.parse_current_position_response(res, category_code)
+
+    async def get_order_quote(self, web_session: IAsyncWebSession, order: MarketOrder) -> MarketOrderQuote:
+        logger.debug("Get Order Quote")
+
+        await pacing.pause_async(web_session)
+
+        await self._session_client.session_keepalive(
+            web_session=web_session, sedol_code=order.sedol, session_hl_vt=order.hl_vt)
+
+        await pacing.pause_async(web_session)
+
+        res = await web_session.post(**market.create_order_quote_request(order))
+        return market.parse_order_quote_response(res, order)
+
+    async def submit_order(self, web_session: IAsyncWebSession,
+                           order_quote: MarketOrderQuote) -> MarketOrderConfirmation:
+        logger.debug("Execute (Confirm) Order ...")
+
+        await pacing.pause_async(web_session)
+
+        await self._session_client.session_keepalive(
+            web_session=web_session,
+            sedol_code=order_quote.sedol_code,
+            session_hl_vt=order_quote.session_hl_vt)
+
+        await pacing.pause_async(web_session)
+
+        res = await web_session.post(**market.create_submit_order_request(order_quote))
+        return market.parse_submit_order_response(res, order_quote)
+
+    async def execute_order_flow(self, web_session: IAsyncWebSession,
+                                 order_request: OrderRequest) -> IOrderConfirmation:
+        logger.debug("Executing Deal As Market Order ...")
+
+        current_position = await self.get_current_position(
+            web_session=web_session,
+            account_id=order_request.account_id,
+            sedol_code=order_request.sedol_code,
+            category_code=order_request.category_code)
+
+        order = market.create_market_order(order_request, current_position)
+
+        order_quote = await self.get_order_quote(web_session=web_session, order=order)
+
+        logger.debug(order_quote)
+
+        order_confirmation = await self.submit_order(web_session=web_session, order_quote=order_quote)
+
+        logger.debug(order_confirmation)
+
+        return order_confirmation
+
+
+class AsyncManualOrderClient:
+    _session_client: AsyncSessionClient
+
+    def __init__(self, session_client: AsyncSessionClient):
+        self._session_client = session_client
+
+    async def get_current_position(self,
+                                   web_session: IAsyncWebSession,
+                                   account_id: int,
+                                   sedol_code: str,
+                                   category_code: str) -> ManualOrderPosition:
+        logger.debug("Get Current Position")
+
+        await pacing.pause_async(web_session)
+
+        res = await web_session.get(**manual.create_current_position_request(account_id=account_id,
+                                                                             sedol_code=sedol_code))
+        return manual.parse_current_position_response(res, category_code)
+
+    async def submit_order(self, web_session: IAsyncWebSession, order: ManualOrder):
+        logger.debug("Submit Order ...")
+
+        await pacing.pause_async(web_session)
+
+        await self._session_client.session_keepalive(
+            web_session=web_session, sedol_code=order.sedol, session_hl_vt=order.hl_vt)
+
+        await pacing.pause_async(web_session)
+
+        res = await web_session.post(**manual.create_submit_order_request(order))
+        return manual.parse_submit_order_response(res, order)
+
+    async def execute_order_flow(self, web_session: IAsyncWebSession,
+                                 order_request: OrderRequest) -> IOrderConfirmation:
+        logger.debug("Executing Deal As Manual Order ...")
+
+        current_position = await self.get_current_position(
+            web_session=web_session,
+            account_id=order_request.account_id,
+            sedol_code=order_request.sedol_code,
+            category_code=order_request.category_code)
+
+        order = manual.create_manual_order(order_request, current_position)
+
+        order_confirmation = await self.submit_order(web_session=web_session, order=order)
+
+        logger.debug(order_confirmation)
+
+        return order_confirmation
+
+
+class AsyncPendingOrdersClient:
+
+    async def get_pending_orders(self,
+                                 web_session: IAsyncWebSession,
+                                 account_id: int) -> List[PendingOrder]:
+        logger.debug(f"Get pending order for account '{account_id}' ...")
+
+        res = await web_session.get(**create_pending_orders_request(account_id))
+        return parse_pending_orders(account_id=account_id, pending_orders_html=res.content, encoding=res.encoding)
+
+    async def cancel_pending_order(self,
+                                   web_session: IAsyncWebSession,
+                                   cancel_order_id: int,
+                                   pending_orders: List[PendingOrder]) -> bool:
+        logger.debug(f"Cancel Pending Order '{cancel_order_id}' ...")
+
+        await pacing.pause_async(web_session)
+
+        res = await web_session.post(**create_cancel_request(cancel_order_id=cancel_order_id,
+                                                             pending_orders=pending_orders))
+        return parse_cancel_response(res)
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from typing import Optional
+
+from ..aio.session import AsyncLoggedInSession
+from ..session.refresher import SessionRefresher
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSessionRefresher:
+    """
+    Runs a SessionRefresher as an asyncio task instead of a thread
+    """
+    _web_session: AsyncLoggedInSession
+    _refresher: SessionRefresher
+    _check_interval_seconds: float
+    _task: Optional[asyncio.Task]
+
+    def __init__(self, web_session: AsyncLoggedInSession, refresher: SessionRefresher = None,
+                 check_interval_seconds: float = 30):
+        """
+        :param web_session: AsyncLoggedInSession - the session to keep alive
+        :param refresher: SessionRefresher - Optional, to customise the keepalive request or margin
+        :param check_interval_seconds: float - how often the task checks the session
+        """
+        self._web_session = web_session
+        self._refresher = SessionRefresher(web_session.web_session) if refresher is None else refresher
+        self._check_interval_seconds = check_interval_seconds
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self._check_interval_seconds)
+            await self._web_session.run(self._refresher.refresh_if_due)
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    @property
+    def refresher(self) -> SessionRefresher:
+        return self._refresher
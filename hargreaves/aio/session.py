@@ -0,0 +1,183 @@
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from typing import Optional, TYPE_CHECKING
+
+from requests import Response
+from requests_tracker.request import WebRequestType, RequestSessionContext
+from requests_tracker.session import IWebSession
+
+from ..session.shared import LoggedInSession, LoginDeferred
+
+if TYPE_CHECKING:
+    from ..aio.clients import AsyncAuthenticationClient
+
+logger = logging.getLogger(__name__)
+
+# the requests in flight at once across every session which is not given its own executor
+SHARED_MAX_WORKERS = 8
+
+_shared_executor: Optional[Executor] = None
+_shared_executor_lock = threading.Lock()
+
+
+def shared_executor() -> Executor:
+    """
+    The executor shared by the sessions which are not given one, created on first use
+    """
+    global _shared_executor
+    with _shared_executor_lock:
+        if _shared_executor is None:
+            _shared_executor = ThreadPoolExecutor(max_workers=SHARED_MAX_WORKERS, thread_name_prefix='hl-aio')
+        return _shared_executor
+
+
+class IAsyncWebSession:
+
+    async def get(self, url: str, request_type: WebRequestType = WebRequestType.Document,
+                  params=None, headers=None) -> Response:
+        pass
+
+    async def post(self, url: str, request_type: WebRequestType = WebRequestType.Document,
+                   data=None, headers=None) -> Response:
+        pass
+
+    @property
+    def cookies(self) -> CookieJar:
+        pass
+
+    @property
+    def request_session_context(self) -> RequestSessionContext:
+        pass
+
+
+class AsyncWebSession(IAsyncWebSession):
+    """
+    Drives a blocking IWebSession from an event loop.
+
+    The HTTP transport (requests + requests_tracker) stays blocking, so each call is handed to a small,
+    bounded executor, shared by every session by default, while the coroutine awaiting it yields the loop.
+    The pacing pauses between calls, which is where a deal flow spends most of its time, are plain asyncio
+    sleeps and hold no thread.
+    """
+    _web_session: IWebSession
+    _executor: Executor
+
+    def __init__(self, web_session: IWebSession, executor: Optional[Executor] = None):
+        """
+        :param web_session: IWebSession - the blocking session to drive
+        :param executor: Executor - Optional, the executor to run requests on, the executor shared by all sessions
+        (see shared_executor) when not given.  The caller shuts down an executor it passes in
+        """
+        self._web_session = web_session
+        self._executor = shared_executor() if executor is None else executor
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Runs a blocking callable on the session's executor
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def get(self, url: str, request_type: WebRequestType = WebRequestType.Document,
+                  params=None, headers=None) -> Response:
+        return await self.run(self._web_session.get, url=url, request_type=request_type,
+                              params=params, headers=headers)
+
+    async def post(self, url: str, request_type: WebRequestType = WebRequestType.Document,
+                   data=None, headers=None) -> Response:
+        return await self.run(self._web_session.post, url=url, request_type=request_type,
+                              data=data, headers=headers)
+
+    def close(self):
+        # the executor is shared or owned by the caller, so it outlives the session
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def web_session(self) -> IWebSession:
+        return self._web_session
+
+    @property
+    def cookies(self) -> CookieJar:
+        return self._web_session.cookies
+
+    @property
+    def request_session_context(self) -> RequestSessionContext:
+        return self._web_session.request_session_context
+
+    @property
+    def pacing_policy(self):
+        return getattr(self._web_session, 'pacing_policy', None)
+
+
+class AsyncLoggedInSession(AsyncWebSession):
+    """
+    Async counterpart of LoggedInSession, which logs in whenever a request is redirected to the login page.
+
+    The login itself is driven from the event loop: its requests run on the executor, and the pauses between them
+    are asyncio sleeps, so that accounts logging in again do not hold up the executor shared with the others.  When
+    several coroutines are bounced to the login page only the first one logs in, the others then replay their request.
+    """
+    _web_session: LoggedInSession
+    _authentication_client: 'AsyncAuthenticationClient'
+    _login_lock: Optional[asyncio.Lock]
+
+    def __init__(self, logged_in_session: LoggedInSession, executor: Optional[Executor] = None,
+                 authentication_client: 'AsyncAuthenticationClient' = None):
+        super().__init__(web_session=logged_in_session, executor=executor)
+        if authentication_client is None:
+            # imported here as the clients import this module
+            from ..aio.clients import AsyncAuthenticationClient
+            authentication_client = AsyncAuthenticationClient()
+        self._authentication_client = authentication_client
+        self._login_lock = None
+
+    async def get(self, url: str, request_type: WebRequestType = WebRequestType.Document,
+                  params=None, headers=None) -> Response:
+        return await self._send(self._web_session.get, url=url, request_type=request_type,
+                                params=params, headers=headers)
+
+    async def post(self, url: str, request_type: WebRequestType = WebRequestType.Document,
+                   data=None, headers=None) -> Response:
+        return await self._send(self._web_session.post, url=url, request_type=request_type,
+                                data=data, headers=headers)
+
+    async def _send(self, func, **kwargs) -> Response:
+        try:
+            return await self.run(self._send_deferring_login, func, **kwargs)
+        except LoginDeferred as login_deferred:
+            await self._login(login_deferred)
+        # replayed once logged in, a request bounced again is logged in by the LoggedInSession on the executor
+        return await self.run(func, **kwargs)
+
+    def _send_deferring_login(self, func, **kwargs) -> Response:
+        with self._web_session.deferring_login():
+            return func(**kwargs)
+
+    async def _login(self, login_deferred: LoginDeferred):
+        if self._login_lock is None:
+            self._login_lock = asyncio.Lock()
+        async with self._login_lock:
+            if self._web_session.login_generation != login_deferred.login_generation:
+                logger.debug("Login already performed by a concurrent request, let's replay the original request")
+                self._web_session.record_login_avoided()
+                return
+
+            logger.debug("Redirected to login page, let's login ...")
+            await self._authentication_client.login(
+                web_session=AsyncWebSession(self._web_session.web_session, executor=self._executor),
+                config=self._web_session.config,
+                redirect_response=login_deferred.redirect_response)
+            self._web_session.record_login()
+
+    def close(self):
+        self._web_session.close()
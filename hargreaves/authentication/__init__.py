@@ -1,23 +1,31 @@
 import logging
+from typing import TYPE_CHECKING
 
-from requests import Response
-from requests_tracker.session import IWebSession
-
-from ..authentication.clients import AuthenticationClient
 from ..config.models import ApiConfiguration
+from ..utils.lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from requests import Response
+    from requests_tracker.session import IWebSession
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'AuthenticationClient': '.clients'
+})
+
 
-def login(web_session: IWebSession,
-          config: ApiConfiguration) -> Response:
+def login(web_session: 'IWebSession',
+          config: ApiConfiguration) -> 'Response':
+    from ..authentication.clients import AuthenticationClient
     return AuthenticationClient().login(
         web_session=web_session,
         config=config
     )
 
 
-def logout(web_session: IWebSession):
+def logout(web_session: 'IWebSession'):
+    from ..authentication.clients import AuthenticationClient
     return AuthenticationClient().logout(
         web_session=web_session
     )
@@ -20,28 +20,13 @@ class AuthenticationClient:
               config: ApiConfiguration,
               redirect_response: Response = None) -> Response:
 
-        if redirect_response is not None:
-            logger.debug(f"STEP-1: Parse 'Security Token'")
-            hl_vt = parse_security_token(redirect_response.text)
-        else:
-            logger.debug("STEP-1: Get Security Token...")
-            hl_vt = get_security_token(web_session)
+        hl_vt = login_security_token(web_session, redirect_response)
 
         clock.sleep_random(minimum=1, maximum=3)
-        logger.debug(f"STEP-1: Posting username & dob (Security Token = {hl_vt})...")
-        step1_response = post_username_dob(web_session, hl_vt, config)
-        logger.debug(f"STEP-1:Parsing secure numbers...")
-        secure_numbers_requested = parse_secure_numbers(step1_response.text)
+        secure_numbers_requested = login_step_one(web_session, hl_vt, config)
 
         clock.sleep_random(minimum=1, maximum=3)
-        logger.debug(f"STEP-2: Posting Password & Secure Numbers ({secure_numbers_requested})...")
-        step2_response = post_secure_numbers(web_session, hl_vt, config, secure_numbers_requested)
-        logger.debug(f"STEP-2: OK, response url = {step2_response.url}...")
-
-        logger.debug(f"Set Logged-In Cookies...")
-        HLCookieHelper.set_logged_in_cookies(web_session.cookies)
-
-        return step2_response
+        return login_step_two(web_session, hl_vt, config, secure_numbers_requested)
 
     def logout(self, web_session: IWebSession):
         logger.debug(f"Logging out ...")
@@ -49,3 +34,42 @@ class AuthenticationClient:
         if response.status_code != http.HTTPStatus.OK:
             raise ConnectionError(f"Unexpected logout response code ('{response.status_code}')")
         web_session.cookies.clear()
+
+
+def login_security_token(web_session: IWebSession, redirect_response: Response = None) -> str:
+    """
+    The security token (hl_vt) of the login form, from the login page the request was redirected to if any.  The
+    login steps are shared by the sync and async clients, which pause between them.
+    """
+    if redirect_response is not None:
+        logger.debug("STEP-1: Parse 'Security Token'")
+        return parse_security_token(redirect_response.content, encoding=redirect_response.encoding)
+
+    logger.debug("STEP-1: Get Security Token...")
+    return get_security_token(web_session)
+
+
+def login_step_one(web_session: IWebSession, hl_vt: str, config: ApiConfiguration) -> list:
+    """
+    Posts the username and date of birth
+    :return: the secure numbers requested by HL
+    """
+    logger.debug(f"STEP-1: Posting username & dob (Security Token = {hl_vt})...")
+    step1_response = post_username_dob(web_session, hl_vt, config)
+    logger.debug("STEP-1:Parsing secure numbers...")
+    return parse_secure_numbers(step1_response.content, encoding=step1_response.encoding)
+
+
+def login_step_two(web_session: IWebSession, hl_vt: str, config: ApiConfiguration,
+                   secure_numbers_requested: list) -> Response:
+    """
+    Posts the password and the secure numbers requested, and sets the logged-in cookies
+    """
+    logger.debug(f"STEP-2: Posting Password & Secure Numbers ({secure_numbers_requested})...")
+    step2_response = post_secure_numbers(web_session, hl_vt, config, secure_numbers_requested)
+    logger.debug(f"STEP-2: OK, response url = {step2_response.url}...")
+
+    logger.debug("Set Logged-In Cookies...")
+    HLCookieHelper.set_logged_in_cookies(web_session.cookies)
+
+    return step2_response
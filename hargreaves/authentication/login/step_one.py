@@ -1,20 +1,20 @@
 import http
 
-from bs4 import BeautifulSoup
 from requests import Response
 
 from ...config.models import ApiConfiguration
+from ...utils.soup import make_soup, Markup, ParserBackend
 from requests_tracker.session import IWebSession
 
 
 def get_security_token(web_session: IWebSession):
-    stage_one_html = web_session.get("https://online.hl.co.uk/my-accounts/login-step-one").text
-    hl_vt = parse_security_token(stage_one_html)
+    res = web_session.get("https://online.hl.co.uk/my-accounts/login-step-one")
+    hl_vt = parse_security_token(res.content, encoding=res.encoding)
     return hl_vt
 
 
-def parse_security_token(stage_one_html: str) -> str:
-    soup = BeautifulSoup(stage_one_html, 'html.parser')
+def parse_security_token(stage_one_html: Markup, parser: ParserBackend = None, encoding: str = None) -> str:
+    soup = make_soup(stage_one_html, parser, encoding=encoding)
     soup.find(id="link3")
     node = soup.find('input', {'name': 'hl_vt'})
     hl_vt = None
@@ -30,6 +30,6 @@ def post_username_dob(web_session: IWebSession, hl_vt: str, config: ApiConfigura
     res = web_session.post('https://online.hl.co.uk/my-accounts/login-step-one', data=body)
     if res.status_code != http.HTTPStatus.OK:
         raise ConnectionError(f"Username/DOB step response code was {res.status_code}")
-    elif "try again" in res.text:
+    elif b"try again" in res.content:
         raise ValueError("An error occurred with posting Username & DoB. Check these before continuing")
     return res
@@ -1,22 +1,21 @@
 import http
 import re
 
-from bs4 import BeautifulSoup
-
 from ...config.models import ApiConfiguration
+from ...utils.soup import make_soup, Markup, ParserBackend
 from requests_tracker.session import IWebSession
 
 
 def get_secure_number_request(web_session: IWebSession):
-    stage_two_html = web_session.get("https://online.hl.co.uk/my-accounts/login-step-two").text
+    res = web_session.get("https://online.hl.co.uk/my-accounts/login-step-two")
 
-    secure_numbers_requested = parse_secure_numbers(stage_two_html)
+    secure_numbers_requested = parse_secure_numbers(res.content, encoding=res.encoding)
 
     return secure_numbers_requested
 
 
-def parse_secure_numbers(stage_two_html: str) -> list:
-    soup = BeautifulSoup(stage_two_html, 'html.parser')
+def parse_secure_numbers(stage_two_html: Markup, parser: ParserBackend = None, encoding: str = None) -> list:
+    soup = make_soup(stage_two_html, parser, encoding=encoding)
 
     secure_numbers = []
     for selector in ['secure-number-1', 'secure-number-2', 'secure-number-3']:
@@ -47,6 +46,6 @@ def post_secure_numbers(web_session: IWebSession,
     res = web_session.post('https://online.hl.co.uk/my-accounts/login-step-two', data=body)
     if res.status_code != http.HTTPStatus.OK:
         raise ConnectionError(f"Secure Number step response code was {res.status_code}")
-    elif "try again" in res.text:
+    elif b"try again" in res.content:
         raise ValueError("An error occurred with posting password and secure number. Check these before continuing")
     return res
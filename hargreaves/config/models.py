@@ -1,4 +1,5 @@
 class ApiConfiguration:
+    __slots__ = ('_username', '_password', '_date_of_birth', '_secure_number')
     _username: str
     _password: str
     _date_of_birth: str
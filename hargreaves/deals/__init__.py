@@ -1,32 +1,56 @@
 import logging
+from typing import Iterable, List, TYPE_CHECKING
 
-from ..account.clients import AccountClient
-from ..deals.clients import DealClient
-from ..deals.models import DealRequest, DealResult
-from ..orders.manual.clients import ManualOrderClient
-from ..orders.market.clients import MarketOrderClient
-from ..search.clients import SecuritySearchClient
-from ..session.clients import SessionClient
-from requests_tracker.session import IWebSession
+from ..deals.models import DealExecution, DealRequest, DealResult
+from ..utils.lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from requests_tracker.session import IWebSession
+    from ..deals.clients import DealClient
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'AccountClient': '..account.clients',
+    'DealClient': '.clients',
+    'ManualOrderClient': '..orders.manual.clients',
+    'MarketOrderClient': '..orders.market.clients',
+    'SecuritySearchClient': '..search.clients',
+    'SessionClient': '..session.clients'
+})
+
+
+def _create_deal_client() -> 'DealClient':
+    from ..account.clients import AccountClient
+    from ..deals.clients import DealClient
+    from ..orders.manual.clients import ManualOrderClient
+    from ..orders.market.clients import MarketOrderClient
+    from ..search.clients import SecuritySearchClient
+    from ..session.clients import SessionClient
 
-def execute_deal(web_session: IWebSession, deal_request: DealRequest) -> DealResult:
     account_client = AccountClient()
     search_client = SecuritySearchClient()
     session_client = SessionClient()
     market_order_client = MarketOrderClient(session_client)
     manual_order_client = ManualOrderClient(session_client)
 
-    deal_client = DealClient(
+    return DealClient(
         account_client=account_client,
         search_client=search_client,
         market_order_client=market_order_client,
         manual_order_client=manual_order_client
     )
 
-    return deal_client.execute_deal(
+
+def execute_deal(web_session: 'IWebSession', deal_request: DealRequest) -> DealResult:
+    return _create_deal_client().execute_deal(
         web_session=web_session,
         deal_request=deal_request
     )
+
+
+def execute_deals(web_session: 'IWebSession', deal_requests: Iterable[DealRequest]) -> List[DealExecution]:
+    return _create_deal_client().execute_deals(
+        web_session=web_session,
+        deal_requests=deal_requests
+    )
@@ -1,13 +1,18 @@
 import logging
+import time
+from typing import Dict, Iterable, List, Union
 
 from ..account.clients import IAccountClient
-from ..deals.models import DealRequest, DealResult
+from ..account.models import AccountDetail, AccountSummary
+from ..deals.errors import DealAccountNotFoundError
+from ..deals.models import DealExecution, DealRequest, DealResult
 from ..orders.manual.clients import IManualOrderClient
 from ..orders.market.clients import IMarketOrderClient
 from ..orders.market.errors import MarketClosedError, MarketOrderLiveQuoteError
-from ..orders.models import OrderRequest
+from ..orders.models import OrderPositionType, OrderRequest
 from ..search import InvestmentTypes
-from ..search.clients import security_filter, ISecuritySearchClient
+from ..search.clients import DEFAULT_RESOLVE_CONCURRENCY, security_filter, ISecuritySearchClient
+from ..search.models import ResolvedSecurities, SearchResult
 from requests_tracker.session import IWebSession
 
 logger = logging.getLogger(__name__)
@@ -34,11 +39,7 @@ class DealClient():
 
         accounts = self._account_client.get_account_summary(web_session=web_session)
 
-        account_summary = next((account_summary for account_summary in accounts
-                                if account_summary.account_id == deal_request.account_id), None)
-
-        account_detail = self._account_client.get_account_detail(
-            web_session=web_session, account_summary=account_summary)
+        account_detail = self._get_account_detail(web_session, accounts, deal_request.account_id)
 
         account_value = account_detail.total_value
         account_cash = account_detail.total_cash
@@ -58,6 +59,90 @@ class DealClient():
             stock_ticker=deal_request.stock_ticker,
             sedol_code=deal_request.sedol_code)
 
+        return self._execute_order(web_session, deal_request, found_security, account_value)
+
+    def execute_deals(self, web_session: IWebSession, deal_requests: Iterable[DealRequest],
+                      max_concurrency: int = DEFAULT_RESOLVE_CONCURRENCY) -> List[DealExecution]:
+        """
+        Executes a basket of deals, loading the account list and the detail of each account once and searching for
+        each stock ticker once, with at most max_concurrency searches in flight, before any order is placed.  The
+        sells are placed before the buys to free up cash, and a buy is sized on the account value loaded up front,
+        so the weights of a rebalance do not drift as it progresses.  The orders are placed one after the other, as
+        every order flow hands its session token (hl_vt) from one page to the next.
+        :param web_session: IWebSession - the session, which is shared by the searches
+        :param deal_requests: the deals to execute
+        :param max_concurrency: int - the maximum number of searches in flight
+        :return: the outcome of every deal, in the order they were placed, a failed deal does not stop the others
+        """
+        deal_requests = execution_order(deal_requests)
+        if not deal_requests:
+            return []
+
+        account_values = self._load_account_values(web_session, deal_requests)
+        resolved_securities = self._search_client.resolve_securities(
+            web_session=web_session,
+            stock_tickers=[deal_request.stock_ticker for deal_request in deal_requests],
+            investment_types=InvestmentTypes.ALL,
+            max_concurrency=max_concurrency)
+
+        executions = []
+        for deal_request in deal_requests:
+            started = time.perf_counter()
+            try:
+                account_value = account_values[deal_request.account_id]
+                if isinstance(account_value, BaseException):
+                    raise account_value
+
+                found_security = deal_security(resolved_securities, deal_request)
+                deal_result = self._execute_order(web_session, deal_request, found_security, account_value)
+                executions.append(DealExecution(deal_request=deal_request, deal_result=deal_result,
+                                                seconds=time.perf_counter() - started))
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except BaseException as ex:
+                logger.warning(f"Deal {deal_request.position_type.value} {deal_request.stock_ticker} failed: {ex!r}")
+                executions.append(DealExecution(deal_request=deal_request, error=ex,
+                                                seconds=time.perf_counter() - started))
+
+        logger.debug(f"Executed {sum(execution.succeeded for execution in executions)} of {len(executions)} deals")
+        return executions
+
+    def _get_account_detail(self, web_session: IWebSession, accounts: List[AccountSummary],
+                            account_id: int) -> AccountDetail:
+        account_summary = next((account_summary for account_summary in accounts
+                                if account_summary.account_id == account_id), None)
+        if account_summary is None:
+            raise DealAccountNotFoundError(account_id)
+
+        return self._account_client.get_account_detail(
+            web_session=web_session, account_summary=account_summary)
+
+    def _load_account_values(self, web_session: IWebSession,
+                             deal_requests: List[DealRequest]) -> Dict[int, Union[float, BaseException]]:
+        """
+        The value of every account dealt in, or the error which prevented it from being loaded.  The detail pages
+        are loaded one at a time, as the holdings CSV is served for the account whose page was loaded last.
+        """
+        accounts = self._account_client.get_account_summary(web_session=web_session)
+
+        account_values = {}
+        for account_id in dict.fromkeys(deal_request.account_id for deal_request in deal_requests):
+            try:
+                account_detail = self._get_account_detail(web_session, accounts, account_id)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except BaseException as ex:
+                account_values[account_id] = ex
+                continue
+
+            logger.debug(f"Account {account_id} Value = £ {account_detail.total_value:,.2f}, "
+                         f"Cash Available = £ {account_detail.total_cash:,.2f}")
+            account_values[account_id] = account_detail.total_value
+        return account_values
+
+    def _execute_order(self, web_session: IWebSession, deal_request: DealRequest, found_security: SearchResult,
+                       account_value: float) -> DealResult:
+
         order_request = OrderRequest(
             sedol_code=found_security.sedol_code,
             category_code=found_security.category,
@@ -91,3 +176,26 @@ class DealClient():
             order_confirmation = self._manual_order_client.execute_order_flow(
                 web_session=web_session, order_request=order_request)
             return DealResult(order_request=order_request, order_confirmation=order_confirmation)
+
+
+def execution_order(deal_requests: Iterable[DealRequest]) -> List[DealRequest]:
+    """
+    The deals with the sells first, otherwise in their original order
+    """
+    return sorted(deal_requests, key=lambda deal_request: deal_request.position_type != OrderPositionType.Sell)
+
+
+def deal_security(resolved_securities: ResolvedSecurities, deal_request: DealRequest) -> SearchResult:
+    """
+    The security of a deal, from the securities resolved for the basket.  A deal which names a SEDOL code narrows
+    down the search results of its ticker, which may be ambiguous on the ticker alone.
+    """
+    stock_ticker = deal_request.stock_ticker.strip().upper()
+    if deal_request.sedol_code is not None and stock_ticker in resolved_securities.search_results:
+        return security_filter(
+            search_results=resolved_securities.search_results[stock_ticker],
+            stock_ticker=stock_ticker,
+            sedol_code=deal_request.sedol_code)
+    if stock_ticker in resolved_securities.errors:
+        raise resolved_securities.errors[stock_ticker]
+    return resolved_securities.results[stock_ticker]
@@ -0,0 +1,5 @@
+class DealAccountNotFoundError(BaseException):
+
+    def __init__(self, account_id: int):
+        super().__init__(f"Account {account_id} was not found")
+        self.account_id = account_id
@@ -4,6 +4,9 @@ from ..orders.models import OrderPositionType, IOrderConfirmation, OrderRequest
 
 
 class DealRequest():
+    __slots__ = (
+        '_stock_ticker', '_account_id', '_position_type', '_position_percentage', '_allow_fill_or_kill', '_sedol_code'
+    )
     _stock_ticker: str
     _account_id: int
     _position_type: OrderPositionType
@@ -70,6 +73,7 @@ class DealRequest():
 
 
 class DealResult():
+    __slots__ = ('_order_request', '_order_response')
     _order_request: OrderRequest
     _order_response: IOrderConfirmation
 
@@ -92,3 +96,59 @@ class DealResult():
             order_request={self.order_request},
             order_result={self.order_result}
         ]"""
+
+
+class DealExecution():
+    """
+    The outcome of one deal of a batch: its result, or the error which stopped it, and how long it took
+    """
+    __slots__ = ('_deal_request', '_deal_result', '_error', '_seconds')
+    _deal_request: DealRequest
+    _deal_result: Optional[DealResult]
+    _error: Optional[BaseException]
+    _seconds: float
+
+    def __init__(self,
+                 deal_request: DealRequest,
+                 deal_result: Optional[DealResult] = None,
+                 error: Optional[BaseException] = None,
+                 seconds: float = 0.0):
+        """
+        :param deal_request: DealRequest - the deal requested
+        :param deal_result: DealResult - the order placed, None when the deal failed
+        :param error: BaseException - the error which stopped the deal, None when it succeeded
+        :param seconds: float - the time taken to place the order, excluding the account and security lookups
+        """
+        self._deal_request = deal_request
+        self._deal_result = deal_result
+        self._error = error
+        self._seconds = seconds
+
+    @property
+    def deal_request(self) -> DealRequest:
+        return self._deal_request
+
+    @property
+    def deal_result(self) -> Optional[DealResult]:
+        return self._deal_result
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        return self._error
+
+    @property
+    def seconds(self) -> float:
+        return self._seconds
+
+    @property
+    def succeeded(self) -> bool:
+        return self._error is None
+
+    def __str__(self):
+        return f"""DealExecution[
+            stock_ticker={self._deal_request.stock_ticker},
+            position_type={self._deal_request.position_type},
+            succeeded={self.succeeded},
+            error={self._error!r},
+            seconds={self._seconds:.3f}
+        ]"""
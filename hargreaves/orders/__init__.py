@@ -1,3 +1,12 @@
 from .pending import *
 from .manual import *
 from .market import *
+from ..utils.lazy import lazy_attributes
+
+# the clients are loaded on first use, with the same precedence as the star imports above
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'PendingOrdersClient': '.pending.clients',
+    'ManualOrderClient': '.manual.clients',
+    'MarketOrderClient': '.market.clients',
+    'SessionClient': '..session.clients'
+})
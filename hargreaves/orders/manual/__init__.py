@@ -1,17 +1,26 @@
 import logging
+from typing import TYPE_CHECKING
 
-from ...orders.manual.clients import ManualOrderClient
 from ...orders.manual.models import ManualOrderPosition, ManualOrder
-from ...session.clients import SessionClient
-from requests_tracker.session import IWebSession
+from ...utils.lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from requests_tracker.session import IWebSession
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'ManualOrderClient': '.clients',
+    'SessionClient': '...session.clients'
+})
+
 
-def get_current_position(web_session: IWebSession,
+def get_current_position(web_session: 'IWebSession',
                          account_id: int,
                          sedol_code: str,
                          category_code: str) -> ManualOrderPosition:
+    from ...orders.manual.clients import ManualOrderClient
+    from ...session.clients import SessionClient
     client = ManualOrderClient(SessionClient())
     return client.get_current_position(
         web_session=web_session,
@@ -21,7 +30,9 @@ def get_current_position(web_session: IWebSession,
     )
 
 
-def submit_order(web_session: IWebSession, order: ManualOrder):
+def submit_order(web_session: 'IWebSession', order: ManualOrder):
+    from ...orders.manual.clients import ManualOrderClient
+    from ...session.clients import SessionClient
     client = ManualOrderClient(SessionClient())
     return client.submit_order(
         web_session=web_session,
@@ -1,13 +1,16 @@
 import http
 import logging
 
+from requests import Response
+
 from ...orders.manual.errors import ManualOrderFailedError
 from ...orders.manual.models import ManualOrder, ManualOrderPosition
 from ...orders.manual.parsers import parse_manual_order_confirmation_page, parse_manual_order_entry_page
 from ...orders.models import OrderRequest, IOrderConfirmation, PositionCalculator
+from ...search.index import record_manual_order_position
 from ...search.models import InvestmentCategoryTypes
 from ...session.clients import ISessionClient
-from ...utils import clock
+from ...utils import pacing
 from requests_tracker.session import IWebSession, WebRequestType
 
 logger = logging.getLogger(__name__)
@@ -43,51 +46,24 @@ class ManualOrderClient(IManualOrderClient):
 
         logger.debug("Get Current Position")
 
-        clock.sleep_random()
-
-        request_headers = {
-            'Referer': f'https://online.hl.co.uk/my-accounts/security_deal/sedol/{sedol_code}'
-        }
-
-        order_html = web_session.get(url=f"https://online.hl.co.uk/my-accounts/manual_order/"
-                                         f"sedol/{sedol_code}/product_no/{account_id}",
-                                     headers=request_headers).text
+        pacing.pause(web_session)
 
-        current_position = parse_manual_order_entry_page(order_html, category_code)
-        return current_position
+        res = web_session.get(**create_current_position_request(account_id=account_id, sedol_code=sedol_code))
+        return parse_current_position_response(res, category_code)
 
     def submit_order(self, web_session: IWebSession, order: ManualOrder):
 
-        logger.debug(f"Submit Order ...")
+        logger.debug("Submit Order ...")
 
-        clock.sleep_random()
+        pacing.pause(web_session)
 
         self._session_client.session_keepalive(
             web_session=web_session, sedol_code=order.sedol, session_hl_vt=order.hl_vt)
 
-        clock.sleep_random()
-
-        request_headers = {
-            'Referer': f'https://online.hl.co.uk/my-accounts/security_deal/sedol/{order.sedol}'
-        }
-
-        form = order.as_form_fields()
-
-        if order.category_code == InvestmentCategoryTypes.OVERSEAS:
-            request_url = 'https://online.hl.co.uk/my-accounts/manual_deal_overseas'
-        else:
-            request_url = 'https://online.hl.co.uk/my-accounts/manual_deal'
+        pacing.pause(web_session)
 
-        res = web_session.post(request_url,
-                               request_type=WebRequestType.XHR,
-                               data=form, headers=request_headers)
-
-        if res.status_code != http.HTTPStatus.OK:
-            raise ManualOrderFailedError(f"Purchase invalid, HTTP response code was {res.status_code}")
-
-        order_confirmation = parse_manual_order_confirmation_page(confirm_html=res.text, amount_type=order.amount_type)
-
-        return order_confirmation
+        res = web_session.post(**create_submit_order_request(order))
+        return parse_submit_order_response(res, order)
 
     def execute_order_flow(self, web_session: IWebSession, order_request: OrderRequest) -> IOrderConfirmation:
 
@@ -101,21 +77,7 @@ class ManualOrderClient(IManualOrderClient):
 
         logger.debug(current_position.as_form_fields())
 
-        (amount_type, order_quantity) = PositionCalculator.calculate(
-            position_type=order_request.position_type,
-            position_percentage=order_request.position_percentage,
-            account_value=order_request.account_value,
-            units_held=current_position.remaining_units
-        )
-
-        logger.debug(f"CALCULATED: amount_type = {amount_type}, order_quantity = {order_quantity:,f}...")
-
-        order = ManualOrder(
-            position=current_position,
-            position_type=order_request.position_type,
-            amount_type=amount_type,
-            quantity=order_quantity,
-            limit=None)
+        order = create_manual_order(order_request, current_position)
 
         # submit order
         order_confirmation = self.submit_order(
@@ -125,3 +87,61 @@ class ManualOrderClient(IManualOrderClient):
         logger.debug(order_confirmation)
 
         return order_confirmation
+
+
+# The request arguments and response handling of each step, shared by the sync and async clients, which only differ
+# in how they send the requests and pause between them
+
+def create_current_position_request(account_id: int, sedol_code: str) -> dict:
+    return dict(
+        url=f"https://online.hl.co.uk/my-accounts/manual_order/sedol/{sedol_code}/product_no/{account_id}",
+        headers={
+            'Referer': f'https://online.hl.co.uk/my-accounts/security_deal/sedol/{sedol_code}'
+        })
+
+
+def parse_current_position_response(res: Response, category_code: str) -> ManualOrderPosition:
+    current_position = parse_manual_order_entry_page(res.content, category_code, encoding=res.encoding)
+    record_manual_order_position(current_position)
+    return current_position
+
+
+def create_manual_order(order_request: OrderRequest, current_position: ManualOrderPosition) -> ManualOrder:
+    (amount_type, order_quantity) = PositionCalculator.calculate(
+        position_type=order_request.position_type,
+        position_percentage=order_request.position_percentage,
+        account_value=order_request.account_value,
+        units_held=current_position.remaining_units
+    )
+
+    logger.debug(f"CALCULATED: amount_type = {amount_type}, order_quantity = {order_quantity:,f}...")
+
+    return ManualOrder(
+        position=current_position,
+        position_type=order_request.position_type,
+        amount_type=amount_type,
+        quantity=order_quantity,
+        limit=None)
+
+
+def create_submit_order_request(order: ManualOrder) -> dict:
+    if order.category_code == InvestmentCategoryTypes.OVERSEAS:
+        request_url = 'https://online.hl.co.uk/my-accounts/manual_deal_overseas'
+    else:
+        request_url = 'https://online.hl.co.uk/my-accounts/manual_deal'
+
+    return dict(
+        url=request_url,
+        request_type=WebRequestType.XHR,
+        data=order.as_form_fields(),
+        headers={
+            'Referer': f'https://online.hl.co.uk/my-accounts/security_deal/sedol/{order.sedol}'
+        })
+
+
+def parse_submit_order_response(res: Response, order: ManualOrder) -> IOrderConfirmation:
+    if res.status_code != http.HTTPStatus.OK:
+        raise ManualOrderFailedError(f"Purchase invalid, HTTP response code was {res.status_code}")
+
+    return parse_manual_order_confirmation_page(confirm_html=res.content, amount_type=order.amount_type,
+                                                encoding=res.encoding)
@@ -5,6 +5,11 @@ from ...orders.models import OrderPositionType, OrderAmountType, IOrderConfirmat
 
 
 class ManualOrderPosition:
+    __slots__ = (
+        '_hl_vt', '_security_type', '_out_of_hours', '_sedol', '_account_id', '_available', '_holding',
+        '_holding_value', '_transfer_units', '_remaining_units', '_remaining_units_value', '_isin', '_epic',
+        '_currency_code', '_SD_Bid', '_SD_Ask', '_fixed_interest', '_category_code'
+    )
     _hl_vt: str
     _security_type: str
     _out_of_hours: bool
@@ -157,6 +162,7 @@ class ManualOrderPosition:
 
 
 class ManualOrder():
+    __slots__ = ('_position', '_position_type', '_amount_type', '_quantity', '_limit', '_earmark_orders_confirm')
     _position: ManualOrderPosition
     _position_type: OrderPositionType
     _amount_type: OrderAmountType
@@ -232,6 +238,9 @@ class ManualOrder():
 
 
 class ManualOrderConfirmation(IOrderConfirmation):
+    __slots__ = (
+        '_order_date', '_stock_code', '_amount_type', '_quantity', '_order_type', '_limit_price', '_order_status'
+    )
     _order_date: datetime.date
     _stock_code: str
     _amount_type: OrderAmountType
@@ -1,23 +1,31 @@
-from bs4 import BeautifulSoup
-
 from ...orders.manual.errors import ManualOrderFailedError
 from ...orders.manual.models import ManualOrderConfirmation, ManualOrderPosition
 from ...orders.models import OrderAmountType
+from ...utils.forms import extract_hidden_inputs
 from ...utils.input import InputHelper
+from ...utils.soup import decode, Fragment, make_soup, Markup, ParserBackend
+
+# The parts of each page read by the parsers
+ORDER_ENTRY_FRAGMENTS = [Fragment('form', id='oh_form')]
+CONFIRMATION_FRAGMENTS = [Fragment('div', class_='error-box'),
+                          Fragment('table', summary='Your current pending orders')]
 
 
-def parse_manual_order_entry_page(order_html: str, category_code: str) -> ManualOrderPosition:
-    soup = BeautifulSoup(order_html, 'html.parser')
+def parse_manual_order_entry_page(order_html: Markup, category_code: str,
+                                  parser: ParserBackend = None, encoding: str = None) -> ManualOrderPosition:
+    # Fetch the fields needed for the next step, without building the tree when the page has the expected shape
+    tags = extract_hidden_inputs(order_html, 'oh_form', encoding)
+    if tags is None:
+        soup = make_soup(order_html, parser, ORDER_ENTRY_FRAGMENTS, encoding)
 
-    form = soup.find("form", id="oh_form")
+        form = soup.find("form", id="oh_form")
 
-    if form is None:
-        raise ManualOrderFailedError(message="Could not find 'oh_form'", html=order_html)
+        if form is None:
+            raise ManualOrderFailedError(message="Could not find 'oh_form'", html=decode(order_html, encoding))
 
-    # Fetch the fields needed for the next step
-    tags = {}
-    for hidden_tag in form.find_all("input", type="hidden"):
-        tags[hidden_tag['name']] = hidden_tag['value']
+        tags = {}
+        for hidden_tag in form.find_all("input", type="hidden"):
+            tags[hidden_tag['name']] = hidden_tag['value']
 
     return ManualOrderPosition(
         hl_vt=str(tags['hl_vt']),
@@ -40,16 +48,18 @@ def parse_manual_order_entry_page(order_html: str, category_code: str) -> Manual
         category_code=category_code)
 
 
-def parse_manual_order_confirmation_page(confirm_html: str, amount_type: OrderAmountType) -> ManualOrderConfirmation:
-    soup = BeautifulSoup(confirm_html, 'html.parser')
+def parse_manual_order_confirmation_page(confirm_html: Markup, amount_type: OrderAmountType,
+                                         parser: ParserBackend = None, encoding: str = None) -> ManualOrderConfirmation:
+    soup = make_soup(confirm_html, parser, CONFIRMATION_FRAGMENTS, encoding)
 
     error_box = soup.select_one('div[class="box error-box spacer-bottom"]')
     if error_box is not None:
-        raise ManualOrderFailedError(message=error_box.get_text(strip=True), html=confirm_html)
+        raise ManualOrderFailedError(message=error_box.get_text(strip=True), html=decode(confirm_html, encoding))
 
     pending_orders_table = soup.select_one('table[summary="Your current pending orders"]')
     if pending_orders_table is None:
-        raise ManualOrderFailedError("Pending Order Table Not Found, see HTML for more details", confirm_html)
+        raise ManualOrderFailedError("Pending Order Table Not Found, see HTML for more details",
+                                     decode(confirm_html, encoding))
 
     table_columns = pending_orders_table.find_all("th")
     if len(table_columns) != 6:
@@ -1,22 +1,32 @@
 import logging
+from typing import TYPE_CHECKING
 
-from ...orders.market.clients import MarketOrderClient
 from ...orders.market.models import MarketOrderPosition, MarketOrder, MarketOrderQuote, MarketOrderConfirmation
-from ...session.clients import SessionClient
-from requests_tracker.session import IWebSession
+from ...utils.lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from requests_tracker.session import IWebSession
+    from ...orders.market.clients import MarketOrderClient
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'MarketOrderClient': '.clients',
+    'SessionClient': '...session.clients'
+})
+
 
-def create_client() -> MarketOrderClient:
+def create_client() -> 'MarketOrderClient':
+    from ...orders.market.clients import MarketOrderClient
+    from ...session.clients import SessionClient
     return MarketOrderClient(SessionClient())
 
 
-def get_current_position(web_session: IWebSession,
+def get_current_position(web_session: 'IWebSession',
                          account_id: int,
                          sedol_code: str,
                          category_code: str) -> MarketOrderPosition:
-    client = MarketOrderClient(SessionClient())
+    client = create_client()
     return client.get_current_position(
         web_session=web_session,
         account_id=account_id,
@@ -25,16 +35,16 @@ def get_current_position(web_session: IWebSession,
     )
 
 
-def get_order_quote(web_session: IWebSession, order: MarketOrder) -> MarketOrderQuote:
-    client = MarketOrderClient(SessionClient())
+def get_order_quote(web_session: 'IWebSession', order: MarketOrder) -> MarketOrderQuote:
+    client = create_client()
     return client.get_order_quote(
         web_session=web_session,
         order=order
     )
 
 
-def submit_order(web_session: IWebSession, order_quote: MarketOrderQuote) -> MarketOrderConfirmation:
-    client = MarketOrderClient(SessionClient())
+def submit_order(web_session: 'IWebSession', order_quote: MarketOrderQuote) -> MarketOrderConfirmation:
+    client = create_client()
     return client.submit_order(
         web_session=web_session,
         order_quote=order_quote
@@ -1,14 +1,17 @@
 import http
 import logging
 
+from requests import Response
+
 from ...orders.market.errors import MarketOrderFailedError
 from ...orders.market.models import MarketOrderPosition, MarketOrderQuote, MarketOrderConfirmation, MarketOrder
 from ...orders.market.parsers import parse_market_order_entry_page, parse_market_order_quote_page, \
     parse_market_order_confirmation_page
 from ...orders.models import PositionCalculator, OrderRequest, IOrderConfirmation, OrderPositionType
+from ...search.index import record_market_order_position
 from ...search.models import InvestmentCategoryTypes
 from ...session.clients import ISessionClient
-from ...utils import clock
+from ...utils import pacing
 from requests_tracker.session import IWebSession, WebRequestType
 
 logger = logging.getLogger(__name__)
@@ -47,83 +50,40 @@ class MarketOrderClient(IMarketOrderClient):
 
         logger.debug("Get Current Position")
 
-        clock.sleep_random()
+        pacing.pause(web_session)
 
-        order_html = web_session.get(f"https://online.hl.co.uk/my-accounts/account_select/"
-                                     f"account/{account_id}/sedol/{sedol_code}/rq/select/type/trade").text
-        order_info = parse_market_order_entry_page(order_html, category_code)
-        return order_info
+        res = web_session.get(**create_current_position_request(account_id=account_id, sedol_code=sedol_code))
+        return parse_current_position_response(res, category_code)
 
     def get_order_quote(self, web_session: IWebSession, order: MarketOrder) -> MarketOrderQuote:
 
         logger.debug("Get Order Quote")
 
-        clock.sleep_random()
+        pacing.pause(web_session)
 
         self._session_client.session_keepalive(
             web_session=web_session, sedol_code=order.sedol, session_hl_vt=order.hl_vt)
 
-        clock.sleep_random()
-
-        request_headers = {
-            'Referer': f'https://online.hl.co.uk/my-accounts/security_deal/sedol/{order.sedol}'
-        }
-
-        if order.category_code == InvestmentCategoryTypes.OVERSEAS:
-            request_url = 'https://online.hl.co.uk/my-accounts/confirm_equity_overseas'
-        else:
-            request_url = 'https://online.hl.co.uk/my-accounts/confirm_equity_deal'
-
-        res = web_session.post(request_url,
-                               request_type=WebRequestType.XHR, data=order.as_form_fields(),
-                               headers=request_headers)
-
-        if res.status_code != http.HTTPStatus.OK:
-            raise ConnectionError(f"Buy quote invalid, HTTP response code was {res.status_code}")
-        elif "another account open" in res.text:
-            raise ValueError("An error occurred with the sequence of calls - the wrong hl_vt was passed in.")
+        pacing.pause(web_session)
 
-        price_quote = parse_market_order_quote_page(res.text, category_code=order.category_code)
-        return price_quote
+        res = web_session.post(**create_order_quote_request(order))
+        return parse_order_quote_response(res, order)
 
     def submit_order(self, web_session: IWebSession, order_quote: MarketOrderQuote) -> MarketOrderConfirmation:
 
-        logger.debug(f"Execute (Confirm) Order ...")
+        logger.debug("Execute (Confirm) Order ...")
 
-        clock.sleep_random()
+        pacing.pause(web_session)
 
         self._session_client.session_keepalive(
             web_session=web_session,
             sedol_code=order_quote.sedol_code,
             session_hl_vt=order_quote.session_hl_vt)
 
-        clock.sleep_random()
-
-        request_headers = {
-            'Referer': f'https://online.hl.co.uk/my-accounts/security_deal/sedol/{order_quote.sedol_code}'
-        }
-
-        form = {
-            'hl_vt': order_quote.hl_vt,
-            'sedol': order_quote.sedol_code
-        }
-
-        if order_quote.category_code == InvestmentCategoryTypes.OVERSEAS:
-            request_url = 'https://online.hl.co.uk/my-accounts/equity_confirmation_overseas'
-        else:
-            request_url = 'https://online.hl.co.uk/my-accounts/equity_confirmation'
-
-        res = web_session.post(request_url,
-                               request_type=WebRequestType.XHR,
-                               data=form, headers=request_headers)
-
-        if res.status_code != http.HTTPStatus.OK:
-            raise MarketOrderFailedError(f"Purchase invalid, HTTP response code was {res.status_code}")
+        pacing.pause(web_session)
 
-        order_confirmation = parse_market_order_confirmation_page(confirm_html=res.text,
-                                                                  category_code=order_quote.category_code)
-
-        return order_confirmation
+        res = web_session.post(**create_submit_order_request(order_quote))
+        return parse_submit_order_response(res, order_quote)
 
     def execute_order_flow(self, web_session: IWebSession, order_request: OrderRequest) -> IOrderConfirmation:
 
@@ -137,22 +97,7 @@ class MarketOrderClient(IMarketOrderClient):
 
         logger.debug(current_position.as_form_fields())
 
-        (amount_type, order_quantity) = PositionCalculator.calculate(
-            position_type=order_request.position_type,
-            position_percentage=order_request.position_percentage,
-            account_value=order_request.account_value,
-            units_held=current_position.units_held
-        )
-
-        logger.debug(f"CALCULATED: amount_type = {amount_type}, order_quantity = {order_quantity:,f}...")
-
-        order = MarketOrder(
-            position=current_position,
-            position_type=order_request.position_type,
-            amount_type=amount_type,
-            quantity=order_quantity,
-            including_charges=(True if order_request.position_type == OrderPositionType.Buy else False)
-        )
+        order = create_market_order(order_request, current_position)
 
         order_quote = self.get_order_quote(
             web_session=web_session,
@@ -167,3 +112,86 @@ class MarketOrderClient(IMarketOrderClient):
         logger.debug(order_confirmation)
 
         return order_confirmation
+
+
+# The request arguments and response handling of each step, shared by the sync and async clients, which only differ
+# in how they send the requests and pause between them
+
+def create_current_position_request(account_id: int, sedol_code: str) -> dict:
+    return dict(url=f"https://online.hl.co.uk/my-accounts/account_select/"
+                    f"account/{account_id}/sedol/{sedol_code}/rq/select/type/trade")
+
+
+def parse_current_position_response(res: Response, category_code: str) -> MarketOrderPosition:
+    current_position = parse_market_order_entry_page(res.content, category_code, encoding=res.encoding)
+    record_market_order_position(current_position)
+    return current_position
+
+
+def create_market_order(order_request: OrderRequest, current_position: MarketOrderPosition) -> MarketOrder:
+    (amount_type, order_quantity) = PositionCalculator.calculate(
+        position_type=order_request.position_type,
+        position_percentage=order_request.position_percentage,
+        account_value=order_request.account_value,
+        units_held=current_position.units_held
+    )
+
+    logger.debug(f"CALCULATED: amount_type = {amount_type}, order_quantity = {order_quantity:,f}...")
+
+    return MarketOrder(
+        position=current_position,
+        position_type=order_request.position_type,
+        amount_type=amount_type,
+        quantity=order_quantity,
+        including_charges=(True if order_request.position_type == OrderPositionType.Buy else False)
+    )
+
+
+def create_order_quote_request(order: MarketOrder) -> dict:
+    if order.category_code == InvestmentCategoryTypes.OVERSEAS:
+        request_url = 'https://online.hl.co.uk/my-accounts/confirm_equity_overseas'
+    else:
+        request_url = 'https://online.hl.co.uk/my-accounts/confirm_equity_deal'
+
+    return dict(
+        url=request_url,
+        request_type=WebRequestType.XHR,
+        data=order.as_form_fields(),
+        headers={
+            'Referer': f'https://online.hl.co.uk/my-accounts/security_deal/sedol/{order.sedol}'
+        })
+
+
+def parse_order_quote_response(res: Response, order: MarketOrder) -> MarketOrderQuote:
+    if res.status_code != http.HTTPStatus.OK:
+        raise ConnectionError(f"Buy quote invalid, HTTP response code was {res.status_code}")
+    elif b"another account open" in res.content:
+        raise ValueError("An error occurred with the sequence of calls - the wrong hl_vt was passed in.")
+
+    return parse_market_order_quote_page(res.content, category_code=order.category_code, encoding=res.encoding)
+
+
+def create_submit_order_request(order_quote: MarketOrderQuote) -> dict:
+    if order_quote.category_code == InvestmentCategoryTypes.OVERSEAS:
+        request_url = 'https://online.hl.co.uk/my-accounts/equity_confirmation_overseas'
+    else:
+        request_url = 'https://online.hl.co.uk/my-accounts/equity_confirmation'
+
+    return dict(
+        url=request_url,
+        request_type=WebRequestType.XHR,
+        data={
+            'hl_vt': order_quote.hl_vt,
+            'sedol': order_quote.sedol_code
+        },
+        headers={
+            'Referer': f'https://online.hl.co.uk/my-accounts/security_deal/sedol/{order_quote.sedol_code}'
+        })
+
+
+def parse_submit_order_response(res: Response, order_quote: MarketOrderQuote) -> MarketOrderConfirmation:
+    if res.status_code != http.HTTPStatus.OK:
+        raise MarketOrderFailedError(f"Purchase invalid, HTTP response code was {res.status_code}")
+
+    return parse_market_order_confirmation_page(confirm_html=res.content, category_code=order_quote.category_code,
+                                                encoding=res.encoding)
@@ -5,6 +5,11 @@ from ...orders.models import OrderPositionType, OrderAmountType, IOrderConfirmat
 
 
 class MarketOrderPosition:
+    __slots__ = (
+        '_hl_vt', '_stock_ticker', '_security_name', '_sedol_code', '_isin_code', '_epic_code', '_currency_code',
+        '_exchange', '_fixed_interest', '_account_id', '_total_cash_available', '_bid_price', '_units_held',
+        '_value_gbp', '_category_code'
+    )
     _hl_vt: str
     _stock_ticker: str
     _security_name: str
@@ -144,6 +149,7 @@ class MarketOrderPosition:
 
 
 class MarketOrder():
+    __slots__ = ('_position', '_position_type', '_amount_type', '_quantity', '_including_charges')
     _position: MarketOrderPosition
     _position_type: OrderPositionType
     _amount_type: OrderAmountType
@@ -205,6 +211,11 @@ class MarketOrder():
 
 
 class MarketOrderQuote():
+    __slots__ = (
+        '_session_hl_vt', '_hl_vt', '_sedol_code', '_number_of_shares', '_price', '_share_value', '_ptm_levy',
+        '_commission', '_stamp_duty', '_settlement_date', '_total_trade_value', '_exchange_rate', '_conversion_price',
+        '_conversion_sub_total', '_fx_charge', '_category_code'
+    )
     _session_hl_vt: str
     _hl_vt: str
     _sedol_code: str
@@ -220,7 +231,7 @@ class MarketOrderQuote():
     _conversion_price: float
     _conversion_sub_total: float
     _fx_charge: float
-    category_code: str
+    _category_code: str
 
     def __init__(self,
                  session_hl_vt: str,
@@ -357,6 +368,11 @@ class MarketOrderQuote():
 
 
 class MarketOrderConfirmation(IOrderConfirmation):
+    __slots__ = (
+        '_sedol_code', '_number_of_shares', '_price', '_share_value', '_ptm_levy', '_commission', '_stamp_duty',
+        '_settlement_date', '_total_trade_value', '_exchange_rate', '_conversion_price', '_conversion_sub_total',
+        '_fx_charge', '_category_code'
+    )
     _sedol_code: str
     _number_of_shares: float
     _price: str
@@ -370,7 +386,7 @@ class MarketOrderConfirmation(IOrderConfirmation):
     _conversion_price: float
     _conversion_sub_total: float
     _fx_charge: float
-    category_code: str
+    _category_code: str
 
     def __init__(self,
                  sedol_code: str,
@@ -1,30 +1,39 @@
 import re
 from datetime import datetime
 
-from bs4 import BeautifulSoup
-
 from ...orders.market.errors import MarketClosedError, MarketOrderFailedError, MarketOrderLiveQuoteError, \
     MarketOrderQuoteError
 from ...orders.market.models import MarketOrderPosition, MarketOrderQuote, MarketOrderConfirmation
+from ...utils.forms import extract_hidden_inputs
 from ...utils.input import InputHelper
-
-
-def parse_market_order_entry_page(order_html: str, category_code: str) -> MarketOrderPosition:
-    soup = BeautifulSoup(order_html, 'html.parser')
-
-    # Is the market closed?   We cannot rely on the "Market closed" text being shown as it's always present in the HTML.
-    # Instead, we need to work out whether order form is present
-    form = soup.find("form", id="order_entry")
-    if form is None:
-        raise MarketClosedError(
-            can_place_fill_or_kill_order=(len(soup.select('a[title="Place fill or kill"]')) == 1),
-            can_place_limit_order=(len(soup.select('a[title="Place limit order"]')) == 1)
-        )
-
-    # Fetch the fields needed for the next step
-    tags = {}
-    for hidden_tag in form.find_all("input", type="hidden"):
-        tags[hidden_tag['name']] = hidden_tag['value']
+from ...utils.soup import decode, find_all_text, Fragment, make_soup, Markup, ParserBackend
+
+# The parts of each page read by the parsers, the rest of the page is only parsed to report an error
+ORDER_ENTRY_FRAGMENTS = [Fragment('form', id='order_entry')]
+QUOTE_FRAGMENTS = [Fragment('form', id='dealform'), Fragment('div', class_='quote_quantity')]
+CONFIRMATION_FRAGMENTS = [Fragment('div', id='quote_content')]
+
+
+def parse_market_order_entry_page(order_html: Markup, category_code: str,
+                                  parser: ParserBackend = None, encoding: str = None) -> MarketOrderPosition:
+    # Fetch the fields needed for the next step, without building the tree when the page has the expected shape
+    tags = extract_hidden_inputs(order_html, 'order_entry', encoding)
+    if tags is None:
+        soup = make_soup(order_html, parser, ORDER_ENTRY_FRAGMENTS, encoding)
+
+        # Is the market closed?   We cannot rely on the "Market closed" text being shown as it's always present in the
+        # HTML. Instead, we need to work out whether order form is present
+        form = soup.find("form", id="order_entry")
+        if form is None:
+            soup = make_soup(order_html, parser, encoding=encoding)
+            raise MarketClosedError(
+                can_place_fill_or_kill_order=(len(soup.select('a[title="Place fill or kill"]')) == 1),
+                can_place_limit_order=(len(soup.select('a[title="Place limit order"]')) == 1)
+            )
+
+        tags = {}
+        for hidden_tag in form.find_all("input", type="hidden"):
+            tags[hidden_tag['name']] = hidden_tag['value']
 
     return MarketOrderPosition(hl_vt=tags['hl_vt'], stock_ticker=tags['ticker'], security_name=tags['security_name'],
                                sedol_code=tags['sedol'], isin_code=tags['isin'], epic_code=tags['epic'],
@@ -54,20 +63,22 @@ QUOTE_MAP = {
 }
 
 
-def parse_market_order_quote_page(quote_html: str, category_code: str) -> MarketOrderQuote:
-    soup = BeautifulSoup(quote_html, 'html.parser')
+def parse_market_order_quote_page(quote_html: Markup, category_code: str,
+                                  parser: ParserBackend = None, encoding: str = None) -> MarketOrderQuote:
+    soup = make_soup(quote_html, parser, QUOTE_FRAGMENTS, encoding)
 
     form = soup.find("form", id="dealform")
     if form is None:
+        soup = make_soup(quote_html, parser, encoding=encoding)
         err = soup.select_one('div.dialog_content')
         error_text = err.get_text(separator=' ', strip=True) if err is not None else "Unknown, check HTML"
         if 'Unable to retrieve a live quote' in error_text:
-            raise MarketOrderLiveQuoteError(error_text, quote_html)
+            raise MarketOrderLiveQuoteError(error_text, decode(quote_html, encoding))
         else:
-            raise MarketOrderQuoteError(error_text, quote_html)
+            raise MarketOrderQuoteError(error_text, decode(quote_html, encoding))
 
     # var security_token = '3729677934';
-    session_hl_vt = re.findall("var security_token = '(\\d+)';", quote_html)[0]
+    session_hl_vt = find_all_text("var security_token = '(\\d+)';", quote_html, encoding)[0]
 
     vals = {
         'session_hl_vt': session_hl_vt,
@@ -114,11 +125,14 @@ def parse_market_order_quote_page(quote_html: str, category_code: str) -> Market
     return MarketOrderQuote(**vals)
 
 
-def parse_market_order_confirmation_page(confirm_html: str, category_code: str) -> MarketOrderConfirmation:
-    soup = BeautifulSoup(confirm_html, 'html.parser')
+def parse_market_order_confirmation_page(confirm_html: Markup, category_code: str,
+                                         parser: ParserBackend = None, encoding: str = None) -> MarketOrderConfirmation:
+    soup = make_soup(confirm_html, parser, CONFIRMATION_FRAGMENTS, encoding)
 
     qc = soup.find("div", id="quote_content")
     if qc is None:
+        soup = make_soup(confirm_html, parser, encoding=encoding)
+        confirm_html = decode(confirm_html, encoding)
         err = soup.select_one('div.dialog_content')
         if err is None:
             raise MarketOrderFailedError("Unexpected Error, see HTML for more details", confirm_html)
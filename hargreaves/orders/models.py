@@ -1,4 +1,12 @@
+import functools
 from enum import Enum
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    import numpy
+
+# baskets smaller than this are calculated line by line, where NumPy's per-call overhead outweighs the loop
+VECTORISE_FROM_LINES = 64
 
 
 class OrderAmountType(Enum):
@@ -18,6 +26,9 @@ class OrderPositionType(Enum):
 
 
 class OrderRequest():
+    __slots__ = (
+        '_sedol_code', '_category_code', '_position_type', '_position_percentage', '_account_id', '_account_value'
+    )
     _sedol_code: str
     _category_code: str
     _position_type: OrderPositionType
@@ -79,6 +90,29 @@ class IOrderConfirmation():
     """
     Interface for order confirmations
     """
+    __slots__ = ()
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """
+    NumPy, imported on first use so that importing the SDK does not, None when it is not installed
+    """
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def _float_array(numpy, values: Sequence[Optional[float]], required, name: str):
+    """
+    The values as a float64 array, the None values, which are only allowed where they are not required, as 0
+    """
+    missing = numpy.fromiter((value is None for value in values), dtype=bool, count=len(values))
+    if (missing & required).any():
+        raise TypeError(f"The {name} of line {int(numpy.flatnonzero(missing & required)[0])} is None")
+    return numpy.asarray([0.0 if value is None else value for value in values], dtype=numpy.float64)
 
 
 class PositionCalculator:
@@ -97,3 +131,79 @@ class PositionCalculator:
             order_quantity = int(round(units_held * (position_percentage / 100), 0))
 
         return (amount_type, order_quantity)
+
+    @staticmethod
+    def calculate_basket(
+            position_types: Sequence[OrderPositionType],
+            position_percentages: Sequence[float],
+            account_values: Sequence[Optional[float]],
+            units_held: Sequence[Optional[float]]
+    ) -> Tuple[List[OrderAmountType], List[Union[float, int]]]:
+        """
+        calculate for every line of a basket, e.g. when rebalancing a whole account.  The lines are calculated with
+        NumPy when it is installed, rounding exactly as calculate does: buys to the penny, sells to whole units.
+        See calculate_basket_arrays to keep the quantities as a NumPy array.
+        :param position_types: the OrderPositionType of each line
+        :param position_percentages: the percentage of the account value (buys) or units held (sells) of each line
+        :param account_values: the account value of each line, may be None for sells
+        :param units_held: the units held of each line, may be None for buys
+        :return: the amount types and the order quantities, in the order of the lines, exactly as calculate returns
+        them: a float of pounds for each buy and an int of units for each sell
+        """
+        line_count = len(position_types)
+        if not line_count == len(position_percentages) == len(account_values) == len(units_held):
+            raise ValueError("The position types, percentages, account values and units held differ in length")
+
+        if line_count < VECTORISE_FROM_LINES or _numpy() is None:
+            results = [PositionCalculator.calculate(*line) for line in
+                       zip(position_types, position_percentages, account_values, units_held)]
+            return [result[0] for result in results], [result[1] for result in results]
+
+        numpy = _numpy()
+        buys, quantities = PositionCalculator.calculate_basket_arrays(
+            position_types, position_percentages, account_values, units_held)
+        amount_types = numpy.where(buys, OrderAmountType.Value, OrderAmountType.Quantity)
+        # the sells are whole numbers, which calculate returns as int
+        sell_quantities = numpy.where(buys, 0, quantities).astype(numpy.int64).astype(object)
+        return amount_types.tolist(), numpy.where(buys, quantities.astype(object), sell_quantities).tolist()
+
+    @staticmethod
+    def calculate_basket_arrays(
+            position_types: Sequence[OrderPositionType],
+            position_percentages: Sequence[float],
+            account_values: Sequence[Optional[float]],
+            units_held: Sequence[Optional[float]]
+    ) -> Tuple['numpy.ndarray', 'numpy.ndarray']:
+        """
+        calculate_basket with NumPy, requires 'pip install numpy'
+        :return: a bool array which is True for the buys, whose amount type is OrderAmountType.Value and False for
+        the sells (OrderAmountType.Quantity), and a float64 array of the order quantities: pounds rounded to the
+        penny for buys, whole units for sells
+        :raises TypeError: when a buy has no account value or a sell has no units held
+        """
+        numpy = _numpy()
+        if numpy is None:
+            raise ImportError("calculate_basket_arrays requires numpy, 'pip install numpy'")
+
+        line_count = len(position_types)
+        if not line_count == len(position_percentages) == len(account_values) == len(units_held):
+            raise ValueError("The position types, percentages, account values and units held differ in length")
+
+        buys = numpy.fromiter((position_type == OrderPositionType.Buy for position_type in position_types),
+                              dtype=bool, count=line_count)
+        percentages = numpy.asarray(position_percentages, dtype=numpy.float64) / 100
+        values = _float_array(numpy, account_values, buys, 'account value') * percentages
+        units = _float_array(numpy, units_held, ~buys, 'units held') * percentages
+
+        # numpy.round(x, 2) is rint(x * 100) / 100, which can round the other way to round(x, 2) when x * 100 is
+        # within a few ulps of a half penny, those lines are rounded by Python
+        pence = values * 100
+        distance_to_half = numpy.abs(pence - numpy.floor(pence) - 0.5)
+        near_half = distance_to_half <= 4 * numpy.spacing(numpy.abs(pence)) + 1e-9
+        buy_quantities = numpy.rint(pence) / 100
+        for line in numpy.flatnonzero(near_half & buys).tolist():
+            buy_quantities[line] = round(float(values[line]), 2)
+        # rounding to 0 digits has no scaling, rint rounds half to even like round
+        sell_quantities = numpy.rint(units)
+
+        return buys, numpy.where(buys, buy_quantities, sell_quantities)
@@ -1,26 +1,32 @@
 import logging
-from typing import List
+from typing import List, TYPE_CHECKING
 
-from ...orders.pending.clients import PendingOrdersClient
 from ...orders.pending.models import PendingOrder
-from requests_tracker.session import IWebSession
+from ...utils.lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from requests_tracker.session import IWebSession
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'PendingOrdersClient': '.clients'
+})
 
-def get_pending_orders(web_session: IWebSession,
-                       account_id: int) -> List[PendingOrder]:
 
+def get_pending_orders(web_session: 'IWebSession',
+                       account_id: int) -> List[PendingOrder]:
+    from ...orders.pending.clients import PendingOrdersClient
     return PendingOrdersClient().get_pending_orders(
         web_session=web_session,
         account_id=account_id
     )
 
 
-def cancel_pending_order(web_session: IWebSession,
+def cancel_pending_order(web_session: 'IWebSession',
                          cancel_order_id:
                          int, pending_orders: List[PendingOrder]) -> bool:
-
+    from ...orders.pending.clients import PendingOrdersClient
     return PendingOrdersClient().cancel_pending_order(
         web_session=web_session,
         cancel_order_id=cancel_order_id,
@@ -2,12 +2,12 @@ import http
 import logging
 from typing import List
 
-from bs4 import BeautifulSoup
+from requests import Response
 
 from ...orders.pending.errors import CancelPendingOrderError
 from ...orders.pending.models import PendingOrder
-from ...orders.pending.parsers import parse_pending_orders
-from ...utils import clock
+from ...orders.pending.parsers import parse_pending_orders, parse_cancel_order_confirmation
+from ...utils import pacing
 from requests_tracker.request import WebRequestType
 from requests_tracker.session import IWebSession
 
@@ -22,16 +22,9 @@ class PendingOrdersClient:
 
         logger.debug(f"Get pending order for account '{account_id}' ...")
 
-        headers = {
-            'Referer': f"https://online.hl.co.uk/my-accounts/account_summary/account/{account_id}"
-        }
-
-        pending_order_html = web_session.get(
-            url=f'https://online.hl.co.uk/my-accounts/pending_orders/account/{account_id}',
-            request_type=WebRequestType.Document,
-            headers=headers).text
-
-        return parse_pending_orders(account_id=account_id, pending_orders_html=pending_order_html)
+        res = web_session.get(**create_pending_orders_request(account_id))
+        return parse_pending_orders(account_id=account_id, pending_orders_html=res.content,
+                                    encoding=res.encoding)
 
     def cancel_pending_order(self,
                              web_session: IWebSession,
@@ -40,44 +33,60 @@ class PendingOrdersClient:
 
         logger.debug(f"Cancel Pending Order '{cancel_order_id}' ...")
 
-        clock.sleep_random()
+        pacing.pause(web_session)
+
+        res = web_session.post(**create_cancel_request(cancel_order_id=cancel_order_id,
+                                                       pending_orders=pending_orders))
+        return parse_cancel_response(res)
+
+
+# The request arguments and response handling, shared by the sync and async clients
+
+def create_pending_orders_request(account_id: int) -> dict:
+    return dict(
+        url=f'https://online.hl.co.uk/my-accounts/pending_orders/account/{account_id}',
+        request_type=WebRequestType.Document,
+        headers={
+            'Referer': f"https://online.hl.co.uk/my-accounts/account_summary/account/{account_id}"
+        })
+
 
-        account_id = pending_orders[0].account_id
+def create_cancel_request(cancel_order_id: int, pending_orders: List[PendingOrder]) -> dict:
+    account_id = pending_orders[0].account_id
 
-        request_headers = {
+    return dict(
+        url="https://online.hl.co.uk/my-accounts/pending_orders",
+        request_type=WebRequestType.Document,
+        data=create_cancel_form(cancel_order_id=cancel_order_id, pending_orders=pending_orders),
+        headers={
             'Referer': f'https://online.hl.co.uk/my-accounts/pending_orders/account/{account_id}'
-        }
+        })
 
-        form = {
-            "action": "cancel",
-            "bref": str(cancel_order_id)
-        }
 
-        for pending_order in pending_orders:
-            order_id = str(pending_order.order_id)
-            form[f"{order_id}_trade_type[]"] = str(pending_order.trade_type)
-            form[f"{order_id}_sedol[]"] = str(pending_order.sedol_code)
-            form[f"{order_id}_stoktitle[]"] = str(pending_order.stock_title)
-            form[f"{order_id}_quantity[]"] = str(pending_order.quantity)
-            form[f"{order_id}_qty_is_money[]"] = str(int(pending_order.qty_is_money))
+def parse_cancel_response(res: Response) -> bool:
+    if res.status_code != http.HTTPStatus.OK:
+        raise CancelPendingOrderError(f"Purchase invalid, HTTP response code was {res.status_code}",
+                                      html=res.text)
 
-        form["cancel"] = "cancel"
+    parse_cancel_order_confirmation(res.content, encoding=res.encoding)
 
-        res = web_session.post("https://online.hl.co.uk/my-accounts/pending_orders",
-                               request_type=WebRequestType.Document,
-                               data=form, headers=request_headers)
+    return True
 
-        confirm_html = res.text
 
-        if res.status_code != http.HTTPStatus.OK:
-            raise CancelPendingOrderError(f"Purchase invalid, HTTP response code was {res.status_code}",
-                                          html=confirm_html)
+def create_cancel_form(cancel_order_id: int, pending_orders: List[PendingOrder]) -> dict:
+    form = {
+        "action": "cancel",
+        "bref": str(cancel_order_id)
+    }
 
-        soup = BeautifulSoup(res.text, 'html.parser')
+    for pending_order in pending_orders:
+        order_id = str(pending_order.order_id)
+        form[f"{order_id}_trade_type[]"] = str(pending_order.trade_type)
+        form[f"{order_id}_sedol[]"] = str(pending_order.sedol_code)
+        form[f"{order_id}_stoktitle[]"] = str(pending_order.stock_title)
+        form[f"{order_id}_quantity[]"] = str(pending_order.quantity)
+        form[f"{order_id}_qty_is_money[]"] = str(int(pending_order.qty_is_money))
 
-        first_paragraph = soup.select_one("div[id='content-body-full'] > p")
-        message_text = first_paragraph.get_text(strip=True)
-        if 'Your cancellation request has been successfully executed.' not in message_text:
-            raise CancelPendingOrderError(f"Unexpected response text", html=confirm_html)
+    form["cancel"] = "cancel"
 
-        return True
+    return form
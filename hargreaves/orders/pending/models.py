@@ -3,6 +3,10 @@ from typing import Optional
 
 
 class PendingOrder:
+    __slots__ = (
+        '_account_id', '_order_id', '_order_date', '_trade_type', '_sedol_code', '_stock_title', '_quantity',
+        '_qty_is_money', '_limit_price', '_status'
+    )
     _account_id: int
     _order_id: int
     _order_date: datetime.datetime
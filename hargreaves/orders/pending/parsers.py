@@ -1,16 +1,27 @@
 import re
-from typing import List
+from collections import defaultdict
+from typing import Dict, List
 
-from bs4 import BeautifulSoup
+from bs4 import Tag
 
+from ...orders.pending.errors import CancelPendingOrderError
 from ...orders.pending.models import PendingOrder
 from ...utils.input import InputHelper
+from ...utils.soup import decode, Fragment, make_soup, Markup, ParserBackend
 
+# The parts of each page read by the parsers
+PENDING_ORDERS_FRAGMENTS = [Fragment('table', summary='Your current pending orders')]
+CANCEL_CONFIRMATION_FRAGMENTS = [Fragment('div', id='content-body-full')]
 
-def parse_pending_orders(account_id: int, pending_orders_html: str) -> List[PendingOrder]:
+# the hidden inputs of an order are named '{order_id}_{field}[]'
+ORDER_INPUT_NAME = re.compile(r'^(\d+)_(\w+)\[\]$')
+
+
+def parse_pending_orders(account_id: int, pending_orders_html: Markup, parser: ParserBackend = None,
+                         encoding: str = None) -> List[PendingOrder]:
     pending_orders = []
 
-    soup = BeautifulSoup(pending_orders_html, 'html.parser')
+    soup = make_soup(pending_orders_html, parser, PENDING_ORDERS_FRAGMENTS, encoding)
     pending_orders_table = soup.select_one('table[summary="Your current pending orders"]')
 
     if pending_orders_table is None:
@@ -22,40 +33,41 @@ def parse_pending_orders(account_id: int, pending_orders_html: str) -> List[Pend
         raise Exception(
             f"Unexpected number of header rows({len(header_rows)}), see HTML for more details",
             pending_orders_table.text)
+    header_keys = [header_row.get_text(strip=True, separator=' ') for header_row in header_rows]
 
     row_data = []
 
     table_rows = pending_orders_table.select("tbody > tr")
     for table_row in table_rows:
 
-        row_cells = table_row.select("td")
+        row_cells = table_row.find_all('td')
         if len(row_cells) != 8:
             raise Exception(f"Unexpected number of cells({len(row_cells)}), see HTML for more details",
                             pending_orders_table.text)
 
         cell_data = {}
 
-        for col_index in range(len(header_rows)):
-            item_key = header_rows[col_index].get_text(strip=True, separator=' ')
+        for item_key, row_cell in zip(header_keys, row_cells):
             if item_key == 'Cancel':
-                cancel_button = row_cells[col_index].select_one('button')
+                cancel_button = row_cell.find('button')
                 item_value = re.findall("value='(\\d*)'", cancel_button.attrs['onclick'])[0]
             else:
-                item_value = row_cells[col_index].get_text(strip=True, separator=' ')
+                item_value = row_cell.get_text(strip=True, separator=' ')
             cell_data[item_key] = item_value
 
         row_data.append(cell_data)
 
+    order_inputs = _index_order_inputs(pending_orders_table)
+
     for row in row_data:
         order_id = InputHelper.parse_int(row['Cancel'])
         order_date = InputHelper.parse_date(input_txt=row['Order date'], date_format='%d/%m/%y')
-        trade_type = str(pending_orders_table.select_one(f"input[name='{order_id}_trade_type[]']").attrs['value'])
-        sedol_code = str(pending_orders_table.select_one(f"input[name='{order_id}_sedol[]']").attrs['value'])
-        stock_title = str(pending_orders_table.select_one(f"input[name='{order_id}_stoktitle[]']").attrs['value'])
-        quantity = InputHelper.parse_float(
-            pending_orders_table.select_one(f"input[name='{order_id}_quantity[]']").attrs['value'])
-        qty_is_money = InputHelper.parse_bool(
-            pending_orders_table.select_one(f"input[name='{order_id}_qty_is_money[]']").attrs['value'])
+        inputs = order_inputs[order_id]
+        trade_type = str(inputs['trade_type'])
+        sedol_code = str(inputs['sedol'])
+        stock_title = str(inputs['stoktitle'])
+        quantity = InputHelper.parse_float(inputs['quantity'])
+        qty_is_money = InputHelper.parse_bool(inputs['qty_is_money'])
         limit_price = InputHelper.parse_float(row['Limit price'], default_empty=None, empty_values=['', '-'])
         status = str(row['Status'])
 
@@ -75,3 +87,24 @@ def parse_pending_orders(account_id: int, pending_orders_html: str) -> List[Pend
         pending_orders.append(pending_order)
 
     return pending_orders
+
+
+def _index_order_inputs(pending_orders_table: Tag) -> Dict[int, Dict[str, str]]:
+    """
+    Reads the hidden inputs of every order in one pass, e.g. '151813955_sedol[]' is indexed as [151813955]['sedol']
+    """
+    order_inputs = defaultdict(dict)
+    for hidden_input in pending_orders_table.find_all('input'):
+        match = ORDER_INPUT_NAME.match(hidden_input.attrs.get('name', ''))
+        if match is not None:
+            order_inputs[int(match.group(1))].setdefault(match.group(2), hidden_input.attrs.get('value'))
+    return order_inputs
+
+
+def parse_cancel_order_confirmation(confirm_html: Markup, parser: ParserBackend = None, encoding: str = None):
+    soup = make_soup(confirm_html, parser, CANCEL_CONFIRMATION_FRAGMENTS, encoding)
+
+    first_paragraph = soup.select_one("div[id='content-body-full'] > p")
+    message_text = first_paragraph.get_text(strip=True)
+    if 'Your cancellation request has been successfully executed.' not in message_text:
+        raise CancelPendingOrderError("Unexpected response text", html=decode(confirm_html, encoding))
@@ -1,15 +1,46 @@
-from .clients import SecuritySearchClient
-from .models import InvestmentTypes, SearchResult
+from .models import InvestmentTypes, SearchResult, SearchResults, SearchResultIndex, IndexedSecurity, \
+    ResolvedSecurities
 import logging
+from typing import Iterable, Iterator, TYPE_CHECKING
 
-from requests_tracker.session import IWebSession
+from ..utils.lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from requests_tracker.session import IWebSession
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'SecuritySearchClient': '.clients',
+    'SecurityIndex': '.index'
+})
+
 
-def investment_search(web_session: IWebSession, search_string: str, investment_types: list) -> [SearchResult]:
+def investment_search(web_session: 'IWebSession', search_string: str, investment_types: list) -> [SearchResult]:
+    from .clients import SecuritySearchClient
     return SecuritySearchClient().investment_search(
         web_session=web_session,
         search_string=search_string,
         investment_types=investment_types
     )
+
+
+def resolve_securities(web_session: 'IWebSession', stock_tickers: Iterable[str],
+                       investment_types: list = InvestmentTypes.ALL) -> ResolvedSecurities:
+    from .clients import SecuritySearchClient
+    return SecuritySearchClient().resolve_securities(
+        web_session=web_session,
+        stock_tickers=stock_tickers,
+        investment_types=investment_types
+    )
+
+
+def iter_investment_search(web_session: 'IWebSession', search_string: str, investment_types: list,
+                           prefetch: bool = False) -> Iterator[SearchResult]:
+    from .clients import SecuritySearchClient
+    return SecuritySearchClient().iter_investment_search(
+        web_session=web_session,
+        search_string=search_string,
+        investment_types=investment_types,
+        prefetch=prefetch
+    )
@@ -1,94 +1,285 @@
-import json
 import logging
-from typing import List
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 
 from requests_tracker.session import IWebSession, WebRequestType
 from .errors import SearchFilterError
-from .models import InvestmentTypes, SearchResult
-from ..utils import clock
+from .index import SecurityIndex, indexed_search_results, record_search_results
+from .models import InvestmentTypes, ResolvedSecurities, SearchResult, SearchResultIndex, SearchResults
+from ..utils import clock, pacing
+from ..utils.jsonp import parse_jsonp
 
 logger = logging.getLogger(__name__)
 
+SEARCH_URL = 'https://online.hl.co.uk/ajaxx/stocks.php'
+SEARCH_HEADERS = {
+    'Referer': 'https://online.hl.co.uk/my-accounts/stock_and_fund_search/action/deal'
+}
+
+# searches in flight at once when resolving a batch of tickers, the size of a session's connection pool per host
+DEFAULT_RESOLVE_CONCURRENCY = 4
+
 
 class ISecuritySearchClient:
 
     def investment_search(self, web_session: IWebSession, search_string: str, investment_types: list) -> [SearchResult]:
         pass
 
+    def iter_investment_search(self, web_session: IWebSession, search_string: str, investment_types: list,
+                               prefetch: bool = False) -> Iterator[SearchResult]:
+        pass
+
+    def resolve_securities(self, web_session: IWebSession, stock_tickers: Iterable[str],
+                           investment_types: list = InvestmentTypes.ALL,
+                           max_concurrency: int = DEFAULT_RESOLVE_CONCURRENCY) -> ResolvedSecurities:
+        pass
+
 
 class SecuritySearchClient(ISecuritySearchClient):
+    _security_index: Optional[SecurityIndex]
 
-    def __init__(self):
-        pass
+    def __init__(self, security_index: SecurityIndex = None):
+        """
+        :param security_index: SecurityIndex - Optional, answers searches for an identifier before HL is searched,
+        the process-wide index (see hargreaves.search.index.manager) when not given
+        """
+        self._security_index = security_index
 
     def investment_search(self, web_session: IWebSession, search_string: str, investment_types: list) -> [SearchResult]:
 
+        indexed_results = indexed_search_results(search_string, investment_types, self._security_index)
+        if indexed_results is not None:
+            return indexed_results
+
         logger.debug("Searching Securities ...")
 
-        clock.sleep_random()
+        return self.search_page(web_session=web_session, search_string=search_string,
+                                investment_types=investment_types)
+
+    def search_page(self, web_session: IWebSession, search_string: str, investment_types: list,
+                    offset: int = 0) -> SearchResults:
+        """
+        One page of the securities matching a search on HL, starting at offset
+        """
+        pacing.pause(web_session)
+
+        res = web_session.get(**create_search_request(search_string=search_string, investment_types=investment_types,
+                                                      offset=offset))
+        return parse_search_response(res.content, self._security_index)
+
+    def iter_investment_search(self, web_session: IWebSession, search_string: str, investment_types: list,
+                               prefetch: bool = False) -> Iterator[SearchResult]:
+        """
+        Every security matching a search, where investment_search only returns the first page.  The pages are
+        requested as the results are consumed, so only one page (two when prefetching) is held at a time.
+        :param web_session: IWebSession - the session
+        :param search_string: str - the search
+        :param investment_types: list - the investment types to search
+        :param prefetch: bool - whether to request the next page on a background thread while the current one is
+        consumed
+        :return: an iterator of SearchResult
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hl-search') if prefetch else None
+        next_page: Optional[Future] = None
+        try:
+            offset = 0
+            page = self.search_page(web_session=web_session, search_string=search_string,
+                                    investment_types=investment_types, offset=offset)
+            while is_page_at(page, offset):
+                next_offset = next_page_offset(page, offset)
+                if next_offset is not None and executor is not None:
+                    next_page = executor.submit(self.search_page, web_session=web_session,
+                                                search_string=search_string, investment_types=investment_types,
+                                                offset=next_offset)
+                yield from page
+                if next_offset is None:
+                    return
+                if next_page is None:
+                    page = self.search_page(web_session=web_session, search_string=search_string,
+                                            investment_types=investment_types, offset=next_offset)
+                else:
+                    page, next_page = next_page.result(), None
+                offset = next_offset
+        finally:
+            if executor is not None:
+                if next_page is not None:
+                    # the caller stopped early, the prefetched page is not needed
+                    next_page.cancel()
+                executor.shutdown(wait=False)
+
+    def resolve_securities(self, web_session: IWebSession, stock_tickers: Iterable[str],
+                           investment_types: list = InvestmentTypes.ALL,
+                           max_concurrency: int = DEFAULT_RESOLVE_CONCURRENCY) -> ResolvedSecurities:
+        """
+        Finds the security of every stock ticker, like investment_search followed by security_filter.  The tickers
+        are deduplicated ignoring case, the ones in the security index are answered from it, and the rest are searched
+        for with at most max_concurrency searches in flight.  The searches take turns at the pause of the session's
+        pacing policy, so they are sent no closer together than one after the other and only HL's responses overlap.
+        :param web_session: IWebSession - the session, which is shared by the searches
+        :param stock_tickers: the stock tickers to resolve
+        :param investment_types: list - the investment types to search
+        :param max_concurrency: int - the maximum number of searches in flight
+        :return: ResolvedSecurities - the security or the error of each ticker, a failed ticker does not fail the batch
+        """
+        stock_tickers = unique_tickers(stock_tickers)
+        pending, results, errors, search_results = list(stock_tickers), {}, {}, {}
+
+        for stock_ticker in list(pending):
+            indexed_results = indexed_search_results(stock_ticker, investment_types, self._security_index)
+            if indexed_results is not None:
+                pending.remove(stock_ticker)
+                resolve_security(lambda: indexed_results, stock_ticker, results, errors, search_results)
+
+        def resolve(stock_ticker: str):
+            resolve_security(lambda: self.investment_search(web_session=web_session, search_string=stock_ticker,
+                                                            investment_types=investment_types),
+                             stock_ticker, results, errors, search_results)
+
+        pause_lock = threading.Lock()
+
+        def resolve_spaced(stock_ticker: str):
+            with pacing.spaced_pauses(pause_lock):
+                resolve(stock_ticker)
+
+        if len(pending) == 1 or max_concurrency <= 1:
+            for stock_ticker in pending:
+                resolve(stock_ticker)
+        elif pending:
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(pending)),
+                                    thread_name_prefix='hl-resolve') as executor:
+                list(executor.map(resolve_spaced, pending))
+
+        logger.debug(f"Resolved {len(results)} securities, {len(errors)} failed")
+        return ResolvedSecurities(results=in_order(results, stock_tickers), errors=in_order(errors, stock_tickers),
+                                  search_results=in_order(search_results, stock_tickers))
+
+
+def unique_tickers(stock_tickers: Iterable[str]) -> List[str]:
+    """
+    The stock tickers in upper case, without blanks and duplicates, in their original order
+    """
+    return list(dict.fromkeys(stock_ticker.strip().upper() for stock_ticker in stock_tickers if stock_ticker.strip()))
+
+
+def in_order(resolutions: dict, stock_tickers: List[str]) -> dict:
+    """
+    The resolutions in the order of the tickers rather than in the order the searches completed
+    """
+    return {stock_ticker: resolutions[stock_ticker] for stock_ticker in stock_tickers if stock_ticker in resolutions}
+
+
+def resolve_security(search, stock_ticker: str, results: Dict[str, SearchResult], errors: Dict[str, BaseException],
+                     search_results: Dict[str, List[SearchResult]]):
+    """
+    Runs a search for the ticker, which goes into search_results, and filters it down to its security, which goes
+    into results, or the error into errors.  The SDK's errors derive from BaseException, so everything but an
+    interruption is kept per ticker.
+    """
+    try:
+        search_results[stock_ticker] = search()
+        results[stock_ticker] = security_filter(search_results=search_results[stock_ticker], stock_ticker=stock_ticker)
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except BaseException as ex:
+        logger.debug(f"Could not resolve '{stock_ticker}': {ex!r}")
+        errors[stock_ticker] = ex
+
+
+def create_search_request(search_string: str, investment_types: list, offset: int = 0) -> dict:
+    """
+    The arguments of the search GET, shared by the sync and async clients
+    """
+    return dict(
+        url=SEARCH_URL,
+        request_type=WebRequestType.XHR,
+        params=create_search_params(search_string=search_string, investment_types=investment_types, offset=offset),
+        headers=SEARCH_HEADERS)
+
+
+def parse_search_response(results_jsonp: Union[str, bytes],
+                          security_index: Optional[SecurityIndex] = None) -> SearchResults:
+    """
+    Parses a page of search results and feeds them to the security index
+    """
+    search_results = parse_search_results(results_jsonp)
+    record_search_results(search_results, security_index)
+    return search_results
 
-        # pid is the time in milliseconds since the epoch
-        pid = clock.get_current_time_as_epoch_time()
 
-        # roughly 10 seconds before PID (probably when search page was loaded)
-        callback = f"jsonp{clock.get_current_time_as_epoch_time(offset_seconds=-10)}",
+def is_page_at(search_results: SearchResults, offset: int) -> bool:
+    """
+    Whether HL served the page requested at offset, rather than e.g. the first page again
+    """
+    if search_results.start is None or search_results.start == offset:
+        return True
+    logger.warning(f"Search page requested at offset {offset} started at {search_results.start}")
+    return False
 
-        # the filters param is actually a list of investment types to be excluded,
-        # so we need to reverse what was passed in (except when it's ALL, then the filter is blank)
-        type_excl = []
-        if investment_types != InvestmentTypes.ALL:
-            for inv_type in InvestmentTypes.ALL:
-                if inv_type not in investment_types:
-                    type_excl.append(inv_type)
 
-        headers = {
-            'Referer': 'https://online.hl.co.uk/my-accounts/stock_and_fund_search/action/deal'
-        }
+def next_page_offset(search_results: SearchResults, offset: int) -> Optional[int]:
+    """
+    The offset of the page after search_results, which was requested at offset
+    :return: int, None when search_results is the last page
+    """
+    if len(search_results) == 0:
+        return None
+    next_offset = offset + len(search_results)
+    if search_results.num_found is not None and next_offset >= search_results.num_found:
+        return None
+    return next_offset
 
-        results_jsonp = web_session.get(
-            url=f'https://online.hl.co.uk/ajaxx/stocks.php',
-            request_type=WebRequestType.XHR,
-            params={
-                'callback': callback,
-                'pid': pid,
-                'sq': search_string,
-                'filters': ",".join(type_excl),
-                'offset': 0,
-                'instance': '',
-                'format': 'jsonp'
-            },
-            headers=headers).text
 
-        return parse_search_results(results_jsonp)
+def create_search_params(search_string: str, investment_types: list, offset: int = 0) -> dict:
+    # pid is the time in milliseconds since the epoch
+    pid = clock.get_current_time_as_epoch_time()
 
+    # roughly 10 seconds before PID (probably when search page was loaded)
+    callback = f"jsonp{clock.get_current_time_as_epoch_time(offset_seconds=-10)}",
 
-def parse_search_results(results_jsonp: str) -> [SearchResult]:
-    results_json = results_jsonp.split("(", 1)[1].strip(")")  # convert to json, removing callback
+    # the filters param is actually a list of investment types to be excluded,
+    # so we need to reverse what was passed in (except when it's ALL, then the filter is blank)
+    type_excl = []
+    if investment_types != InvestmentTypes.ALL:
+        for inv_type in InvestmentTypes.ALL:
+            if inv_type not in investment_types:
+                type_excl.append(inv_type)
 
-    results = json.loads(results_json)
+    return {
+        'callback': callback,
+        'pid': pid,
+        'sq': search_string,
+        'filters': ",".join(type_excl),
+        'offset': offset,
+        'instance': '',
+        'format': 'jsonp'
+    }
 
-    srs = []
-    for result in results['response']['docs']:
-        stock_ticker = result['stock_ticker'] if 'stock_ticker' in result else result['epic']
 
-        sr = SearchResult(stock_ticker=stock_ticker, security_name=result['identifier'],
-                          sedol_code=result['id'],
-                          internet_allowed=result['internet_allowed'] == 'Y', category=result['category'])
-        srs.append(sr)
+def parse_search_results(results_jsonp: Union[str, bytes]) -> SearchResults:
+    # convert to json, removing callback. UTF-8 bytes are decoded directly, without detecting their encoding
+    results = parse_jsonp(results_jsonp)
 
-    return srs
+    # each SearchResult is only created when accessed
+    response = results['response']
+    return SearchResults(response['docs'], num_found=response.get('numFound'), start=response.get('start'))
 
 
-def security_filter(search_results: List[SearchResult],
+def security_filter(search_results: Union[List[SearchResult], SearchResultIndex],
                     stock_ticker: str = None, sedol_code: str = None) -> SearchResult:
-    current_results = search_results
-
-    current_results = list(search_result for search_result in current_results
-                           if
-                           (stock_ticker is None or (search_result.stock_ticker.upper() == stock_ticker.upper()))
-                           and
-                           (sedol_code is None or (search_result.sedol_code.upper() == sedol_code.upper()))
-                           )
+    if isinstance(search_results, SearchResultIndex):
+        # build the index once when filtering the same results many times
+        return search_results.filter(stock_ticker=stock_ticker, sedol_code=sedol_code)
+    if isinstance(search_results, SearchResults):
+        # filtered on the raw docs, only the matching result is created
+        current_results = search_results.filter(stock_ticker=stock_ticker, sedol_code=sedol_code)
+    else:
+        current_results = list(search_result for search_result in search_results
+                               if
+                               (stock_ticker is None or (search_result.stock_ticker.upper() == stock_ticker.upper()))
+                               and
+                               (sedol_code is None or (search_result.sedol_code.upper() == sedol_code.upper()))
+                               )
 
     if len(current_results) != 1:
         raise SearchFilterError(f"Could not find security, results filtered to {len(current_results)}")
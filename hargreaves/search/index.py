@@ -0,0 +1,270 @@
+import logging
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional
+
+from .models import IndexedSecurity, InvestmentTypes, SearchResults
+
+if TYPE_CHECKING:
+    from ..account.models import Investment
+    from ..orders.manual.models import ManualOrderPosition
+    from ..orders.market.models import MarketOrderPosition
+
+logger = logging.getLogger(__name__)
+
+# the identifiers a security can be looked up by, the SEDOL code is the key
+IDENTIFIER_COLUMNS = ('sedol_code', 'stock_ticker', 'epic_code', 'isin_code')
+COLUMNS = IDENTIFIER_COLUMNS + ('security_name', 'category', 'internet_allowed')
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS securities (
+        sedol_code TEXT COLLATE NOCASE PRIMARY KEY,
+        stock_ticker TEXT COLLATE NOCASE,
+        epic_code TEXT COLLATE NOCASE,
+        isin_code TEXT COLLATE NOCASE,
+        security_name TEXT COLLATE NOCASE,
+        category TEXT,
+        internet_allowed INTEGER
+    )""",
+    "CREATE INDEX IF NOT EXISTS securities_stock_ticker ON securities (stock_ticker)",
+    "CREATE INDEX IF NOT EXISTS securities_epic_code ON securities (epic_code)",
+    "CREATE INDEX IF NOT EXISTS securities_isin_code ON securities (isin_code)",
+    "CREATE INDEX IF NOT EXISTS securities_security_name ON securities (security_name)",
+]
+
+# a page only tells part of what is known about a security, so a column is only overwritten with a value
+_UPSERT = f"""INSERT INTO securities ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})
+ON CONFLICT (sedol_code) DO UPDATE SET
+{', '.join(f'{column} = COALESCE(excluded.{column}, {column})' for column in COLUMNS[1:])}"""
+
+# the same in two statements, for SQLite older than 3.24 (e.g. bundled with some Python 3.7 builds), which has no
+# ON CONFLICT clause
+_INSERT_OR_IGNORE = f"INSERT OR IGNORE INTO securities ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+_UPDATE = f"""UPDATE securities SET {', '.join(f'{column} = COALESCE(?, {column})' for column in COLUMNS[1:])}
+WHERE sedol_code = ?"""
+
+UPSERT_SUPPORTED = sqlite3.sqlite_version_info >= (3, 24, 0)
+
+
+class SecurityIndex:
+    """
+    A local index of the securities seen in search results, order entry pages and holdings, kept in SQLite.  A
+    security is found by its SEDOL code, stock ticker, EPIC or ISIN code, ignoring case, or by the start of its name.
+    The SecuritySearchClient answers a search for an identifier from the index when it knows the security well
+    enough to deal in it, without searching HL.
+    """
+    _path: str
+    _connection: sqlite3.Connection
+    _lock: threading.Lock
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        :param path: str - the SQLite database file, created when missing.  By default the index is kept in memory
+        """
+        self._path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def add(self, securities: Iterable[IndexedSecurity]) -> int:
+        """
+        Adds the securities, or completes the ones already indexed with the details which are not None
+        :return: the number of securities written
+        """
+        rows = [(security.sedol_code, security.stock_ticker, security.epic_code, security.isin_code,
+                 security.security_name, security.category,
+                 None if security.internet_allowed is None else int(security.internet_allowed))
+                for security in securities if security.sedol_code]
+        if rows:
+            with self._lock, self._connection:
+                if UPSERT_SUPPORTED:
+                    self._connection.executemany(_UPSERT, rows)
+                else:
+                    self._connection.executemany(_INSERT_OR_IGNORE, rows)
+                    self._connection.executemany(_UPDATE, [row[1:] + row[:1] for row in rows])
+        return len(rows)
+
+    def add_search_results(self, search_results: SearchResults) -> int:
+        if search_results.docs is None:
+            # the list was changed after the search, only the fields of its results are known
+            return self.add(IndexedSecurity(
+                sedol_code=search_result.sedol_code,
+                stock_ticker=search_result.stock_ticker,
+                epic_code=None,
+                isin_code=None,
+                security_name=search_result.security_name,
+                category=search_result.category,
+                internet_allowed=search_result.internet_allowed
+            ) for search_result in search_results)
+        return self.add(IndexedSecurity(
+            sedol_code=doc['id'],
+            stock_ticker=doc.get('stock_ticker', doc.get('epic')),
+            epic_code=doc.get('epic'),
+            isin_code=doc.get('isin'),
+            security_name=doc.get('identifier'),
+            category=doc.get('category'),
+            internet_allowed=None if 'internet_allowed' not in doc else doc['internet_allowed'] == 'Y'
+        ) for doc in search_results.docs)
+
+    def add_market_order_position(self, position: 'MarketOrderPosition') -> int:
+        # an order entry page is only served for securities which can be dealt online
+        return self.add([IndexedSecurity(
+            sedol_code=position.sedol_code, stock_ticker=position.stock_ticker, epic_code=position.epic_code,
+            isin_code=position.isin_code, security_name=position.security_name, category=position.category_code,
+            internet_allowed=True)])
+
+    def add_manual_order_position(self, position: 'ManualOrderPosition') -> int:
+        return self.add([IndexedSecurity(
+            sedol_code=position.sedol, stock_ticker=None, epic_code=position.epic, isin_code=position.isin,
+            security_name=None, category=position.category_code, internet_allowed=True)])
+
+    def add_investments(self, investments: List['Investment']) -> int:
+        return self.add(IndexedSecurity(
+            sedol_code=investment.sedol_code, stock_ticker=investment.stock_ticker, epic_code=None, isin_code=None,
+            security_name=investment.security_name, category=None, internet_allowed=None
+        ) for investment in investments)
+
+    def _select(self, where: str, parameters: tuple, order_by: str = 'sedol_code',
+                limit: int = -1) -> List[IndexedSecurity]:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM securities WHERE {where} ORDER BY {order_by} LIMIT ?",
+                parameters + (limit,)).fetchall()
+        return [IndexedSecurity(*row[:-1], internet_allowed=None if row[-1] is None else bool(row[-1]))
+                for row in rows]
+
+    def lookup(self, sedol_code: str = None, stock_ticker: str = None, epic_code: str = None,
+               isin_code: str = None) -> List[IndexedSecurity]:
+        """
+        The securities matching every identifier given, ignoring case
+        """
+        identifiers = dict(sedol_code=sedol_code, stock_ticker=stock_ticker, epic_code=epic_code, isin_code=isin_code)
+        identifiers = {column: value for column, value in identifiers.items() if value is not None}
+        if not identifiers:
+            raise ValueError("At least one identifier is required")
+        return self._select(' AND '.join(f'{column} = ?' for column in identifiers), tuple(identifiers.values()))
+
+    def find(self, identifier: str) -> List[IndexedSecurity]:
+        """
+        The securities with the SEDOL code, stock ticker, EPIC or ISIN code, ignoring case
+        """
+        return self._select(' OR '.join(f'{column} = ?' for column in IDENTIFIER_COLUMNS),
+                            (identifier,) * len(IDENTIFIER_COLUMNS))
+
+    def search_name(self, prefix: str, limit: int = 50) -> List[IndexedSecurity]:
+        """
+        The securities whose name starts with the prefix, ignoring case
+        """
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return self._select("security_name LIKE ? ESCAPE '\\'", (f'{escaped}%',), 'security_name', limit)
+
+    def search_results(self, search_string: str, investment_types) -> Optional[SearchResults]:
+        """
+        Answers investment_search from the index when search_string is an identifier of securities which are known
+        well enough to deal in, i.e. with their category and whether they can be dealt online
+        :return: SearchResults shaped like HL's, None when HL has to be searched
+        """
+        if set(investment_types) != set(InvestmentTypes.ALL):
+            # the investment types of a security are not indexed
+            return None
+        securities = self.find(search_string.strip())
+        if not securities or any(security.category is None or security.internet_allowed is None
+                                 or security.stock_ticker is None for security in securities):
+            return None
+        return SearchResults([{
+            'id': security.sedol_code,
+            'identifier': security.security_name,
+            'internet_allowed': 'Y' if security.internet_allowed else 'N',
+            'stock_ticker': security.stock_ticker,
+            'category': security.category
+        } for security in securities])
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM securities").fetchone()[0]
+
+    def __str__(self):
+        return f"SecurityIndex[path={self._path}, securities={len(self)}]"
+
+
+class SecurityIndexManager:
+    _instance: Optional[SecurityIndex]
+
+    def __init__(self):
+        self._instance = None
+
+    def get_instance(self) -> Optional[SecurityIndex]:
+        return self._instance
+
+    def set_instance(self, security_index: Optional[SecurityIndex]):
+        self._instance = security_index
+
+
+# the process-wide index fed by the clients, there is none unless one is set
+manager = SecurityIndexManager()
+
+
+def index_for(security_index: Optional[SecurityIndex] = None) -> Optional[SecurityIndex]:
+    """
+    The given security index or the process-wide one, None when there is neither
+    """
+    return manager.get_instance() if security_index is None else security_index
+
+
+def indexed_search_results(search_string: str, investment_types,
+                           security_index: SecurityIndex = None) -> Optional[SearchResults]:
+    """
+    The answer of the index to investment_search, see SecurityIndex.search_results
+    :return: SearchResults, None when HL has to be searched
+    """
+    security_index = index_for(security_index)
+    if security_index is None:
+        return None
+    try:
+        search_results = security_index.search_results(search_string, investment_types)
+    except sqlite3.Error as ex:
+        logger.warning(f"Could not read the security index: {ex}")
+        return None
+    if search_results is not None:
+        logger.debug(f"Found '{search_string}' in the security index")
+    return search_results
+
+
+def _record(add: Callable[[SecurityIndex], int], security_index: Optional[SecurityIndex]):
+    security_index = index_for(security_index)
+    if security_index is None:
+        return
+    try:
+        add(security_index)
+    except sqlite3.Error as ex:
+        # the index only saves searches, a failure to write to it must not fail the call which parsed the page
+        logger.warning(f"Could not update the security index: {ex}")
+
+
+def record_search_results(search_results: SearchResults, security_index: SecurityIndex = None):
+    """
+    Feeds search results to the given or the process-wide index, if there is one, likewise the other record functions
+    """
+    _record(lambda indexed: indexed.add_search_results(search_results), security_index)
+
+
+def record_market_order_position(position: 'MarketOrderPosition', security_index: SecurityIndex = None):
+    _record(lambda indexed: indexed.add_market_order_position(position), security_index)
+
+
+def record_manual_order_position(position: 'ManualOrderPosition', security_index: SecurityIndex = None):
+    _record(lambda indexed: indexed.add_manual_order_position(position), security_index)
+
+
+def record_investments(investments: List['Investment'], security_index: SecurityIndex = None):
+    _record(lambda indexed: indexed.add_investments(investments), security_index)
@@ -1,3 +1,10 @@
+import functools
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .errors import SearchFilterError
+
+
 class InvestmentTypes:
     SHARES = 'shares'                       # Shares & other stocks
     OVERSEAS = 'overseas'                   # Overseas stocks
@@ -15,6 +22,7 @@ class InvestmentCategoryTypes:
 
 
 class SearchResult:
+    __slots__ = ('_stock_ticker', '_security_name', '_sedol_code', '_internet_allowed', '_category')
     _stock_ticker: str
     _security_name: str
     _sedol_code: str
@@ -59,3 +67,310 @@ class SearchResult:
     def __str__(self):
         return f"""SearchResult[stock_ticker={self._stock_ticker}, security_name={self._security_name},
         sedol_code={self._sedol_code}, internet_allowed={self._internet_allowed}, category={self._category}]"""
+
+
+class SearchResults(list):
+    """
+    The results of a search, a list which is filled from the docs of the JSON response when first used as a list.
+    Indexing creates only the SearchResult asked for, and filter() runs on the docs, so a broad search filtered down
+    to one security creates one object.  Once the list is changed, e.g. by append(), docs and filter() no longer
+    reflect it and return None and a plain list respectively.
+    """
+    __slots__ = ('_docs', '_results', '_filled', '_num_found', '_start')
+    _docs: Optional[List[dict]]
+    _results: List[Optional[SearchResult]]
+    _filled: bool
+    _num_found: Optional[int]
+    _start: Optional[int]
+
+    def __init__(self, docs: List[dict], num_found: int = None, start: int = None):
+        """
+        :param docs: list - the 'docs' of the search response
+        :param num_found: int - Optional, the number of securities matching the search, of which docs is one page
+        :param start: int - Optional, the offset of the page in all the matching securities
+        """
+        super().__init__()
+        self._docs = docs
+        self._results = [None] * len(docs)
+        self._filled = False
+        self._num_found = num_found
+        self._start = start
+
+    @staticmethod
+    def _stock_ticker(doc: dict) -> str:
+        return doc['stock_ticker'] if 'stock_ticker' in doc else doc['epic']
+
+    def _result(self, index: int) -> SearchResult:
+        result = self._results[index]
+        if result is None:
+            doc = self._docs[index]
+            result = SearchResult(stock_ticker=self._stock_ticker(doc), security_name=doc['identifier'],
+                                  sedol_code=doc['id'], internet_allowed=doc['internet_allowed'] == 'Y',
+                                  category=doc['category'])
+            self._results[index] = result
+        return result
+
+    def _fill(self):
+        if not self._filled:
+            self._filled = True
+            list.extend(self, [self._result(index) for index in range(len(self._docs))])
+
+    def _changed(self):
+        self._fill()
+        self._docs = None
+
+    def __getitem__(self, index):
+        if self._filled or isinstance(index, slice):
+            self._fill()
+            return list.__getitem__(self, index)
+        if index < 0:
+            index += len(self._docs)
+        if not 0 <= index < len(self._docs):
+            raise IndexError('search result index out of range')
+        return self._result(index)
+
+    def __len__(self):
+        return list.__len__(self) if self._filled else len(self._docs)
+
+    def filter(self, stock_ticker: str = None, sedol_code: str = None) -> Union['SearchResults', List[SearchResult]]:
+        """
+        The results matching the stock ticker and SEDOL code, ignoring case
+        """
+        stock_ticker = None if stock_ticker is None else stock_ticker.upper()
+        sedol_code = None if sedol_code is None else sedol_code.upper()
+        if self._docs is None:
+            return [search_result for search_result in self
+                    if (stock_ticker is None or search_result.stock_ticker.upper() == stock_ticker)
+                    and (sedol_code is None or search_result.sedol_code.upper() == sedol_code)]
+        return SearchResults([doc for doc in self._docs
+                              if (stock_ticker is None or self._stock_ticker(doc).upper() == stock_ticker)
+                              and (sedol_code is None or doc['id'].upper() == sedol_code)])
+
+    def __radd__(self, other):
+        # list + SearchResults would otherwise concatenate the list before it is filled
+        if not isinstance(other, list):
+            return NotImplemented
+        return other + list(self)
+
+    def __reduce_ex__(self, protocol):
+        if self._docs is None:
+            return list, (list(self),)
+        return SearchResults, (self._docs, self._num_found, self._start)
+
+    @property
+    def docs(self) -> Optional[List[dict]]:
+        """
+        The docs of the search response, None once the list has been changed
+        """
+        return self._docs
+
+    @property
+    def num_found(self) -> Optional[int]:
+        return self._num_found
+
+    @property
+    def start(self) -> Optional[int]:
+        return self._start
+
+    def __str__(self):
+        return f"SearchResults[count={len(self)}, num_found={self._num_found}, start={self._start}]"
+
+
+def _filling(method):
+    @functools.wraps(method)
+    def filled(self, *args, **kwargs):
+        self._fill()
+        return method(self, *args, **kwargs)
+    return filled
+
+
+def _changing(method):
+    @functools.wraps(method)
+    def changed(self, *args, **kwargs):
+        self._changed()
+        return method(self, *args, **kwargs)
+    return changed
+
+
+# every other list method sees the filled list, and the ones changing it drop the docs which no longer match it
+for _method in (list.__iter__, list.__reversed__, list.__contains__, list.__eq__, list.__ne__, list.__lt__,
+                list.__le__, list.__gt__, list.__ge__, list.__add__, list.__mul__, list.__rmul__, list.__repr__,
+                list.index, list.count, list.copy):
+    setattr(SearchResults, _method.__name__, _filling(_method))
+for _method in (list.__setitem__, list.__delitem__, list.__iadd__, list.__imul__, list.append, list.extend,
+                list.insert, list.remove, list.pop, list.sort, list.reverse, list.clear):
+    setattr(SearchResults, _method.__name__, _changing(_method))
+del _method
+
+
+class SearchResultIndex:
+    """
+    Search results indexed by upper case stock ticker and SEDOL code, built once so that each filter is a lookup
+    rather than a scan of every result.  The results of SearchResults are still only created when matched.
+    """
+    __slots__ = ('_search_results', '_by_stock_ticker', '_by_sedol_code')
+    _search_results: Sequence
+    _by_stock_ticker: Dict[str, List[int]]
+    _by_sedol_code: Dict[str, List[int]]
+
+    def __init__(self, search_results: Union[SearchResults, List[SearchResult]]):
+        """
+        :param search_results: SearchResults or a list of SearchResult - the results to index
+        """
+        self._search_results = search_results
+        self._by_stock_ticker = {}
+        self._by_sedol_code = {}
+        if isinstance(search_results, SearchResults) and search_results.docs is not None:
+            keys = ((SearchResults._stock_ticker(doc), doc['id']) for doc in search_results.docs)
+        else:
+            keys = ((search_result.stock_ticker, search_result.sedol_code) for search_result in search_results)
+        for position, (stock_ticker, sedol_code) in enumerate(keys):
+            self._by_stock_ticker.setdefault(stock_ticker.upper(), []).append(position)
+            self._by_sedol_code.setdefault(sedol_code.upper(), []).append(position)
+
+    def _positions(self, stock_ticker: Optional[str], sedol_code: Optional[str]) -> List[int]:
+        if stock_ticker is None and sedol_code is None:
+            return list(range(len(self._search_results)))
+        if sedol_code is None:
+            return self._by_stock_ticker.get(stock_ticker.upper(), [])
+        by_sedol_code = self._by_sedol_code.get(sedol_code.upper(), [])
+        if stock_ticker is None:
+            return by_sedol_code
+        return [position for position in self._by_stock_ticker.get(stock_ticker.upper(), [])
+                if position in by_sedol_code]
+
+    def find(self, stock_ticker: str = None, sedol_code: str = None) -> List[SearchResult]:
+        """
+        The results matching the stock ticker and SEDOL code, ignoring case
+        """
+        return [self._search_results[position] for position in self._positions(stock_ticker, sedol_code)]
+
+    def filter(self, stock_ticker: str = None, sedol_code: str = None) -> SearchResult:
+        """
+        The one result matching the stock ticker and SEDOL code, like security_filter
+        :raises SearchFilterError: when no result or more than one match
+        """
+        positions = self._positions(stock_ticker, sedol_code)
+        if len(positions) != 1:
+            raise SearchFilterError(f"Could not find security, results filtered to {len(positions)}")
+        return self._search_results[positions[0]]
+
+    def filter_many(self, queries: Iterable[Tuple[Optional[str], Optional[str]]]) -> List[SearchResult]:
+        """
+        filter for every (stock ticker, SEDOL code) query, i.e. [('GOOG', None), (None, 'BYVY8G0')]
+        :return: the result of each query, in order
+        :raises SearchFilterError: for the first query which does not match exactly one result
+        """
+        return [self.filter(stock_ticker=stock_ticker, sedol_code=sedol_code) for stock_ticker, sedol_code in queries]
+
+    def __len__(self):
+        return len(self._search_results)
+
+    def __str__(self):
+        return f"SearchResultIndex[count={len(self._search_results)}, stock_tickers={len(self._by_stock_ticker)}]"
+
+
+class IndexedSecurity:
+    """
+    A security as known to the SecurityIndex, the identifiers and details which have not been seen yet are None
+    """
+    __slots__ = ('_sedol_code', '_stock_ticker', '_epic_code', '_isin_code', '_security_name', '_category',
+                 '_internet_allowed')
+    _sedol_code: str
+    _stock_ticker: Optional[str]
+    _epic_code: Optional[str]
+    _isin_code: Optional[str]
+    _security_name: Optional[str]
+    _category: Optional[str]
+    _internet_allowed: Optional[bool]
+
+    def __init__(self, sedol_code: str, stock_ticker: Optional[str], epic_code: Optional[str],
+                 isin_code: Optional[str], security_name: Optional[str], category: Optional[str],
+                 internet_allowed: Optional[bool]):
+        """
+        :param sedol_code: str - the SEDOL code of the security, i.e. BYVY8G0
+        :param stock_ticker: str - the stock symbol, i.e. GOOGL
+        :param epic_code: str - the EPIC code
+        :param isin_code: str - the ISIN code, i.e. US02079K3059
+        :param security_name: str - the name, i.e. "Alphabet Inc NPV A"
+        :param category: str - the category of the investment, see InvestmentCategoryTypes
+        :param internet_allowed: bool - whether it can be traded online
+        """
+        self._sedol_code = sedol_code
+        self._stock_ticker = stock_ticker
+        self._epic_code = epic_code
+        self._isin_code = isin_code
+        self._security_name = security_name
+        self._category = category
+        self._internet_allowed = internet_allowed
+
+    @property
+    def sedol_code(self):
+        return self._sedol_code
+
+    @property
+    def stock_ticker(self):
+        return self._stock_ticker
+
+    @property
+    def epic_code(self):
+        return self._epic_code
+
+    @property
+    def isin_code(self):
+        return self._isin_code
+
+    @property
+    def security_name(self):
+        return self._security_name
+
+    @property
+    def category(self):
+        return self._category
+
+    @property
+    def internet_allowed(self):
+        return self._internet_allowed
+
+    def __str__(self):
+        return f"""IndexedSecurity[sedol_code={self._sedol_code}, stock_ticker={self._stock_ticker}, \
+epic_code={self._epic_code}, isin_code={self._isin_code}, security_name={self._security_name}, \
+category={self._category}, internet_allowed={self._internet_allowed}]"""
+
+
+class ResolvedSecurities:
+    """
+    The outcome of resolving a batch of stock tickers, keyed by the upper case ticker: the security found for each
+    ticker, or the error which prevented it from being found, and the search results it was filtered from
+    """
+    __slots__ = ('_results', '_errors', '_search_results')
+    _results: Dict[str, SearchResult]
+    _errors: Dict[str, BaseException]
+    _search_results: Dict[str, List[SearchResult]]
+
+    def __init__(self, results: Dict[str, SearchResult], errors: Dict[str, BaseException],
+                 search_results: Dict[str, List[SearchResult]] = None):
+        """
+        :param results: dict - the security found for each resolved ticker
+        :param errors: dict - the error raised for each ticker which could not be resolved
+        :param search_results: dict - Optional, the results of every ticker which was searched for, including the
+        ambiguous ones, so that they can be narrowed down further (e.g. by SEDOL code) without searching again
+        """
+        self._results = results
+        self._errors = errors
+        self._search_results = {} if search_results is None else search_results
+
+    @property
+    def results(self) -> Dict[str, SearchResult]:
+        return self._results
+
+    @property
+    def errors(self) -> Dict[str, BaseException]:
+        return self._errors
+
+    @property
+    def search_results(self) -> Dict[str, List[SearchResult]]:
+        return self._search_results
+
+    def __str__(self):
+        return f"ResolvedSecurities[results={len(self._results)}, errors={len(self._errors)}]"
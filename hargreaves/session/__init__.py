@@ -1,38 +1,99 @@
 import logging
-
-from requests_tracker.session import WebSessionFactory
-from requests_tracker.storage import ICookieStorage
+from typing import Optional, TYPE_CHECKING
 
 from ..config.models import ApiConfiguration
-from ..utils.cookies import HLCookieHelper
-from ..session.shared import LoggedInSession
+from ..session.cache import ResponseCache, CacheRule, DEFAULT_CACHE_RULES
+from ..session.capture import CaptureMode, RequestCapture, request_history_of
+from ..utils.lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    import ssl
+    from requests_tracker.storage import ICookieStorage
+    from ..session.shared import LoggedInSession
+    from ..utils.pacing import IPacingPolicy
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'ConnectionStats': '.connections',
+    'LoggedInSession': '.shared',
+    'SessionPool': '.pool',
+    'SessionRefresher': '.refresher',
+    'SessionStats': '.pool'
+})
+
 
 def create_session(
-        cookies_storage: ICookieStorage,
+        cookies_storage: 'ICookieStorage',
         config: ApiConfiguration,
         retry_count: int = 1,
-        timeout: float = 15.00):
+        timeout: float = 15.00,
+        pacing_policy: 'IPacingPolicy' = None,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        tcp_keepalive: bool = False,
+        ssl_context: 'ssl.SSLContext' = None,
+        response_cache: ResponseCache = None,
+        capture_mode: CaptureMode = CaptureMode.FULL,
+        capture_size: int = 100,
+        capture_path: str = None) -> 'LoggedInSession':
     """
     Creates a WebSession that will automatically handle login redirects
+    :param capture_path: The HAR file written by CaptureMode.STREAM, which must not exist yet.  The file is closed by
+        web_session.close(), or at the end of a with block
+    :param capture_size: The number of requests kept by CaptureMode.RING_BUFFER
+    :param capture_mode: Whether requests are kept in memory (FULL), not at all (OFF), only the most recent ones
+        (RING_BUFFER) or streamed to a HAR file (STREAM)
+    :param response_cache: Optional, caches the account pages and searches until an order is placed or cancelled
+    :param ssl_context: Optional, the SSLContext used for every TLS connection, which saves building one per
+        connection but does not resume TLS sessions
+    :param tcp_keepalive: Send TCP keep-alive probes so idle pooled connections survive between deal steps
+    :param pool_maxsize: Optional, the maximum number of connections kept open per host, requests' default when not
+        given.  The connection pool is left to requests unless one of the pool, keep-alive or SSL options is given,
+        see web_session.connection_stats
+    :param pool_connections: Optional, the number of hosts to keep a pool of connections for
+    :param pacing_policy: Optional, how long the clients wait between requests, see hargreaves.utils.pacing
     :param timeout:
     :param retry_count:
     :param cookies_storage:
     :param config:
     :return:
     """
+    from requests_tracker.session import WebSessionFactory
+    from ..session.connections import configure_connection_pool
+    from ..session.shared import LoggedInSession
+    from ..utils.cookies import HLCookieHelper
+
+    sensitive_values = [config.username, config.password, config.secure_number, config.date_of_birth]
+    sensitive_params = ['secure-number[']
     web_session = WebSessionFactory.create(
         cookies_storage,
         default_referer='https://online.hl.co.uk/',
-        sensitive_values=[config.username, config.password,
-                          config.secure_number, config.date_of_birth],
-        sensitive_params=['secure-number['],
+        sensitive_values=sensitive_values,
+        sensitive_params=sensitive_params,
         retry_count=retry_count,
         timeout=timeout
     )
     HLCookieHelper.set_default_cookies(web_session.cookies)
+    connection_stats = configure_connection_pool(
+        web_session,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        tcp_keepalive=tcp_keepalive,
+        ssl_context=ssl_context)
+    if capture_mode != CaptureMode.FULL:
+        # fails now rather than on the first request when requests_tracker keeps its history elsewhere
+        request_history_of(web_session.request_session_context)
+    request_capture = None if capture_mode == CaptureMode.FULL else RequestCapture(
+        mode=capture_mode,
+        max_entries=capture_size,
+        path=capture_path,
+        sensitive_values=sensitive_values,
+        sensitive_params=sensitive_params)
     return LoggedInSession(
         web_session=web_session,
-        config=config)
+        config=config,
+        pacing_policy=pacing_policy,
+        connection_stats=connection_stats,
+        response_cache=response_cache,
+        request_capture=request_capture)
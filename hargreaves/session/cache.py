@@ -0,0 +1,247 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+from urllib.parse import urlencode
+
+if TYPE_CHECKING:
+    from requests import Response
+
+logger = logging.getLogger(__name__)
+
+ACCOUNT_PAGE_PATTERN = r'^https://online\.hl\.co\.uk/my-accounts/account_summary/account/\d+$'
+
+DEFAULT_MAX_ENTRIES = 256
+
+# query parameters which change on every call without changing the response, e.g. the epoch time 'pid'
+VOLATILE_PARAMS = ('pid', 'callback', 'jsoncallback')
+
+
+class CacheRule:
+    """
+    Caches the GET responses whose URL matches pattern for ttl_seconds.
+
+    Some HL pages are stateful: the account CSV is served for the account page visited last, so its rule names
+    that page in context_pattern.  The cached CSV is keyed by the account page requested before it, and on a miss
+    the account page is fetched again (uncached) first, so that HL serves the CSV for the right account.
+    """
+    _pattern: str
+    _ttl_seconds: float
+    _context_pattern: Optional[str]
+
+    def __init__(self, pattern: str, ttl_seconds: float, context_pattern: str = None):
+        """
+        :param pattern: str - regular expression matched against the URL, without its query string
+        :param ttl_seconds: float - how long a response stays fresh
+        :param context_pattern: str - Optional, regular expression of the page which the response depends on
+        """
+        self._pattern = pattern
+        self._ttl_seconds = ttl_seconds
+        self._context_pattern = context_pattern
+        self._regex = re.compile(pattern)
+        self._context_regex = None if context_pattern is None else re.compile(context_pattern)
+
+    def matches(self, url: str) -> bool:
+        return self._regex.match(url) is not None
+
+    def is_context(self, url: str) -> bool:
+        return self._context_regex is not None and self._context_regex.match(url) is not None
+
+    @property
+    def pattern(self):
+        return self._pattern
+
+    @property
+    def ttl_seconds(self):
+        return self._ttl_seconds
+
+    @property
+    def context_pattern(self):
+        return self._context_pattern
+
+    def __str__(self):
+        return f"""CacheRule[pattern={self._pattern}, ttl_seconds={self._ttl_seconds}, \
+context_pattern={self._context_pattern}]"""
+
+
+DEFAULT_CACHE_RULES = [
+    CacheRule(pattern=r'^https://online\.hl\.co\.uk/my-accounts$', ttl_seconds=60),
+    CacheRule(pattern=ACCOUNT_PAGE_PATTERN, ttl_seconds=60),
+    CacheRule(pattern=r'^https://online\.hl\.co\.uk/my-accounts/account_summary_csv/', ttl_seconds=60,
+              context_pattern=ACCOUNT_PAGE_PATTERN),
+    CacheRule(pattern=r'^https://online\.hl\.co\.uk/ajaxx/stocks\.php$', ttl_seconds=300),
+]
+
+# POSTs which place or cancel an order, and therefore change holdings, cash and pending orders
+DEFAULT_INVALIDATING_PATTERNS = [
+    r'^https://online\.hl\.co\.uk/my-accounts/equity_confirmation',
+    r'^https://online\.hl\.co\.uk/my-accounts/manual_deal',
+    r'^https://online\.hl\.co\.uk/my-accounts/pending_orders',
+]
+
+
+class ResponseCache:
+    """
+    A per-session cache of idempotent GET responses, see LoggedInSession.
+
+    Every entry is dropped as soon as an order is submitted or cancelled through the session.  The expired entries
+    are dropped whenever a response is stored, and beyond max_entries the least recently used entry is evicted, so
+    that the distinct searches of a long-running process do not pile up.
+    """
+    _rules: List[CacheRule]
+    _invalidating_regexes: list
+    _time: Callable[[], float]
+    _max_entries: int
+    _entries: 'OrderedDict[Tuple, Tuple[float, Response]]'
+    _context_url: Optional[str]
+    _sent_context_url: Optional[str]
+    _hits: int
+    _misses: int
+    _invalidations: int
+    _lock: threading.RLock
+
+    def __init__(self,
+                 rules: List[CacheRule] = None,
+                 invalidating_patterns: List[str] = None,
+                 time_source: Callable[[], float] = time.monotonic,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        :param rules: list - the CacheRules, DEFAULT_CACHE_RULES by default
+        :param invalidating_patterns: list - regular expressions of the POST URLs which clear the cache
+        :param time_source: callable - returns the current time.monotonic() value, useful in unit tests
+        :param max_entries: int - the most responses kept, the least recently used one is evicted beyond it
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self._rules = DEFAULT_CACHE_RULES if rules is None else rules
+        self._invalidating_regexes = [re.compile(pattern) for pattern in (
+            DEFAULT_INVALIDATING_PATTERNS if invalidating_patterns is None else invalidating_patterns)]
+        self._time = time_source
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._context_url = None
+        self._sent_context_url = None
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._lock = threading.RLock()
+
+    def get(self, url: str, params, send: Callable[[], 'Response'],
+            send_context: Callable[[str], 'Response']) -> 'Response':
+        """
+        Answers a GET from the cache or sends it
+        :param url: str - the URL requested
+        :param params: dict - the query parameters requested
+        :param send: callable - sends the request
+        :param send_context: callable - sends an uncached GET for the given context URL
+        :return: Response
+        """
+        rule = self._rule_for(url)
+        if rule is None:
+            with self._lock:
+                self._sent_context_url = None
+            return send()
+
+        if rule.context_pattern is None:
+            key = (url, _params_key(params), None)
+            cached_response = self._lookup(key, url)
+            if cached_response is not None:
+                return cached_response
+            response = send()
+            with self._lock:
+                self._store(key, rule, response)
+                self._track_context(url, sent=True)
+            return response
+
+        # the context page and the response depending on it must reach HL back to back
+        with self._lock:
+            context_url = self._context_url
+            key = (url, _params_key(params), context_url)
+            cached_response = self._lookup(key, url)
+            if cached_response is not None:
+                return cached_response
+            if context_url is not None and context_url != self._sent_context_url:
+                logger.debug(f"Re-visiting '{context_url}' before '{url}'")
+                send_context(context_url)
+                self._sent_context_url = context_url
+            response = send()
+            self._store(key, rule, response)
+            return response
+
+    def observe_post(self, url: str):
+        with self._lock:
+            self._sent_context_url = None
+            if any(regex.match(url) for regex in self._invalidating_regexes):
+                self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            if self._entries:
+                logger.debug(f"Invalidating {len(self._entries)} cached responses")
+            self._entries.clear()
+            self._invalidations += 1
+
+    def _lookup(self, key: Tuple, url: str) -> Optional['Response']:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._time() >= entry[0]:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            logger.debug(f"Cache hit for '{url}'")
+            self._track_context(url, sent=False)
+            return entry[1]
+
+    def _store(self, key: Tuple, rule: CacheRule, response: 'Response'):
+        if response.status_code != 200:
+            return
+        now = self._time()
+        for expired_key in [entry_key for entry_key, (expires, _) in self._entries.items() if now >= expires]:
+            del self._entries[expired_key]
+        self._entries[key] = (now + rule.ttl_seconds, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _rule_for(self, url: str) -> Optional[CacheRule]:
+        return next((rule for rule in self._rules if rule.matches(url)), None)
+
+    def _track_context(self, url: str, sent: bool):
+        is_context = any(rule.is_context(url) for rule in self._rules)
+        if is_context:
+            self._context_url = url
+        if sent:
+            # any other page may move HL on from the context page, so it is only trusted straight after a visit
+            self._sent_context_url = url if is_context else None
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def invalidations(self) -> int:
+        return self._invalidations
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __str__(self):
+        return f"""ResponseCache[hits={self._hits}, misses={self._misses}, invalidations={self._invalidations}, \
+entries={len(self._entries)}]"""
+
+
+def _params_key(params) -> str:
+    if not params:
+        return ''
+    return urlencode(sorted((key, str(value)) for key, value in dict(params).items()
+                            if key not in VOLATILE_PARAMS))
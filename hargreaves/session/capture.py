@@ -0,0 +1,240 @@
+import collections
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone, timedelta
+from enum import Enum
+from typing import TYPE_CHECKING, Deque, List, Optional
+from urllib.parse import parse_qsl, quote_plus
+
+from .. import version
+
+if TYPE_CHECKING:
+    from requests import Response
+
+logger = logging.getLogger(__name__)
+
+REDACTED = '********'
+REDACTED_HEADERS = ('cookie', 'set-cookie', 'authorization')
+HAR_CREATOR = {'name': 'hargreaves-sdk-python', 'version': version}
+HAR_FOOTER = b'\n]}}\n'
+# where requests_tracker's RequestSessionContext keeps the requests sent
+REQUEST_HISTORY_ATTRIBUTE = 'request_contexts'
+
+
+class CaptureMode(Enum):
+    FULL = 'full'  # requests_tracker keeps every request and response in memory (the historic behaviour)
+    OFF = 'off'  # nothing is kept
+    RING_BUFFER = 'ring_buffer'  # only the most recent requests are kept in memory
+    STREAM = 'stream'  # every request is appended to a HAR file on disk as soon as it completes
+
+
+class RequestCapture:
+    """
+    Records the requests sent by a LoggedInSession as HAR entries, with the sensitive values redacted, and keeps
+    the requests_tracker session context from growing (see CaptureMode).
+    """
+    _mode: CaptureMode
+    _sensitive_values: List[str]
+    _sensitive_params: List[str]
+    _max_body_bytes: Optional[int]
+    _entries: Deque[dict]
+    _writer: Optional['StreamingHARWriter']
+    _lock: threading.Lock
+
+    def __init__(self,
+                 mode: CaptureMode = CaptureMode.FULL,
+                 max_entries: int = 100,
+                 path: str = None,
+                 sensitive_values: List[str] = None,
+                 sensitive_params: List[str] = None,
+                 max_body_bytes: Optional[int] = None):
+        """
+        :param mode: CaptureMode - what is kept
+        :param max_entries: int - the size of the ring buffer, used by CaptureMode.RING_BUFFER
+        :param path: str - the HAR file written by CaptureMode.STREAM, which must not exist yet
+        :param sensitive_values: list - values replaced by '********' wherever they appear
+        :param sensitive_params: list - prefixes of the form fields whose values are replaced by '********'
+        :param max_body_bytes: int - Optional, bodies are truncated to this size
+        """
+        if mode == CaptureMode.STREAM and path is None:
+            raise ValueError("A path is required to stream the HAR file")
+        self._mode = mode
+        self._sensitive_values = [value for value in (sensitive_values or []) if value]
+        self._sensitive_params = sensitive_params or []
+        self._max_body_bytes = max_body_bytes
+        self._entries = collections.deque(maxlen=max_entries if mode == CaptureMode.RING_BUFFER else 0)
+        self._writer = StreamingHARWriter(path) if mode == CaptureMode.STREAM else None
+        self._lock = threading.Lock()
+
+    def record(self, response: 'Response', request_session_context=None):
+        """
+        :param response: Response - the response received, with its request
+        :param request_session_context: RequestSessionContext - Optional, trimmed according to the mode
+        """
+        if self._mode == CaptureMode.FULL:
+            return
+
+        if self._mode != CaptureMode.OFF:
+            entry = self.create_entry(response)
+            with self._lock:
+                if self._writer is not None:
+                    self._writer.write(entry)
+                else:
+                    self._entries.append(entry)
+
+        if request_session_context is not None:
+            trim_request_session_context(request_session_context, self._entries.maxlen)
+
+    def create_entry(self, response: 'Response') -> dict:
+        request = response.request
+        elapsed = response.elapsed if response.elapsed is not None else timedelta(0)
+        started = datetime.now(timezone.utc) - elapsed
+        return {
+            'startedDateTime': started.isoformat(),
+            'time': elapsed.total_seconds() * 1000,
+            'request': {
+                'method': request.method,
+                'url': self._redact(request.url),
+                'httpVersion': 'HTTP/1.1',
+                'headers': self._headers(request.headers),
+                'queryString': [],
+                'cookies': [],
+                'headersSize': -1,
+                'bodySize': -1,
+                'postData': self._post_data(request)
+            },
+            'response': {
+                'status': response.status_code,
+                'statusText': response.reason or '',
+                'httpVersion': 'HTTP/1.1',
+                'headers': self._headers(response.headers),
+                'cookies': [],
+                'content': {
+                    'size': len(response.content or b''),
+                    'mimeType': response.headers.get('Content-Type', ''),
+                    'text': self._redact(self._truncate(response.text))
+                },
+                'redirectURL': response.headers.get('Location', ''),
+                'headersSize': -1,
+                'bodySize': -1
+            },
+            'cache': {},
+            'timings': {'send': 0, 'wait': elapsed.total_seconds() * 1000, 'receive': 0}
+        }
+
+    def _post_data(self, request) -> dict:
+        body = request.body
+        if body is None:
+            return {}
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', errors='replace')
+        mime_type = request.headers.get('Content-Type', '')
+        if mime_type.startswith('application/x-www-form-urlencoded'):
+            body = '&'.join(f'{quote_plus(name)}='
+                            f'{REDACTED if name.startswith(tuple(self._sensitive_params)) else quote_plus(value)}'
+                            for name, value in parse_qsl(body, keep_blank_values=True))
+        return {'mimeType': mime_type, 'text': self._redact(self._truncate(body))}
+
+    def _headers(self, headers) -> list:
+        return [{'name': name, 'value': REDACTED if name.lower() in REDACTED_HEADERS else self._redact(value)}
+                for name, value in headers.items()]
+
+    def _redact(self, text: str) -> str:
+        for sensitive_value in self._sensitive_values:
+            text = text.replace(sensitive_value, REDACTED)
+        return text
+
+    def _truncate(self, text: str) -> str:
+        if self._max_body_bytes is None or len(text) <= self._max_body_bytes:
+            return text
+        return text[:self._max_body_bytes]
+
+    def har(self) -> dict:
+        """
+        The HAR document of the requests kept in the ring buffer
+        """
+        with self._lock:
+            return {'log': {'version': '1.2', 'creator': HAR_CREATOR, 'entries': list(self._entries)}}
+
+    def write_har(self, path: str):
+        with open(path, 'w', encoding='utf-8') as har_file:
+            json.dump(self.har(), har_file, indent=2)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    @property
+    def mode(self) -> CaptureMode:
+        return self._mode
+
+    @property
+    def entries(self) -> List[dict]:
+        with self._lock:
+            return list(self._entries)
+
+
+class StreamingHARWriter:
+    """
+    Appends HAR entries to a file as they complete.  The closing brackets are rewritten after every entry, so the
+    file is a valid HAR document at all times, even if the process dies.  An existing file is never overwritten, so
+    each session needs a path of its own.
+    """
+    _path: str
+    _file: Optional[object]
+    _count: int
+
+    def __init__(self, path: str):
+        """
+        :param path: str - the HAR file to create
+        :raises FileExistsError: when the file exists, rather than wiping an earlier capture
+        """
+        self._path = path
+        self._count = 0
+        self._file = open(path, 'xb')
+        header = json.dumps({'version': '1.2', 'creator': HAR_CREATOR})[:-1]
+        self._file.write(f'{{"log": {header}, "entries": ['.encode('utf-8') + HAR_FOOTER)
+        self._file.flush()
+
+    def write(self, entry: dict):
+        if self._file is None:
+            raise ValueError(f"HAR file '{self._path}' is closed")
+        self._file.seek(-len(HAR_FOOTER), os.SEEK_END)
+        separator = b',\n' if self._count > 0 else b'\n'
+        self._file.write(separator + json.dumps(entry).encode('utf-8') + HAR_FOOTER)
+        self._file.flush()
+        self._count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+
+def trim_request_session_context(request_session_context, max_entries: int):
+    """
+    Keeps the last max_entries requests recorded by requests_tracker.  Only its request history is trimmed, the rest
+    of the context is left alone.
+    :raises AttributeError: when the context does not keep its history where expected, i.e. requests_tracker changed
+    """
+    request_history = request_history_of(request_session_context)
+    if len(request_history) > max_entries:
+        del request_history[:len(request_history) - max_entries]
+
+
+def request_history_of(request_session_context) -> list:
+    """
+    The list in which requests_tracker's RequestSessionContext keeps every request sent
+    """
+    request_history = getattr(request_session_context, REQUEST_HISTORY_ATTRIBUTE, None)
+    if not isinstance(request_history, list):
+        raise AttributeError(f"{type(request_session_context).__name__} has no '{REQUEST_HISTORY_ATTRIBUTE}' list, "
+                             f"the requests it keeps cannot be bounded: use CaptureMode.FULL with this version of "
+                             f"requests_tracker")
+    return request_history
@@ -1,7 +1,9 @@
 import logging
 
+from requests import Response
+
 from ..session.errors import SessionError
-from ..utils import clock
+from ..utils import clock, pacing
 from requests_tracker.session import IWebSession, WebRequestType
 
 logger = logging.getLogger(__name__)
@@ -20,25 +22,35 @@ class SessionClient(ISessionClient):
     def session_keepalive(self, web_session: IWebSession, sedol_code: str, session_hl_vt: str):
         logger.debug("Perform 'Session Keepalive'")
 
-        clock.sleep_random()
+        pacing.pause(web_session)
+
+        res = web_session.get(**create_keepalive_request(sedol_code=sedol_code, session_hl_vt=session_hl_vt))
+        check_keepalive_response(res)
+
+
+def create_keepalive_request(sedol_code: str, session_hl_vt: str) -> dict:
+    """
+    The arguments of the keepalive GET, shared by the sync and async clients
+    """
+    # pid is the time in milliseconds since the epoch
+    pid = clock.get_current_time_as_epoch_time()
+
+    return dict(
+        url='https://online.hl.co.uk/ajaxx/user.php',
+        params={
+            'method': 'session_timeout_handler',
+            'keepalive': "1",
+            'format': 'jsonp',
+            'jsoncallback': f"jsonp{pid}",
+            'hl_vt': session_hl_vt,
+            'initialise': 'true'
+        },
+        headers={
+            'Referer': f'https://online.hl.co.uk/my-accounts/security_deal/sedol/{sedol_code}'
+        },
+        request_type=WebRequestType.XHR)
 
-        # pid is the time in milliseconds since the epoch
-        pid = clock.get_current_time_as_epoch_time()
 
-        request_headers = {
-            'Referer': f'https://online.hl.co.uk/my-accounts/security_deal/sedol/{sedol_code}'
-        }
-
-        res = web_session.get(f"https://online.hl.co.uk/ajaxx/user.php",
-                              params={
-                                  'method': 'session_timeout_handler',
-                                  'keepalive': "1",
-                                  'format': 'jsonp',
-                                  'jsoncallback': f"jsonp{pid}",
-                                  'hl_vt': session_hl_vt,
-                                  'initialise': 'true'
-                              },
-                              headers=request_headers, request_type=WebRequestType.XHR)
-
-        if res.text != 'session_timeout_handler(["keptalive"])':
-            raise SessionError('Session could not be kept alive', res.text)
+def check_keepalive_response(res: Response):
+    if res.content != b'session_timeout_handler(["keptalive"])':
+        raise SessionError('Session could not be kept alive', res.text)
@@ -0,0 +1,179 @@
+import logging
+import socket
+import ssl
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEEPALIVE_IDLE_SECONDS = 60
+DEFAULT_KEEPALIVE_INTERVAL_SECONDS = 20
+
+
+class ConnectionStats:
+    """
+    Counts the connections opened by a session against the requests it sent, a warm session opens one connection
+    per host and reuses it for every later request.
+    """
+    _requests: int
+    _new_connections: int
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._requests = 0
+        self._new_connections = 0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self._requests += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self._new_connections += 1
+
+    @property
+    def requests(self) -> int:
+        return self._requests
+
+    @property
+    def new_connections(self) -> int:
+        return self._new_connections
+
+    @property
+    def reused_connections(self) -> int:
+        return max(0, self._requests - self._new_connections)
+
+    def __str__(self):
+        return f"""ConnectionStats[requests={self._requests}, new_connections={self._new_connections}, \
+reused_connections={self.reused_connections}]"""
+
+
+def tcp_keepalive_socket_options(idle_seconds: int = DEFAULT_KEEPALIVE_IDLE_SECONDS,
+                                 interval_seconds: int = DEFAULT_KEEPALIVE_INTERVAL_SECONDS) -> list:
+    """
+    Socket options enabling TCP keep-alive probes, so idle pooled connections are not silently dropped by NAT
+    gateways and firewalls between deal steps.  The idle and interval timings are only set where the OS supports them.
+    """
+    socket_options = list(HTTPConnection.default_socket_options)
+    socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle_seconds))
+    elif hasattr(socket, 'TCP_KEEPALIVE'):
+        socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle_seconds))
+    if hasattr(socket, 'TCP_KEEPINTVL'):
+        socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval_seconds))
+    return socket_options
+
+
+def _counting_pool_class(pool_class, connection_stats: ConnectionStats):
+    class CountingConnectionPool(pool_class):
+        def _new_conn(self):
+            connection_stats.record_new_connection()
+            return super()._new_conn()
+
+    return CountingConnectionPool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    A requests HTTPAdapter with a sized connection pool, TCP keep-alive and one SSLContext used for every TLS
+    connection, which counts the connections it opens in a ConnectionStats.
+
+    The handshake is saved by reusing the pooled connections.  Sharing the SSLContext only saves building it, and
+    loading its certificates, for every new connection: the TLS sessions are not resumed across connections.
+    """
+    _connection_stats: ConnectionStats
+    _socket_options: Optional[list]
+    _ssl_context: Optional[ssl.SSLContext]
+
+    def __init__(self,
+                 pool_connections: int = DEFAULT_POOLSIZE,
+                 pool_maxsize: int = DEFAULT_POOLSIZE,
+                 tcp_keepalive: bool = True,
+                 ssl_context: ssl.SSLContext = None,
+                 connection_stats: ConnectionStats = None,
+                 **kwargs):
+        """
+        :param pool_connections: int - the number of hosts to keep a pool of connections for
+        :param pool_maxsize: int - the maximum number of connections kept per host
+        :param tcp_keepalive: bool - whether to send TCP keep-alive probes on idle connections
+        :param ssl_context: ssl.SSLContext - Optional, the context used for every TLS connection
+        :param connection_stats: ConnectionStats - Optional, where connections are counted
+        """
+        self._connection_stats = ConnectionStats() if connection_stats is None else connection_stats
+        self._socket_options = tcp_keepalive_socket_options() if tcp_keepalive else None
+        self._ssl_context = ssl_context
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, **kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self._socket_options is not None:
+            pool_kwargs['socket_options'] = self._socket_options
+        if self._ssl_context is not None:
+            pool_kwargs['ssl_context'] = self._ssl_context
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool_class(HTTPConnectionPool, self._connection_stats),
+            'https': _counting_pool_class(HTTPSConnectionPool, self._connection_stats)
+        }
+
+    def send(self, request, **kwargs):
+        self._connection_stats.record_request()
+        return super().send(request, **kwargs)
+
+    @property
+    def connection_stats(self) -> ConnectionStats:
+        return self._connection_stats
+
+
+def find_requests_session(web_session) -> Optional[requests.Session]:
+    """
+    The requests.Session used underneath an IWebSession, None when it cannot be found
+    """
+    if isinstance(web_session, requests.Session):
+        return web_session
+    for value in getattr(web_session, '__dict__', {}).values():
+        if isinstance(value, requests.Session):
+            return value
+    return None
+
+
+def configure_connection_pool(web_session,
+                              pool_connections: Optional[int] = None,
+                              pool_maxsize: Optional[int] = None,
+                              tcp_keepalive: bool = False,
+                              ssl_context: ssl.SSLContext = None) -> Optional[ConnectionStats]:
+    """
+    Mounts a PooledHTTPAdapter on the session when any option is given, keeping the retry policy of the adapter it
+    replaces.  The pool sizes which are not given are requests' own defaults.
+    :param web_session: IWebSession - the session created by WebSessionFactory
+    :param pool_connections: int - Optional, the number of hosts to keep a pool of connections for
+    :param pool_maxsize: int - Optional, the maximum number of connections kept per host
+    :param tcp_keepalive: bool - whether to send TCP keep-alive probes on idle connections
+    :param ssl_context: ssl.SSLContext - Optional, the context used for every TLS connection
+    :return: the ConnectionStats of the new adapter, None if no option was given or the session could not be tuned
+    """
+    if pool_connections is None and pool_maxsize is None and not tcp_keepalive and ssl_context is None:
+        return None
+
+    session = find_requests_session(web_session)
+    if session is None:
+        logger.warning(f"No requests.Session found in {type(web_session).__name__}, connection pool left untuned")
+        return None
+
+    connection_stats = ConnectionStats()
+    for prefix in ['https://', 'http://']:
+        existing_adapter = session.get_adapter(prefix)
+        adapter = PooledHTTPAdapter(pool_connections=pool_connections or DEFAULT_POOLSIZE,
+                                    pool_maxsize=pool_maxsize or DEFAULT_POOLSIZE,
+                                    tcp_keepalive=tcp_keepalive,
+                                    ssl_context=ssl_context if prefix == 'https://' else None,
+                                    connection_stats=connection_stats,
+                                    max_retries=getattr(existing_adapter, 'max_retries', 0))
+        session.mount(prefix, adapter)
+    return connection_stats
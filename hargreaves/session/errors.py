@@ -5,3 +5,9 @@ class SessionError(BaseException):
     def __init__(self, message: str, html: str = None):
         self.html = html
         super().__init__(message)
+
+
+class SessionPoolError(BaseException):
+
+    def __init__(self, message: str):
+        super().__init__(message)
@@ -0,0 +1,248 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from requests_tracker.storage import ICookieStorage
+
+from ..config.models import ApiConfiguration
+from ..session.errors import SessionPoolError
+from ..session.shared import LoggedInSession
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStats:
+    _profile: str
+    _created_at: float
+    _last_used: float
+    _lease_count: int
+    _login_count: int
+    _logins_avoided: int
+    _leased: bool
+
+    def __init__(self, profile: str, created_at: float, last_used: float, lease_count: int,
+                 login_count: int, logins_avoided: int, leased: bool):
+        """
+        :param profile: str - the credential profile the session belongs to
+        :param created_at: float - time.monotonic() value when the session was created
+        :param last_used: float - time.monotonic() value when the session was last returned to the pool
+        :param lease_count: int - how many times the session has been leased
+        :param login_count: int - how many logins the session has performed
+        :param logins_avoided: int - how many concurrent logins the session has coalesced
+        :param leased: bool - whether the session is currently leased
+        """
+        self._profile = profile
+        self._created_at = created_at
+        self._last_used = last_used
+        self._lease_count = lease_count
+        self._login_count = login_count
+        self._logins_avoided = logins_avoided
+        self._leased = leased
+
+    @property
+    def profile(self):
+        return self._profile
+
+    @property
+    def created_at(self):
+        return self._created_at
+
+    @property
+    def last_used(self):
+        return self._last_used
+
+    @property
+    def lease_count(self):
+        return self._lease_count
+
+    @property
+    def login_count(self):
+        return self._login_count
+
+    @property
+    def logins_avoided(self):
+        return self._logins_avoided
+
+    @property
+    def leased(self):
+        return self._leased
+
+    def __str__(self):
+        return f"""SessionStats[profile={self._profile}, lease_count={self._lease_count}, \
+login_count={self._login_count}, logins_avoided={self._logins_avoided}, leased={self._leased}]"""
+
+
+class _PooledSession:
+    def __init__(self, profile: str, web_session: LoggedInSession, cookies_storage: ICookieStorage, now: float):
+        self.profile = profile
+        self.web_session = web_session
+        self.cookies_storage = cookies_storage
+        self.created_at = now
+        self.last_used = now
+        self.lease_count = 0
+        self.leased = False
+
+
+class SessionPool:
+    """
+    Holds a bounded number of warm LoggedInSessions, one per credential profile.
+
+    A session is leased exclusively and returned to the pool afterwards, so that its cookies (and therefore its
+    login) are reused by the next piece of work for the same profile.  When the pool is full the least recently
+    used idle session is evicted to make room, and sessions idle for longer than idle_timeout_seconds are evicted
+    by evict_idle().  Cookies are saved to the profile's own storage whenever a session leaves the pool.
+    """
+    _configs: Dict[str, ApiConfiguration]
+    _sessions: Dict[str, _PooledSession]
+    _cookies_storage_factory: Callable[[str], ICookieStorage]
+    _session_factory: Optional[Callable[[ICookieStorage, ApiConfiguration], LoggedInSession]]
+    _max_sessions: int
+    _idle_timeout_seconds: float
+    _time: Callable[[], float]
+    _condition: threading.Condition
+
+    def __init__(self,
+                 cookies_storage_factory: Callable[[str], ICookieStorage],
+                 max_sessions: int = 8,
+                 idle_timeout_seconds: float = 600,
+                 session_factory: Callable[[ICookieStorage, ApiConfiguration], LoggedInSession] = None,
+                 time_source: Callable[[], float] = time.monotonic):
+        """
+        :param cookies_storage_factory: callable - returns the cookie storage for a profile
+        :param max_sessions: int - the maximum number of sessions held at once
+        :param idle_timeout_seconds: float - sessions unused for longer than this are evicted by evict_idle()
+        :param session_factory: callable - creates a session, hargreaves.session.create_session by default
+        :param time_source: callable - returns the current time.monotonic() value, useful in unit tests
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self._configs = {}
+        self._sessions = {}
+        self._cookies_storage_factory = cookies_storage_factory
+        self._session_factory = session_factory
+        self._max_sessions = max_sessions
+        self._idle_timeout_seconds = idle_timeout_seconds
+        self._time = time_source
+        self._condition = threading.Condition()
+
+    def register(self, profile: str, config: ApiConfiguration):
+        with self._condition:
+            self._configs[profile] = config
+
+    def lease(self, profile: str, timeout: Optional[float] = None) -> LoggedInSession:
+        """
+        Leases the profile's session, creating it if needed.  Blocks while the session is leased elsewhere
+        or while the pool is full of leased sessions.
+        :param profile: str - the registered credential profile
+        :param timeout: float - Optional, how long to wait for a session in seconds
+        :return: LoggedInSession
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            if profile not in self._configs:
+                raise SessionPoolError(f"Unknown profile '{profile}', register it first")
+
+            while True:
+                pooled_session = self._sessions.get(profile)
+                if pooled_session is not None and not pooled_session.leased:
+                    break
+                if pooled_session is None and (len(self._sessions) < self._max_sessions or self._evict_lru()):
+                    pooled_session = self._create(profile)
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise SessionPoolError(f"Timed out waiting for a session for profile '{profile}'")
+                self._condition.wait(remaining)
+
+            pooled_session.leased = True
+            pooled_session.lease_count += 1
+            return pooled_session.web_session
+
+    def release(self, profile: str):
+        with self._condition:
+            pooled_session = self._sessions.get(profile)
+            if pooled_session is None or not pooled_session.leased:
+                raise SessionPoolError(f"No session leased for profile '{profile}'")
+            pooled_session.leased = False
+            pooled_session.last_used = self._time()
+            self._condition.notify_all()
+
+    @contextmanager
+    def session(self, profile: str, timeout: Optional[float] = None):
+        web_session = self.lease(profile, timeout=timeout)
+        try:
+            yield web_session
+        finally:
+            self.release(profile)
+
+    def evict_idle(self) -> int:
+        """
+        Evicts the sessions which have not been used for idle_timeout_seconds
+        :return: the number of sessions evicted
+        """
+        with self._condition:
+            now = self._time()
+            idle_profiles = [profile for profile, pooled_session in self._sessions.items()
+                             if not pooled_session.leased
+                             and now - pooled_session.last_used >= self._idle_timeout_seconds]
+            for profile in idle_profiles:
+                self._evict(profile)
+            if idle_profiles:
+                self._condition.notify_all()
+            return len(idle_profiles)
+
+    def close(self):
+        """
+        Evicts every idle session, saving its cookies
+        """
+        with self._condition:
+            for profile in [profile for profile, pooled_session in self._sessions.items()
+                            if not pooled_session.leased]:
+                self._evict(profile)
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, SessionStats]:
+        with self._condition:
+            return {profile: SessionStats(profile=profile,
+                                          created_at=pooled_session.created_at,
+                                          last_used=pooled_session.last_used,
+                                          lease_count=pooled_session.lease_count,
+                                          login_count=pooled_session.web_session.login_count,
+                                          logins_avoided=pooled_session.web_session.logins_avoided,
+                                          leased=pooled_session.leased)
+                    for profile, pooled_session in self._sessions.items()}
+
+    def __len__(self):
+        with self._condition:
+            return len(self._sessions)
+
+    def _create(self, profile: str) -> _PooledSession:
+        logger.debug(f"Creating session for profile '{profile}' ...")
+        session_factory = self._session_factory
+        if session_factory is None:
+            from ..session import create_session
+            session_factory = create_session
+        cookies_storage = self._cookies_storage_factory(profile)
+        web_session = session_factory(cookies_storage, self._configs[profile])
+        pooled_session = _PooledSession(profile=profile, web_session=web_session,
+                                        cookies_storage=cookies_storage, now=self._time())
+        self._sessions[profile] = pooled_session
+        return pooled_session
+
+    def _evict_lru(self) -> bool:
+        idle_sessions = [pooled_session for pooled_session in self._sessions.values() if not pooled_session.leased]
+        if not idle_sessions:
+            return False
+        self._evict(min(idle_sessions, key=lambda pooled_session: pooled_session.last_used).profile)
+        return True
+
+    def _evict(self, profile: str):
+        logger.debug(f"Evicting session for profile '{profile}' ...")
+        pooled_session = self._sessions.pop(profile)
+        try:
+            pooled_session.cookies_storage.save(pooled_session.web_session.cookies)
+        except Exception as ex:
+            logger.warning(f"Unable to save cookies for profile '{profile}': {ex}")
+        pooled_session.web_session.close()
@@ -0,0 +1,133 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from ..session.shared import LoggedInSession
+from ..utils.cookies import HLCookieHelper
+
+logger = logging.getLogger(__name__)
+
+KEEPALIVE_URL = 'https://online.hl.co.uk/my-accounts'
+
+
+def default_keepalive(web_session: LoggedInSession):
+    # bypasses the response cache, a page served from it would not extend the session on HL
+    web_session.get_uncached(KEEPALIVE_URL)
+
+
+class SessionRefresher:
+    """
+    Keeps a LoggedInSession warm so that order requests never pay for a login.
+
+    The HL session times out after the "ot" seconds advertised in the hltimer cookie.  Once the session has been
+    idle for that long minus a safety margin, a cheap request is sent through the LoggedInSession: it either extends
+    the session, or - when the session has already gone - is bounced to the login page and logs in there and then.
+    The refresh only counts once the session's last_activity shows that the request reached HL.  A session which
+    has not sent a request yet is treated as active from the moment the refresher was created.
+
+    Use start()/stop() (or a with block) to run the checks on a daemon thread, or call refresh_if_due()
+    from your own scheduler.
+    """
+    _web_session: LoggedInSession
+    _keepalive: Callable[[LoggedInSession], None]
+    _margin_seconds: float
+    _check_interval_seconds: float
+    _time: Callable[[], float]
+    _created: float
+    _stop_event: threading.Event
+    _thread: Optional[threading.Thread]
+    _refresh_count: int
+    _failure_count: int
+
+    def __init__(self,
+                 web_session: LoggedInSession,
+                 keepalive: Callable[[LoggedInSession], None] = default_keepalive,
+                 margin_seconds: float = 180,
+                 check_interval_seconds: float = 30,
+                 time_source: Callable[[], float] = time.monotonic):
+        """
+        :param web_session: LoggedInSession - the session to keep alive
+        :param keepalive: callable - sends the request which keeps the session alive, GETs my-accounts by default
+        :param margin_seconds: float - how long before the timeout the session is refreshed
+        :param check_interval_seconds: float - how often the background thread checks the session
+        :param time_source: callable - returns the current time.monotonic() value, useful in unit tests
+        """
+        self._web_session = web_session
+        self._keepalive = keepalive
+        self._margin_seconds = margin_seconds
+        self._check_interval_seconds = check_interval_seconds
+        self._time = time_source
+        self._created = time_source()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._refresh_count = 0
+        self._failure_count = 0
+
+    def seconds_until_refresh(self) -> float:
+        last_activity = self._web_session.last_activity
+        if last_activity is None:
+            # nobody has used the session yet, there is nothing to keep alive until the full interval has passed
+            last_activity = self._created
+        timeout = HLCookieHelper.get_session_timeout(self._web_session.cookies)
+        idle = self._time() - last_activity
+        return max(0.0, timeout - self._margin_seconds - idle)
+
+    def refresh_if_due(self) -> bool:
+        """
+        Refreshes the session if it is close to timing out
+        :return: True if a refresh was attempted
+        """
+        if self.seconds_until_refresh() > 0:
+            return False
+
+        logger.debug("Session close to timing out, let's refresh it ...")
+        last_activity = self._web_session.last_activity
+        try:
+            self._keepalive(self._web_session)
+            if self._web_session.last_activity is None or self._web_session.last_activity == last_activity:
+                # e.g. answered from a cache, HL's timer was not reset so neither is the cookie
+                logger.warning("Session refresh did not reach HL")
+                return True
+            HLCookieHelper.refresh_hltimer_cookie(self._web_session.cookies)
+            self._refresh_count += 1
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except BaseException as ex:
+            # the SDK's errors derive from BaseException, a failed refresh must not stop the refresher
+            self._failure_count += 1
+            logger.warning(f"Unable to refresh session: {ex}")
+        return True
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='hl-session-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self._check_interval_seconds):
+            self.refresh_if_due()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def refresh_count(self) -> int:
+        return self._refresh_count
+
+    @property
+    def failure_count(self) -> int:
+        return self._failure_count
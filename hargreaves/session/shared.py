@@ -1,51 +1,275 @@
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from http.cookiejar import CookieJar
+from typing import Callable, Optional
 
 from requests import Response
 from requests_tracker.request import WebRequestType, RequestSessionContext
 from requests_tracker.session import IWebSession
 
-from ..authentication import AuthenticationClient
+from ..authentication.clients import AuthenticationClient
 from ..config.models import ApiConfiguration
+from ..session.cache import ResponseCache
+from ..session.capture import RequestCapture
+from ..session.connections import ConnectionStats
+from ..utils import pacing
+from ..utils.pacing import IPacingPolicy
 
 logger = logging.getLogger(__name__)
 
 
+class LoginDeferred(BaseException):
+    """
+    Raised instead of logging in by a request sent within LoggedInSession.deferring_login(), so that the caller can
+    log in itself, e.g. AsyncLoggedInSession which pauses between the login steps without holding a thread
+    """
+    redirect_response: Response
+    login_generation: int
+
+    def __init__(self, redirect_response: Response, login_generation: int):
+        self.redirect_response = redirect_response
+        self.login_generation = login_generation
+        super().__init__("Redirected to the login page")
+
+
 class LoggedInSession(IWebSession):
+    """
+    Wraps a IWebSession and logs in whenever a request is redirected to the login page.
+
+    The session can be shared across threads: when several requests are bounced to the login page at the same
+    time only the first one logs in, the others wait for it and then replay their original request.
+    """
     _web_session: IWebSession
     _config: ApiConfiguration
+    _authentication_client: AuthenticationClient
+    _login_lock: threading.Lock
+    _login_generation: int
+    _deferred_login: threading.local
+    _login_count: int
+    _logins_avoided: int
+    _last_activity: Optional[float]
+    _pacing_policy: Optional[IPacingPolicy]
+    _connection_stats: Optional[ConnectionStats]
+    _response_cache: Optional[ResponseCache]
+    _request_capture: Optional[RequestCapture]
 
-    def __init__(self, web_session: IWebSession, config: ApiConfiguration):
+    def __init__(self, web_session: IWebSession, config: ApiConfiguration,
+                 authentication_client: AuthenticationClient = None, pacing_policy: IPacingPolicy = None,
+                 connection_stats: ConnectionStats = None, response_cache: ResponseCache = None,
+                 request_capture: RequestCapture = None):
         self._web_session = web_session
         self._config = config
+        self._authentication_client = AuthenticationClient() if authentication_client is None \
+            else authentication_client
+        self._login_lock = threading.Lock()
+        self._login_generation = 0
+        self._deferred_login = threading.local()
+        self._login_count = 0
+        self._logins_avoided = 0
+        self._last_activity = None
+        self._pacing_policy = pacing_policy
+        self._connection_stats = connection_stats
+        self._response_cache = response_cache
+        self._request_capture = request_capture
 
     def get(self, url: str, request_type: WebRequestType = WebRequestType.Document,
             params=None, headers=None) -> Response:
-        response = self._web_session.get(url=url, request_type=request_type, params=params, headers=headers)
+        if self._response_cache is None:
+            return self._get(url=url, request_type=request_type, params=params, headers=headers)
+        return self._response_cache.get(
+            url, params,
+            send=lambda: self._get(url=url, request_type=request_type, params=params, headers=headers),
+            send_context=lambda context_url: self._get(url=context_url))
+
+    def get_uncached(self, url: str, request_type: WebRequestType = WebRequestType.Document,
+                     params=None, headers=None) -> Response:
+        """
+        GETs the page from HL even when the response cache holds it, e.g. to keep the session alive
+        """
+        return self._get(url=url, request_type=request_type, params=params, headers=headers)
+
+    def _get(self, url: str, request_type: WebRequestType = WebRequestType.Document,
+             params=None, headers=None) -> Response:
+        def send():
+            return self._web_session.get(url=url, request_type=request_type, params=params, headers=headers)
+
+        login_generation = self._login_generation
+        response = send()
         if response.url != AuthenticationClient.LOGIN_URL:
+            self._last_activity = time.monotonic()
+            self._observe(url, response)
             return response
-        logger.debug("Redirected to login page, let's login ...")
-        logged_in_response = AuthenticationClient().login(self._web_session, self._config, response)
-        if logged_in_response.url == url:
-            return logged_in_response
-        else:
-            logger.debug(f"Unexpected post-login-redirect URL ({logged_in_response.url}), "
-                         f"let's GET original URL '{url}'")
-            return self._web_session.get(url=url, request_type=request_type, params=params, headers=headers)
+        return self._observe(url, self._login_and_replay(response, login_generation, url, send, 'GET'))
 
     def post(self, url: str, request_type: WebRequestType = WebRequestType.Document,
              data=None, headers=None) -> Response:
-        response = self._web_session.post(url=url, request_type=request_type, data=data, headers=headers)
+        def send():
+            return self._web_session.post(url=url, request_type=request_type, data=data, headers=headers)
+
+        try:
+            return self._post(url, send)
+        finally:
+            if self._response_cache is not None:
+                # after the POST, so that pages fetched while it was in flight are dropped too
+                self._response_cache.observe_post(url)
+
+    def _post(self, url: str, send: Callable[[], Response]) -> Response:
+        login_generation = self._login_generation
+        response = send()
         if response.url != AuthenticationClient.LOGIN_URL:
+            self._last_activity = time.monotonic()
+            self._observe(url, response)
             return response
-        logger.debug("Redirected to login page, let's login ...")
-        logged_in_response = AuthenticationClient().login(self._web_session, self._config, response)
-        if logged_in_response.url == url:
+        return self._observe(url, self._login_and_replay(response, login_generation, url, send, 'POST'))
+
+    def _login_and_replay(self, redirect_response: Response, login_generation: int, url: str,
+                          send: Callable[[], Response], method: str) -> Response:
+        with self._login_lock:
+            logged_in_concurrently = self._login_generation != login_generation
+            if logged_in_concurrently:
+                self._logins_avoided += 1
+            elif getattr(self._deferred_login, 'active', False):
+                raise LoginDeferred(redirect_response, login_generation)
+            else:
+                logger.debug("Redirected to login page, let's login ...")
+                logged_in_response = self._authentication_client.login(self._web_session, self._config,
+                                                                       redirect_response)
+                self._login_generation += 1
+                self._login_count += 1
+                self._last_activity = time.monotonic()
+
+        # replayed outside the lock, so that a slow replay does not hold up the other requests nor a later login
+        if logged_in_concurrently:
+            # another request logged in while this one was in flight, so its cookies are already valid
+            logger.debug(f"Login already performed by a concurrent request, let's {method} original URL '{url}'")
+        elif logged_in_response.url == url:
             return logged_in_response
         else:
             logger.debug(f"Unexpected post-login-redirect URL ({logged_in_response.url}), "
-                         f"let's POST original URL '{url}'")
-            return self._web_session.post(url=url, request_type=request_type, data=data, headers=headers)
+                         f"let's {method} original URL '{url}'")
+
+        response = send()
+        if response.url != AuthenticationClient.LOGIN_URL:
+            self._last_activity = time.monotonic()
+        return response
+
+    @contextmanager
+    def deferring_login(self):
+        """
+        Within this block, a request of the current thread which is bounced to the login page raises LoginDeferred
+        rather than logging in, unless another request has logged in meanwhile
+        """
+        deferring = getattr(self._deferred_login, 'active', False)
+        self._deferred_login.active = True
+        try:
+            yield
+        finally:
+            self._deferred_login.active = deferring
+
+    def record_login(self):
+        """
+        Records a login performed by the caller after a LoginDeferred
+        """
+        with self._login_lock:
+            self._login_generation += 1
+            self._login_count += 1
+            self._last_activity = time.monotonic()
+
+    def record_login_avoided(self):
+        """
+        Records a LoginDeferred which found that another request had logged in meanwhile
+        """
+        with self._login_lock:
+            self._logins_avoided += 1
+
+    def _observe(self, url: str, response: Response) -> Response:
+        # the session's own policy or the process-wide one, whichever the clients pause with
+        pacing.policy_for(self).observe(url, response)
+        if self._request_capture is not None:
+            self._request_capture.record(response, self._web_session.request_session_context)
+        return response
+
+    def close(self):
+        """
+        Closes the HAR file streamed by the request capture, if any
+        """
+        if self._request_capture is not None:
+            self._request_capture.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def pacing_policy(self) -> Optional[IPacingPolicy]:
+        """
+        The pacing policy used by the clients for this session, None to use the process-wide default
+        """
+        return self._pacing_policy
+
+    @property
+    def request_capture(self) -> Optional[RequestCapture]:
+        """
+        The requests captured by this session, None when requests_tracker keeps them all
+        """
+        return self._request_capture
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """
+        The cache of idempotent GET responses, None when caching is off
+        """
+        return self._response_cache
+
+    @property
+    def connection_stats(self) -> Optional[ConnectionStats]:
+        """
+        The connections opened versus reused by this session, None when the connection pool was not tuned
+        """
+        return self._connection_stats
+
+    @property
+    def last_activity(self) -> Optional[float]:
+        """
+        The time.monotonic() value of the last request which reached HL while logged in, None before the first one
+        """
+        return self._last_activity
+
+    @property
+    def web_session(self) -> IWebSession:
+        """
+        The wrapped session, which sends the requests without logging in
+        """
+        return self._web_session
+
+    @property
+    def config(self) -> ApiConfiguration:
+        return self._config
+
+    @property
+    def login_generation(self) -> int:
+        """
+        Incremented by every login, so that a request bounced to the login page can tell whether it still needs one
+        """
+        return self._login_generation
+
+    @property
+    def login_count(self) -> int:
+        """
+        The number of logins performed by this session
+        """
+        return self._login_count
+
+    @property
+    def logins_avoided(self) -> int:
+        """
+        The number of requests which were bounced to the login page but reused a concurrent login
+        """
+        return self._logins_avoided
 
     @property
     def cookies(self) -> CookieJar:
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import logging
 from random import randint
@@ -16,6 +17,15 @@ class IClock:
     def sleep(self, minimum: int = 1, maximum: int = 2):
         pass
 
+    async def sleep_async(self, minimum: int = 1, maximum: int = 2):
+        pass
+
+    def pause(self, seconds: float):
+        pass
+
+    async def pause_async(self, seconds: float):
+        pass
+
 
 class Clock(IClock):
 
@@ -34,6 +44,19 @@ class Clock(IClock):
         logger.debug(f"Pausing for {sleep_time} seconds ...")
         sleep(sleep_time)
 
+    async def sleep_async(self, minimum: int = 1, maximum: int = 2):
+        sleep_time = randint(minimum, maximum)
+        logger.debug(f"Pausing (async) for {sleep_time} seconds ...")
+        await asyncio.sleep(sleep_time)
+
+    def pause(self, seconds: float):
+        logger.debug(f"Pausing for {seconds:.3f} seconds ...")
+        sleep(seconds)
+
+    async def pause_async(self, seconds: float):
+        logger.debug(f"Pausing (async) for {seconds:.3f} seconds ...")
+        await asyncio.sleep(seconds)
+
 
 class MockClock(IClock):
     """
@@ -55,6 +78,16 @@ class MockClock(IClock):
         sleep_time = randint(minimum, maximum)
         logger.debug(f"Mock Pausing for {sleep_time} seconds ...")
 
+    async def sleep_async(self, minimum: int = 1, maximum: int = 2):
+        sleep_time = randint(minimum, maximum)
+        logger.debug(f"Mock Pausing (async) for {sleep_time} seconds ...")
+
+    def pause(self, seconds: float):
+        logger.debug(f"Mock Pausing for {seconds:.3f} seconds ...")
+
+    async def pause_async(self, seconds: float):
+        logger.debug(f"Mock Pausing (async) for {seconds:.3f} seconds ...")
+
 
 class ClockManager:
     _instance: IClock
@@ -76,6 +109,18 @@ def sleep_random(minimum: int = 1, maximum: int = 2):
     return manager.get_instance().sleep(minimum=minimum, maximum=maximum)
 
 
+async def sleep_random_async(minimum: int = 1, maximum: int = 2):
+    return await manager.get_instance().sleep_async(minimum=minimum, maximum=maximum)
+
+
+def pause(seconds: float):
+    return manager.get_instance().pause(seconds)
+
+
+async def pause_async(seconds: float):
+    return await manager.get_instance().pause_async(seconds)
+
+
 def get_current_time_as_epoch_time(offset_minutes: int = 0, offset_seconds: int = 0) -> int:
     clock = manager.get_instance()
     relative_time = (clock.get_current_time() + datetime.timedelta(minutes=offset_minutes, seconds=offset_seconds))
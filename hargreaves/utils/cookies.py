@@ -4,6 +4,8 @@ from random import randint
 from requests import cookies
 from ..utils import clock
 
+DEFAULT_SESSION_TIMEOUT_SECONDS = 900
+
 
 class HLCookieHelper:
     @staticmethod
@@ -54,6 +56,20 @@ class HLCookieHelper:
         return cookies.create_cookie(domain=".hl.co.uk", name="hltimer",
                                      value=encoded_value, path='/')
 
+    @staticmethod
+    def get_session_timeout(cookie_jar: CookieJar) -> int:
+        """
+        The online session timeout in seconds, as advertised by the hltimer cookie ("ot")
+        :return:
+        """
+        hltimer = HLCookieHelper.find_cookie(cookie_jar, "hltimer")
+        if hltimer is not None:
+            try:
+                return int(json.loads(hltimer.value)["ot"])
+            except (ValueError, KeyError, TypeError):
+                pass
+        return DEFAULT_SESSION_TIMEOUT_SECONDS
+
     @staticmethod
     def set_default_cookies(cookie_jar: CookieJar):
         cookie_jar.set_cookie(cookies.create_cookie(domain=".hl.co.uk", name="at_check", value="true", path='/'))
@@ -67,4 +83,12 @@ class HLCookieHelper:
     @staticmethod
     def set_logged_in_cookies(cookie_jar: CookieJar):
         cookie_jar.set_cookie(cookies.create_cookie(domain=".hl.co.uk", name="__mkt", value="1", path='/'))
+        HLCookieHelper.refresh_hltimer_cookie(cookie_jar)
+
+    @staticmethod
+    def refresh_hltimer_cookie(cookie_jar: CookieJar):
+        """
+        Moves the hltimer timeouts forward, as timeout.js does after activity in a logged-in window
+        :return:
+        """
         cookie_jar.set_cookie(HLCookieHelper.create_hltimer_cookie(is_logged_in=True))
@@ -0,0 +1,175 @@
+import collections
+import logging
+import threading
+from html.parser import HTMLParser
+from typing import Dict, Optional
+
+from .soup import decode, DEFAULT_ENCODING, Markup
+
+logger = logging.getLogger(__name__)
+
+FORM_NOT_FOUND = 'form_not_found'
+FORM_NOT_CLOSED = 'form_not_closed'
+INCOMPLETE_INPUT = 'incomplete_input'
+MALFORMED_HTML = 'malformed_html'
+
+
+class ExtractionStats:
+    """
+    Counts how often extract_hidden_inputs answered from its fast path, and why it fell back to BeautifulSoup
+    """
+    _hits: int
+    _fallbacks: collections.Counter
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._hits = 0
+        self._fallbacks = collections.Counter()
+        self._lock = threading.Lock()
+
+    def record_hit(self):
+        with self._lock:
+            self._hits += 1
+
+    def record_fallback(self, reason: str):
+        with self._lock:
+            self._fallbacks[reason] += 1
+
+    def reset(self):
+        with self._lock:
+            self._hits = 0
+            self._fallbacks.clear()
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def fallbacks(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._fallbacks)
+
+    @property
+    def hit_rate(self) -> float:
+        attempts = self._hits + sum(self._fallbacks.values())
+        return self._hits / attempts if attempts > 0 else 0.0
+
+    def __str__(self):
+        return f"ExtractionStats[hits={self._hits}, hit_rate={self.hit_rate:.2f}, fallbacks={self.fallbacks}]"
+
+
+stats = ExtractionStats()
+
+
+class _FormComplete(Exception):
+    pass
+
+
+class HiddenInputExtractor(HTMLParser):
+    """
+    Collects the name and value of the <input type="hidden"> tags of one form while tokenizing the page, without
+    building a tree.  Tokenizing stops at the end of the form.
+    """
+    _form_id: str
+    _in_form: bool
+    _complete: bool
+    _inputs: Dict[str, str]
+    _fallback_reason: Optional[str]
+
+    def __init__(self, form_id: str):
+        super().__init__(convert_charrefs=True)
+        self._form_id = form_id
+        self._in_form = False
+        self._complete = False
+        self._inputs = {}
+        self._fallback_reason = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'form':
+            if self._in_form:
+                # forms cannot be nested, leave it to the DOM parser to recover
+                self._fail(MALFORMED_HTML)
+            if dict(attrs).get('id') == self._form_id:
+                self._in_form = True
+        elif tag == 'input' and self._in_form:
+            input_attrs = dict(attrs)
+            if input_attrs.get('type') != 'hidden':
+                return
+            if input_attrs.get('name') is None or input_attrs.get('value') is None:
+                self._fail(INCOMPLETE_INPUT)
+            self._inputs[input_attrs['name']] = input_attrs['value']
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == 'form' and self._in_form:
+            self._complete = True
+            raise _FormComplete()
+
+    def _fail(self, reason: str):
+        self._fallback_reason = reason
+        raise _FormComplete()
+
+    def extract(self, markup: str) -> Optional[Dict[str, str]]:
+        """
+        :return: the hidden inputs by name, None when the page does not have the expected shape
+        """
+        try:
+            self.feed(markup)
+        except _FormComplete:
+            pass
+        except Exception as ex:
+            logger.debug(f"Could not tokenize the page: {ex}")
+            self._fallback_reason = MALFORMED_HTML
+
+        if self._fallback_reason is None and not self._complete:
+            self._fallback_reason = FORM_NOT_CLOSED if self._in_form else FORM_NOT_FOUND
+        return None if self._fallback_reason is not None else self._inputs
+
+    @property
+    def fallback_reason(self) -> Optional[str]:
+        return self._fallback_reason
+
+
+def _form_markup(markup: Markup, form_id: str, encoding: str = None) -> Optional[Markup]:
+    """
+    The markup from the <form> tag with the id to the next </form>, so that the rest of the page is neither tokenized
+    nor, for bytes, decoded.  None when the id is not written as expected, the caller then falls back.
+    """
+    id_attribute, form_start, form_end = f'id="{form_id}"', '<form', '</form>'
+    if isinstance(markup, bytes):
+        encoding = encoding or DEFAULT_ENCODING
+        id_attribute, form_start, form_end = (text.encode(encoding) for text in (id_attribute, form_start, form_end))
+
+    id_index = markup.find(id_attribute)
+    if id_index < 0:
+        return None
+    start = markup.rfind(form_start, 0, id_index)
+    if start < 0:
+        return None
+    end = markup.find(form_end, id_index)
+    return markup[start:] if end < 0 else markup[start:end + len(form_end)]
+
+
+def extract_hidden_inputs(markup: Markup, form_id: str, encoding: str = None) -> Optional[Dict[str, str]]:
+    """
+    The fast path of the order entry parsers, see HiddenInputExtractor
+    :param markup: str or bytes - the HTML of the page
+    :param form_id: str - the id of the form
+    :param encoding: str - Optional, the encoding of bytes markup, UTF-8 by default
+    :return: the hidden inputs by name, None when the caller should fall back to BeautifulSoup
+    """
+    form_markup = _form_markup(markup, form_id, encoding)
+    if form_markup is None:
+        inputs, fallback_reason = None, FORM_NOT_FOUND
+    else:
+        extractor = HiddenInputExtractor(form_id)
+        inputs, fallback_reason = extractor.extract(decode(form_markup, encoding)), extractor.fallback_reason
+
+    if inputs is None:
+        logger.debug(f"Falling back to BeautifulSoup for form '{form_id}': {fallback_reason}")
+        stats.record_fallback(fallback_reason)
+    else:
+        stats.record_hit()
+    return inputs
@@ -0,0 +1,33 @@
+import json
+from typing import Union
+
+try:
+    import orjson  # optional, 'pip install orjson'
+except ImportError:
+    orjson = None
+
+
+def json_backend() -> str:
+    """
+    :return: the name of the module decoding JSON, orjson when it is installed
+    """
+    return 'json' if orjson is None else 'orjson'
+
+
+def parse_jsonp(jsonp: Union[str, bytes]):
+    """
+    Decodes the JSON wrapped in a JSONP callback, i.e. callback({...}).  orjson reads the bytes in place, without
+    copying the JSON out of the response first.
+    :param jsonp: str or bytes - the JSONP response
+    :return: the decoded JSON
+    """
+    open_bracket = '(' if isinstance(jsonp, str) else b'('
+    close_bracket = ')' if isinstance(jsonp, str) else b')'
+    start = jsonp.index(open_bracket) + 1
+    end = jsonp.rindex(close_bracket)
+    if end < start:
+        raise ValueError("JSONP callback is not closed")
+
+    if orjson is not None:
+        return orjson.loads(memoryview(jsonp)[start:end] if isinstance(jsonp, bytes) else jsonp[start:end])
+    return json.loads(jsonp[start:end])
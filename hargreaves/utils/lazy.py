@@ -0,0 +1,26 @@
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_attributes(package_name: str, attributes: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """
+    Creates the module level __getattr__ and __dir__ (PEP 562) of a package, so that its clients - and with them
+    BeautifulSoup, requests and requests_tracker - are only imported when first used.
+    :param package_name: str - the __name__ of the package
+    :param attributes: dict - maps each lazy attribute to the module defining it, relative to the package
+    :return: the __getattr__ and __dir__ functions
+    """
+
+    def __getattr__(name: str):
+        module_name = attributes.get(name)
+        if module_name is None:
+            raise AttributeError(f"module '{package_name}' has no attribute '{name}'")
+        value = getattr(importlib.import_module(module_name, package_name), name)
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package_name])) | set(attributes))
+
+    return __getattr__, __dir__
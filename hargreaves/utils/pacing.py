@@ -0,0 +1,228 @@
+import asyncio
+import http
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from random import randint
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from ..utils import clock
+
+if TYPE_CHECKING:
+    from requests import Response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = 'online.hl.co.uk'
+PUSHBACK_STATUS_CODES = (http.HTTPStatus.TOO_MANY_REQUESTS, http.HTTPStatus.SERVICE_UNAVAILABLE)
+
+# the lock taken around each pause by the requests of one batch (see spaced_pauses)
+_pause_lock = ContextVar('pause_lock', default=None)
+
+
+class IPacingPolicy:
+    """
+    Decides how long to wait before each request sent to HL
+    """
+
+    def delay(self, url: Optional[str] = None) -> float:
+        """
+        :param url: str - Optional, the URL about to be requested, defaults to HL's online host
+        :return: the number of seconds to wait before sending the request
+        """
+        pass
+
+    def observe(self, url: str, response: 'Response'):
+        """
+        Feedback from every response, so that a policy can react when HL pushes back
+        """
+        pass
+
+
+class NoPacing(IPacingPolicy):
+
+    def delay(self, url: Optional[str] = None) -> float:
+        return 0
+
+    def observe(self, url: str, response: 'Response'):
+        pass
+
+
+class FixedPacing(IPacingPolicy):
+    """
+    Waits a random whole number of seconds between minimum and maximum - the historic behaviour of the SDK
+    """
+    _minimum: int
+    _maximum: int
+
+    def __init__(self, minimum: int = 1, maximum: int = 2):
+        self._minimum = minimum
+        self._maximum = maximum
+
+    def delay(self, url: Optional[str] = None) -> float:
+        return randint(self._minimum, self._maximum)
+
+    def observe(self, url: str, response: 'Response'):
+        pass
+
+
+class TokenBucketPacing(IPacingPolicy):
+    """
+    Allows bursts of up to `burst` requests per host, refilled at `rate` requests per second
+    """
+    _rate: float
+    _burst: float
+    _time: Callable[[], float]
+    _buckets: Dict[str, Tuple[float, float]]
+    _lock: threading.Lock
+
+    def __init__(self, rate: float = 1.0, burst: int = 3, time_source: Callable[[], float] = time.monotonic):
+        """
+        :param rate: float - the number of requests per second allowed on average
+        :param burst: int - the number of requests which can be sent without waiting
+        :param time_source: callable - returns the current time.monotonic() value, useful in unit tests
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._rate = rate
+        self._burst = burst
+        self._time = time_source
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def delay(self, url: Optional[str] = None) -> float:
+        host = urlparse(url).netloc if url else DEFAULT_HOST
+        with self._lock:
+            now = self._time()
+            tokens, updated = self._buckets.get(host, (self._burst, now))
+            tokens = min(self._burst, tokens + (now - updated) * self._rate) - 1
+            # the token is reserved straight away, so concurrent callers queue up behind each other
+            self._buckets[host] = (tokens, now)
+        return 0 if tokens >= 0 else -tokens / self._rate
+
+    def observe(self, url: str, response: 'Response'):
+        pass
+
+
+class AdaptivePacing(IPacingPolicy):
+    """
+    Sends requests with minimum_delay between them until HL pushes back (HTTP 429/503), then backs off
+    exponentially - or as long as Retry-After asks - and recovers gradually once requests succeed again.
+    """
+    _minimum_delay: float
+    _maximum_delay: float
+    _initial_backoff: float
+    _backoff_factor: float
+    _recovery_factor: float
+    _current_delay: float
+    _lock: threading.Lock
+
+    def __init__(self, minimum_delay: float = 0, maximum_delay: float = 30, initial_backoff: float = 1,
+                 backoff_factor: float = 2, recovery_factor: float = 0.5):
+        """
+        :param minimum_delay: float - the delay in seconds while HL is happy
+        :param maximum_delay: float - the upper bound of the delay in seconds
+        :param initial_backoff: float - the delay in seconds after the first push back
+        :param backoff_factor: float - the delay is multiplied by this after each push back
+        :param recovery_factor: float - the delay is multiplied by this after each successful response
+        """
+        self._minimum_delay = minimum_delay
+        self._maximum_delay = maximum_delay
+        self._initial_backoff = initial_backoff
+        self._backoff_factor = backoff_factor
+        self._recovery_factor = recovery_factor
+        self._current_delay = minimum_delay
+        self._lock = threading.Lock()
+
+    def delay(self, url: Optional[str] = None) -> float:
+        return self._current_delay
+
+    def observe(self, url: str, response: 'Response'):
+        with self._lock:
+            if response.status_code in PUSHBACK_STATUS_CODES:
+                backoff = max(self._initial_backoff, self._current_delay * self._backoff_factor,
+                              _retry_after(response))
+                self._current_delay = min(self._maximum_delay, backoff)
+                logger.debug(f"HL pushed back (HTTP {response.status_code}), "
+                             f"pacing increased to {self._current_delay:.3f} seconds")
+            elif self._current_delay > self._minimum_delay:
+                recovered = self._current_delay * self._recovery_factor
+                # snap back to the minimum rather than creeping towards it with ever smaller pauses
+                self._current_delay = self._minimum_delay if recovered < self._initial_backoff / 4 \
+                    else max(self._minimum_delay, recovered)
+
+    @property
+    def current_delay(self) -> float:
+        return self._current_delay
+
+
+def _retry_after(response: 'Response') -> float:
+    try:
+        return float(response.headers.get('Retry-After', 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+class PacingManager:
+    _instance: IPacingPolicy
+
+    def __init__(self):
+        self._instance = FixedPacing()
+
+    def get_instance(self) -> IPacingPolicy:
+        return self._instance
+
+    def set_instance(self, pacing_policy: IPacingPolicy):
+        self._instance = pacing_policy
+
+
+manager = PacingManager()
+
+
+def policy_for(web_session) -> IPacingPolicy:
+    """
+    The session's own pacing policy (see create_session) or the process-wide default
+    """
+    pacing_policy = getattr(web_session, 'pacing_policy', None)
+    return manager.get_instance() if pacing_policy is None else pacing_policy
+
+
+@contextmanager
+def spaced_pauses(lock: Union[threading.Lock, asyncio.Lock]):
+    """
+    Takes turns at pausing with the other threads or tasks of a batch which share the lock, so that requests sent
+    concurrently (e.g. by resolve_securities) are spaced out as if sent one after the other, while their responses
+    are still awaited together.  Only the batch is affected: the pacing policy, and so every other session sharing
+    it, is unchanged.  Threads do not inherit the context, so each worker enters it; asyncio tasks inherit it from
+    the coroutine which creates them.
+    :param lock: threading.Lock for pause, asyncio.Lock for pause_async
+    """
+    token = _pause_lock.set(lock)
+    try:
+        yield
+    finally:
+        _pause_lock.reset(token)
+
+
+def pause(web_session, url: Optional[str] = None):
+    with _pause_lock.get() or nullcontext():
+        seconds = policy_for(web_session).delay(url)
+        if seconds > 0:
+            clock.pause(seconds)
+
+
+async def pause_async(web_session, url: Optional[str] = None):
+    lock = _pause_lock.get()
+    if lock is not None:
+        async with lock:
+            return await _pause_async(web_session, url)
+    await _pause_async(web_session, url)
+
+
+async def _pause_async(web_session, url: Optional[str] = None):
+    seconds = policy_for(web_session).delay(url)
+    if seconds > 0:
+        await clock.pause_async(seconds)
@@ -0,0 +1,192 @@
+import importlib.util
+import logging
+import re
+from enum import Enum
+from typing import Dict, List, Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+# A page as received, either the str of response.text or the bytes of response.content
+Markup = Union[str, bytes]
+
+# Used for bytes when no encoding is given, rather than detecting it
+DEFAULT_ENCODING = 'utf-8'
+
+
+class ParserBackend(Enum):
+    HTML_PARSER = 'html.parser'  # pure Python, always available
+    LXML = 'lxml'  # C based, requires 'pip install lxml'
+    HTML5LIB = 'html5lib'  # parses like a browser but slowest, requires 'pip install html5lib'
+
+
+_BACKEND_MODULES = {
+    ParserBackend.HTML_PARSER: 'html.parser',
+    ParserBackend.LXML: 'lxml',
+    ParserBackend.HTML5LIB: 'html5lib',
+}
+
+
+def is_available(parser: ParserBackend) -> bool:
+    return importlib.util.find_spec(_BACKEND_MODULES[parser]) is not None
+
+
+def available_backends() -> List[ParserBackend]:
+    return [parser for parser in ParserBackend if is_available(parser)]
+
+
+class ParserManager:
+    _instance: ParserBackend
+
+    def __init__(self):
+        self._instance = ParserBackend.HTML_PARSER
+
+    def get_instance(self) -> ParserBackend:
+        return self._instance
+
+    def set_instance(self, parser: Union[ParserBackend, str]):
+        parser = ParserBackend(parser)
+        if not is_available(parser):
+            raise ValueError(f"Parser backend '{parser.value}' is not installed")
+        self._instance = parser
+
+
+manager = ParserManager()
+
+
+class Fragment:
+    """
+    A part of an HL page needed by a parser, e.g. Fragment('form', id='oh_form').  A class is matched against each of
+    the element's classes, other attributes must be equal.
+    """
+    _name: str
+    _attrs: Dict[str, str]
+
+    def __init__(self, name: str, **attrs: str):
+        """
+        :param name: str - the tag name
+        :param attrs: the attributes which identify the element, use class_ for the class attribute
+        """
+        self._name = name
+        self._attrs = {key.rstrip('_'): value for key, value in attrs.items()}
+
+    def matches(self, name: str, attrs: Optional[dict]) -> bool:
+        if name != self._name:
+            return False
+        attrs = attrs or {}
+        for key, value in self._attrs.items():
+            actual_value = attrs.get(key)
+            if actual_value is None:
+                return False
+            if key == 'class':
+                classes = actual_value.split() if isinstance(actual_value, str) else actual_value
+                if value not in classes:
+                    return False
+            elif actual_value != value:
+                return False
+        return True
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def attrs(self) -> Dict[str, str]:
+        return self._attrs
+
+    def __str__(self):
+        return f"Fragment[name={self._name}, attrs={self._attrs}]"
+
+
+class FragmentStrainer(SoupStrainer):
+    """
+    Keeps only the subtrees rooted at one of the fragments, everything else on the page is discarded while parsing.
+    """
+    _fragments: List[Fragment]
+
+    def __init__(self, fragments: List[Fragment]):
+        super().__init__()
+        self._fragments = fragments
+
+    def allows(self, name: str, attrs: Optional[dict]) -> bool:
+        return any(fragment.matches(name, attrs) for fragment in self._fragments)
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        # beautifulsoup4 >= 4.13
+        return self.allows(name, attrs)
+
+    def allow_string_creation(self, string) -> bool:
+        # beautifulsoup4 >= 4.13
+        return False
+
+    def search_tag(self, markup_name=None, markup_attrs=None):
+        # beautifulsoup4 < 4.13
+        if hasattr(markup_name, 'attrs'):
+            markup_name, markup_attrs = markup_name.name, markup_name.attrs
+        return self.allows(markup_name, markup_attrs)
+
+    @property
+    def fragments(self) -> List[Fragment]:
+        return self._fragments
+
+    def __str__(self):
+        return f"FragmentStrainer[fragments={', '.join(str(fragment) for fragment in self._fragments)}]"
+
+
+def make_soup(markup: Markup, parser: Union[ParserBackend, str, None] = None,
+              fragments: List[Fragment] = None, encoding: str = None) -> BeautifulSoup:
+    """
+    Parses the HTML of an HL page
+    :param markup: str or bytes - the HTML
+    :param parser: ParserBackend - Optional, the backend used instead of the process-wide default
+    :param fragments: list - Optional, only these parts of the page are parsed.  html5lib always parses the whole page
+    :param encoding: str - Optional, the encoding of bytes markup, UTF-8 by default
+    :return: BeautifulSoup
+    """
+    backend = manager.get_instance() if parser is None else ParserBackend(parser)
+    kwargs = {}
+    if isinstance(markup, bytes):
+        # the encoding is known, so BeautifulSoup does not sniff for it, and lxml reads the bytes directly
+        kwargs['from_encoding'] = encoding or DEFAULT_ENCODING
+    if fragments is not None and backend != ParserBackend.HTML5LIB:
+        kwargs['parse_only'] = FragmentStrainer(fragments)
+    return BeautifulSoup(markup, backend.value, **kwargs)
+
+
+def decode(markup: Markup, encoding: str = None) -> str:
+    """
+    The text of a page, bytes are decoded like response.text would, but without detecting the encoding
+    :param markup: str or bytes - the page
+    :param encoding: str - Optional, the encoding of bytes markup, UTF-8 by default
+    :return: str
+    """
+    if isinstance(markup, str):
+        return markup
+    return markup.decode(encoding or DEFAULT_ENCODING, errors='replace')
+
+
+def find_all_text(pattern: str, markup: Markup, encoding: str = None) -> List[str]:
+    """
+    re.findall of a pattern with one group over a page, bytes are searched without decoding the page
+    :param pattern: str - the regular expression, which must be representable in the encoding
+    :param markup: str or bytes - the page
+    :param encoding: str - Optional, the encoding of bytes markup, UTF-8 by default
+    :return: the matched groups as str
+    """
+    if isinstance(markup, str):
+        return re.findall(pattern, markup)
+    encoding = encoding or DEFAULT_ENCODING
+    return [match.decode(encoding, errors='replace') for match in re.findall(pattern.encode(encoding), markup)]
+
+
+def use_fastest_parser() -> ParserBackend:
+    """
+    Makes lxml the process-wide default when it is installed
+    :return: the default parser backend
+    """
+    if is_available(ParserBackend.LXML):
+        manager.set_instance(ParserBackend.LXML)
+    else:
+        logger.debug("lxml is not installed, keeping the html.parser backend")
+    return manager.get_instance()
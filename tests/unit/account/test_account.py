@@ -1,7 +1,10 @@
+import sys
 from pathlib import Path
 import pytest
 
-from hargreaves.account.clients import *
+from hargreaves.account.models import AccountSummary
+from hargreaves.account.parsers.parsers import parse_account_detail, parse_account_list
+from hargreaves.account.columnar import holding_columns, holdings_to_numpy, holdings_to_arrow
 
 
 def test_parse_account_list():
@@ -44,3 +47,92 @@ def test_parse_account_detail():
     assert goog.cost_gbp == 75.5
     assert goog.gain_loss_gbp == 35.84
     assert goog.gain_loss_percentage == 47.47
+
+
+def test_parse_account_detail_sedol_lookup():
+    def holding_row(live_price_id: str, sedol: str) -> str:
+        return f"""<tr><td><span id="live_price_value_{live_price_id}"><span>1.00</span></span></td>
+<td><a href="https://online.hl.co.uk/my-accounts/security_deal/sedol/{sedol}" class="deal-button"></a></td></tr>"""
+
+    account_summary_html = '<table>' + holding_row('BPT-L', 'SEDOL01') + holding_row('BP-L', 'SEDOL02') + \
+                           holding_row('VOD', 'SEDOL03') + holding_row('RMAP-X', 'SEDOL04') + '</table>'
+    csv_header = 'Code,Stock,Units held,Price (pence),Value (£),Cost (£),Gain/loss (£),Gain/loss (%),'
+    account_summary_csv = '\n'.join(['Total value:,"100.00", , ,', csv_header] +
+                                    [f'"{ticker}","{ticker} plc","1","1","1","1","0","0"'
+                                     for ticker in ['BP', 'VOD', 'RMAP']] +
+                                    ['"","Totals","","","3","3","0","0"'])
+
+    account_detail = parse_account_detail(account_summary_html, account_summary_csv,
+                                          AccountSummary(account_id=55, account_type="SIPP"))
+
+    assert [investment.sedol_code for investment in account_detail.investments] == ['SEDOL02', 'SEDOL03', 'SEDOL04']
+
+    with pytest.raises(ValueError, match=r"^Could not find the sedol code .* for stock symbol GSK"):
+        parse_account_detail(account_summary_html, account_summary_csv.replace('"VOD"', '"GSK"'),
+                             AccountSummary(account_id=55, account_type="SIPP"))
+
+
+def test_account_models_are_slotted_and_read_only():
+    account_summary_html = Path(Path(__file__).parent / 'files/account-summary.html').read_text()
+    account_summary_csv = Path(Path(__file__).parent / 'files/account-summary.csv').read_text()
+    account_summary = AccountSummary(account_id=55, account_type="SIPP")
+    account_detail = parse_account_detail(account_summary_html, account_summary_csv, account_summary)
+
+    for model in [account_summary, account_detail, account_detail.investments[0]]:
+        assert not hasattr(model, '__dict__')
+        with pytest.raises(AttributeError):
+            model.account_type = 'ISA'
+        with pytest.raises(AttributeError):
+            model.notes = 'cached'
+
+
+def _account_details() -> list:
+    account_summary_html = Path(Path(__file__).parent / 'files/account-summary.html').read_text()
+    account_summary_csv = Path(Path(__file__).parent / 'files/account-summary.csv').read_text()
+    return [parse_account_detail(account_summary_html, account_summary_csv,
+                                 AccountSummary(account_id=account_id, account_type="SIPP"))
+            for account_id in [55, 56]]
+
+
+def test_holding_columns():
+    account_details = _account_details()
+
+    columns = account_details[0].holding_columns()
+    assert list(columns) == ['account_id', 'stock_ticker', 'sedol_code', 'units', 'price_pence', 'value_gbp',
+                             'cost_gbp', 'gain_loss_gbp']
+    assert columns['account_id'] == [55, 55, 55]
+    assert columns['stock_ticker'][0] == 'GOOGL'
+    assert columns['sedol_code'][0] == 'BYVY8G0'
+    assert columns['value_gbp'][0] == 111.34
+
+    columns = holding_columns(account_details)
+    assert columns['account_id'] == [55, 55, 55, 56, 56, 56]
+    assert sum(columns['value_gbp']) == pytest.approx(2 * sum(columns['value_gbp'][:3]))
+
+
+def test_holdings_to_numpy():
+    numpy = pytest.importorskip('numpy')
+    holdings = holdings_to_numpy(_account_details())
+
+    assert holdings.shape == (6,)
+    assert holdings[0]['stock_ticker'] == 'GOOGL'
+    assert holdings['account_id'].dtype == numpy.int64
+    assert holdings['gain_loss_gbp'][0] == 35.84
+
+
+def test_holdings_to_arrow():
+    pytest.importorskip('pyarrow')
+    holdings = _account_details()[0].to_arrow()
+
+    assert holdings.num_rows == 3
+    assert holdings.column('sedol_code').to_pylist()[0] == 'BYVY8G0'
+
+
+def test_holdings_export_without_optional_dependency(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+
+    with pytest.raises(ImportError, match=r"pip install numpy"):
+        holdings_to_numpy(_account_details())
+    with pytest.raises(ImportError, match=r"pip install pyarrow"):
+        holdings_to_arrow(_account_details())
@@ -0,0 +1,269 @@
+import asyncio
+import http
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from pathlib import Path
+from urllib.parse import urlencode
+
+from hargreaves.aio.clients import AsyncSecuritySearchClient, AsyncPendingOrdersClient, AsyncSessionClient
+from hargreaves.aio.session import AsyncLoggedInSession, AsyncWebSession, shared_executor
+from hargreaves.authentication.clients import AuthenticationClient
+from hargreaves.config.models import ApiConfiguration
+from hargreaves.orders.pending.models import PendingOrder
+from hargreaves.session.shared import LoggedInSession
+from hargreaves.search.models import InvestmentTypes
+from hargreaves.utils import clock
+from hargreaves.utils.input import InputHelper
+from hargreaves.utils.logs import LogHelper
+from requests_tracker.mocks import MockWebSession
+from requests_tracker.session import IWebSession
+
+LogHelper.configure_std_out()
+clock.freeze_time()
+
+FILES_PATH = Path(__file__).parent.parent
+
+
+def test_async_investment_search():
+    search_results_found_jsonp = Path(FILES_PATH / 'search/files/search-results-found.jsonp').read_text()
+
+    with MockWebSession() as web_session:
+        web_session.mock_get(
+            url='https://online.hl.co.uk/ajaxx/stocks.php',
+            response_text=search_results_found_jsonp,
+            status_code=http.HTTPStatus.OK
+        )
+
+        async def search():
+            async with AsyncWebSession(web_session) as async_session:
+                return await AsyncSecuritySearchClient().investment_search(
+                    web_session=async_session,
+                    search_string='GOOG',
+                    investment_types=InvestmentTypes.ALL)
+
+        search_results = asyncio.run(search())
+
+        assert len(search_results) == 2
+        assert search_results[0].stock_ticker == 'GOOG'
+
+
+def test_async_resolve_securities():
+    search_results_found_jsonp = Path(FILES_PATH / 'search/files/search-results-found.jsonp').read_text()
+
+    with MockWebSession() as web_session:
+        web_session.mock_get(
+            url='https://online.hl.co.uk/ajaxx/stocks.php',
+            response_text=search_results_found_jsonp,
+            status_code=http.HTTPStatus.OK
+        )
+
+        async def resolve():
+            async with AsyncWebSession(web_session) as async_session:
+                return await AsyncSecuritySearchClient().resolve_securities(
+                    web_session=async_session, stock_tickers=['GOOG', 'googl', 'AAPL', 'goog'], max_concurrency=2)
+
+        resolved = asyncio.run(resolve())
+
+        assert list(resolved.results) == ['GOOG', 'GOOGL']
+        assert resolved.results['GOOGL'].sedol_code == 'BYVY8G0'
+        assert list(resolved.errors) == ['AAPL']
+
+
+def test_async_iter_investment_search():
+    offsets = []
+
+    class PagedSearchSession:
+        def get(self, url, request_type=None, params=None, headers=None):
+            offsets.append(params['offset'])
+            docs = [{'id': f'S{index:03d}', 'identifier': f'Fund {index}', 'internet_allowed': 'Y',
+                     'stock_ticker': f'F{index}', 'category': 'E'}
+                    for index in range(params['offset'], min(params['offset'] + 50, 75))]
+            response = {'response': {'numFound': 75, 'start': params['offset'], 'docs': docs}}
+
+            class Response:
+                content = f'search.handle_response({json.dumps(response)})'.encode('utf-8')
+
+            return Response()
+
+    async def search():
+        async with AsyncWebSession(PagedSearchSession()) as async_session:
+            return [search_result.sedol_code async for search_result in AsyncSecuritySearchClient()
+                    .iter_investment_search(web_session=async_session, search_string='fund',
+                                            investment_types=[InvestmentTypes.FUNDS], prefetch=True)]
+
+    assert asyncio.run(search()) == [f'S{index:03d}' for index in range(75)]
+    assert offsets == [0, 50]
+
+
+def test_async_session_keepalive():
+    with MockWebSession() as web_session:
+        web_session.mock_get(
+            url='https://online.hl.co.uk/ajaxx/user.php',
+            response_text='session_timeout_handler(["keptalive"])',
+            status_code=http.HTTPStatus.OK
+        )
+
+        async def keepalive():
+            async with AsyncWebSession(web_session) as async_session:
+                await AsyncSessionClient().session_keepalive(
+                    web_session=async_session, sedol_code='A12345', session_hl_vt='460029272')
+
+        asyncio.run(keepalive())
+
+
+def test_async_pending_orders_concurrently():
+    pending_orders_html = Path(FILES_PATH / 'orders/pending/files/pending-orders-2.html').read_text()
+
+    with MockWebSession() as web_session:
+        for account_id in [70, 71, 72]:
+            web_session.mock_get(
+                url=f'https://online.hl.co.uk/my-accounts/pending_orders/account/{account_id}',
+                response_text=pending_orders_html,
+                status_code=http.HTTPStatus.OK
+            )
+
+        async def get_all():
+            client = AsyncPendingOrdersClient()
+            async with AsyncWebSession(web_session) as async_session:
+                return await asyncio.gather(*[
+                    client.get_pending_orders(web_session=async_session, account_id=account_id)
+                    for account_id in [70, 71, 72]])
+
+        results = asyncio.run(get_all())
+
+        assert [len(pending_orders) for pending_orders in results] == [2, 2, 2]
+        assert [pending_orders[0].account_id for pending_orders in results] == [70, 71, 72]
+
+
+def test_async_cancel_pending_order():
+    confirm_html = Path(FILES_PATH / 'orders/pending/files/pending-order-cancel-1-out-of-2-confirmation.html') \
+        .read_text()
+
+    pending_orders = [
+        PendingOrder(
+            account_id=70,
+            order_id=151813973,
+            order_date=InputHelper.parse_date('23/03/2022'),
+            trade_type='B',
+            sedol_code='BGMG7B7',
+            stock_title='Bitfarms Ltd',
+            quantity=100,
+            qty_is_money=False,
+            limit_price=None,
+            status='Pending'
+        )]
+
+    with MockWebSession() as web_session:
+        mock = web_session.mock_post(
+            url='https://online.hl.co.uk/my-accounts/pending_orders',
+            response_text=confirm_html,
+            status_code=http.HTTPStatus.OK
+        )
+
+        async def cancel():
+            async with AsyncWebSession(web_session) as async_session:
+                return await AsyncPendingOrdersClient().cancel_pending_order(
+                    web_session=async_session, cancel_order_id=151813973, pending_orders=pending_orders)
+
+        assert asyncio.run(cancel()) is True
+        assert mock.request_history[0].text == urlencode({
+            "action": "cancel",
+            "bref": "151813973",
+            "151813973_trade_type[]": "B",
+            "151813973_sedol[]": "BGMG7B7",
+            "151813973_stoktitle[]": "Bitfarms Ltd",
+            "151813973_quantity[]": "100",
+            "151813973_qty_is_money[]": "0",
+            "cancel": "cancel"
+        })
+
+
+def test_sessions_share_one_executor():
+    with MockWebSession() as web_session:
+        sessions = [AsyncWebSession(web_session) for _ in range(3)]
+        assert {id(async_session._executor) for async_session in sessions} == {id(shared_executor())}
+        for async_session in sessions:
+            async_session.close()
+        # closing a session leaves the shared executor running
+        assert shared_executor().submit(lambda: 42).result() == 42
+
+
+class FakeResponse:
+    def __init__(self, url: str):
+        self.url = url
+
+
+class ExpiringWebSession(IWebSession):
+    """
+    Bounces every request to the login page until logged_in is set
+    """
+
+    def __init__(self):
+        self.logged_in = False
+        self.requests = []
+        self._cookies = CookieJar()
+
+    def get(self, url, request_type=None, params=None, headers=None):
+        self.requests.append(url)
+        return FakeResponse(url if self.logged_in else AuthenticationClient.LOGIN_URL)
+
+    def post(self, url, request_type=None, data=None, headers=None):
+        return self.get(url)
+
+    @property
+    def cookies(self):
+        return self._cookies
+
+
+class PausingAuthenticationClient:
+    """
+    Logs in after a pause, as AsyncAuthenticationClient pauses between the login steps
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.logged_in_at = None
+
+    async def login(self, web_session, config, redirect_response=None):
+        self.calls += 1
+        await asyncio.sleep(0.2)
+        web_session.web_session.logged_in = True
+        self.logged_in_at = time.perf_counter()
+        return FakeResponse('https://online.hl.co.uk/my-accounts')
+
+
+def test_async_login_does_not_hold_the_executor():
+    accounts_url = 'https://online.hl.co.uk/my-accounts'
+    expiring_session = ExpiringWebSession()
+    authentication_client = PausingAuthenticationClient()
+    logged_in_session = LoggedInSession(expiring_session, ApiConfiguration(
+        username='username', password='password', secure_number='123456', date_of_birth='010170'))
+
+    with MockWebSession() as other_session:
+        other_session.mock_get(url=accounts_url, response_text='other account', status_code=http.HTTPStatus.OK)
+
+        async def run():
+            # a single thread, which the login must not hold while it pauses
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                async_session = AsyncLoggedInSession(logged_in_session, executor=executor,
+                                                     authentication_client=authentication_client)
+                other_async_session = AsyncWebSession(other_session, executor=executor)
+
+                async def other_account():
+                    await asyncio.sleep(0.05)
+                    await other_async_session.get(accounts_url)
+                    return time.perf_counter()
+
+                return await asyncio.gather(other_account(),
+                                            *(async_session.get(accounts_url) for _ in range(3)))
+
+        other_finished, *responses = asyncio.run(run())
+
+    assert [response.url for response in responses] == [accounts_url] * 3
+    # the bounced requests share a single login, during which the other account is served
+    assert authentication_client.calls == 1
+    assert logged_in_session.login_count == 1
+    assert logged_in_session.logins_avoided == 2
+    assert other_finished < authentication_client.logged_in_at
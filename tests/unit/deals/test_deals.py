@@ -0,0 +1,110 @@
+import threading
+
+from hargreaves.account.clients import IAccountClient
+from hargreaves.account.models import AccountDetail, AccountSummary
+from hargreaves.deals.clients import DealClient
+from hargreaves.deals.errors import DealAccountNotFoundError
+from hargreaves.deals.models import DealRequest
+from hargreaves.orders.manual.clients import IManualOrderClient
+from hargreaves.orders.market.clients import IMarketOrderClient
+from hargreaves.orders.market.errors import MarketClosedError
+from hargreaves.orders.models import OrderPositionType
+from hargreaves.search.clients import SecuritySearchClient
+from hargreaves.search.errors import SearchFilterError
+from hargreaves.search.models import SearchResult
+
+
+class FakeAccountClient(IAccountClient):
+
+    def __init__(self):
+        self.calls = []
+
+    def get_account_summary(self, web_session):
+        self.calls.append('summary')
+        return [AccountSummary(account_id=70, account_type='SIPP'), AccountSummary(account_id=71, account_type='ISA')]
+
+    def get_account_detail(self, web_session, account_summary):
+        self.calls.append(account_summary.account_id)
+        return AccountDetail(account_id=account_summary.account_id, account_type=account_summary.account_type,
+                             stock_value=9000, total_cash=1000, amount_available=1000, total_value=10000,
+                             investments=[])
+
+
+class FakeSearchClient(SecuritySearchClient):
+    SECURITIES = {
+        'GOOG': [SearchResult('GOOG', 'Alphabet Inc NPV C', 'BYY88Y7', True, 'O'),
+                 SearchResult('GOOG', 'Alphabet Inc NPV C (LSE)', 'BZ0ZZ01', True, 'E')],
+        'PDG': [SearchResult('PDG', 'Pendragon Ord 5p', 'B1JQBT1', True, 'E')],
+        'VOD': [SearchResult('VOD', 'Vodafone Group Ord USD0.2095', 'BH4HKS3', True, 'E')]
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.searches = []
+        self.lock = threading.Lock()
+
+    def investment_search(self, web_session, search_string, investment_types):
+        with self.lock:
+            self.searches.append(search_string)
+        return self.SECURITIES.get(search_string, [])
+
+
+class FakeMarketOrderClient(IMarketOrderClient):
+
+    def __init__(self, closed_sedol_codes=()):
+        self.order_requests = []
+        self.closed_sedol_codes = closed_sedol_codes
+
+    def execute_order_flow(self, web_session, order_request):
+        if order_request.sedol_code in self.closed_sedol_codes:
+            raise MarketClosedError(can_place_fill_or_kill_order=True, can_place_limit_order=False)
+        self.order_requests.append(order_request)
+        return f"market {order_request.sedol_code}"
+
+
+class FakeManualOrderClient(IManualOrderClient):
+
+    def execute_order_flow(self, web_session, order_request):
+        return f"manual {order_request.sedol_code}"
+
+
+def deal(stock_ticker: str, position_type: OrderPositionType, account_id: int = 70, sedol_code: str = None):
+    return DealRequest(stock_ticker=stock_ticker, account_id=account_id, position_type=position_type,
+                       position_percentage=10, sedol_code=sedol_code)
+
+
+def test_execute_deals():
+    account_client, search_client = FakeAccountClient(), FakeSearchClient()
+    market_order_client = FakeMarketOrderClient(closed_sedol_codes=['BH4HKS3'])
+    deal_client = DealClient(account_client=account_client, search_client=search_client,
+                             market_order_client=market_order_client, manual_order_client=FakeManualOrderClient())
+
+    executions = deal_client.execute_deals(web_session=None, deal_requests=[
+        deal('GOOG', OrderPositionType.Buy, sedol_code='BYY88Y7'),
+        deal('VOD', OrderPositionType.Buy, account_id=71),
+        deal('PDG', OrderPositionType.Sell),
+        deal('GOOG', OrderPositionType.Sell),
+        deal('AAPL', OrderPositionType.Buy),
+        deal('PDG', OrderPositionType.Buy, account_id=99)
+    ])
+
+    # the account pages and the searches are loaded once, and the sells are placed first
+    assert account_client.calls == ['summary', 70, 71]
+    assert sorted(search_client.searches) == ['AAPL', 'GOOG', 'PDG', 'VOD']
+    assert [(execution.deal_request.stock_ticker, execution.deal_request.position_type)
+            for execution in executions] == [
+        ('PDG', OrderPositionType.Sell), ('GOOG', OrderPositionType.Sell), ('GOOG', OrderPositionType.Buy),
+        ('VOD', OrderPositionType.Buy), ('AAPL', OrderPositionType.Buy), ('PDG', OrderPositionType.Buy)]
+
+    assert [execution.succeeded for execution in executions] == [True, False, True, True, False, False]
+    assert executions[0].deal_result.order_result == 'market B1JQBT1'
+    # GOOG is ambiguous unless the deal narrows it down by SEDOL code
+    assert isinstance(executions[1].error, SearchFilterError)
+    assert executions[2].deal_result.order_request.account_value == 10000
+    assert executions[2].deal_result.order_result == 'market BYY88Y7'
+    assert executions[3].deal_result.order_result == 'manual BH4HKS3'
+    assert isinstance(executions[4].error, SearchFilterError)
+    assert isinstance(executions[5].error, DealAccountNotFoundError)
+    assert all(execution.seconds >= 0 for execution in executions)
+    assert [order_request.sedol_code for order_request in market_order_client.order_requests] == [
+        'B1JQBT1', 'BYY88Y7']
@@ -0,0 +1,62 @@
+import random
+import sys
+
+import pytest
+
+from hargreaves.orders.models import OrderAmountType, OrderPositionType, PositionCalculator
+
+
+def test_calculate():
+    assert PositionCalculator.calculate(OrderPositionType.Buy, 2.5, 10000.5, 0) == (OrderAmountType.Value, 250.01)
+    assert PositionCalculator.calculate(OrderPositionType.Sell, 50, 0, 25) == (OrderAmountType.Quantity, 12)
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_calculate_basket_rounds_like_calculate(monkeypatch, use_numpy: bool):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        # hargreaves.orders.models is shadowed by the star imports of hargreaves.orders
+        monkeypatch.setattr(sys.modules['hargreaves.orders.models'], '_numpy', lambda: None)
+
+    rnd = random.Random(7)
+    # half pennies and half units, which round to even
+    lines = [(OrderPositionType.Buy, 100, 2.675, 0), (OrderPositionType.Buy, 50, 0.25, 0),
+             (OrderPositionType.Sell, 50, 0, 5), (OrderPositionType.Sell, 50, 0, 7)]
+    lines += [(rnd.choice([OrderPositionType.Buy, OrderPositionType.Sell]), round(rnd.uniform(0, 100), 3),
+               round(rnd.uniform(0, 100000), 3), float(rnd.randint(0, 10000))) for _ in range(500)]
+
+    amount_types, quantities = PositionCalculator.calculate_basket(*zip(*lines))
+
+    expected = [PositionCalculator.calculate(*line) for line in lines]
+    assert amount_types == [amount_type for amount_type, _ in expected]
+    assert quantities == [quantity for _, quantity in expected]
+    assert [type(quantity) for quantity in quantities] == [type(quantity) for _, quantity in expected]
+
+
+def test_calculate_basket_lengths_must_match():
+    with pytest.raises(ValueError, match=r"differ in length"):
+        PositionCalculator.calculate_basket([OrderPositionType.Buy], [10, 20], [1000], [0])
+
+
+def test_calculate_basket_arrays(recwarn):
+    numpy = pytest.importorskip('numpy')
+
+    count = 100
+    position_types = [OrderPositionType.Buy, OrderPositionType.Sell] * (count // 2)
+    # a buy needs no units held, a sell no account value
+    account_values = [10000.5, None] * (count // 2)
+    units_held = [None, 240] * (count // 2)
+
+    buys, quantities = PositionCalculator.calculate_basket_arrays(position_types, [2.5] * count, account_values,
+                                                                  units_held)
+
+    assert buys.dtype == bool and quantities.dtype == numpy.float64
+    assert buys[:2].tolist() == [True, False]
+    assert quantities[:2].tolist() == [250.01, 6.0]
+    assert PositionCalculator.calculate_basket(position_types, [2.5] * count, account_values, units_held)[1][:2] \
+        == [250.01, 6]
+    assert len(recwarn) == 0
+
+    with pytest.raises(TypeError, match=r"^The units held of line 1 is None$"):
+        PositionCalculator.calculate_basket_arrays(position_types, [2.5] * count, account_values, [None] * count)
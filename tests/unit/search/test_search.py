@@ -1,12 +1,16 @@
 import http
+import itertools
+import json
 from pathlib import Path
 
 import pytest
 
 from hargreaves.search.clients import parse_search_results, SecuritySearchClient, security_filter
+from hargreaves.search.index import SecurityIndex
 from hargreaves.search.errors import SearchFilterError
-from hargreaves.search.models import InvestmentTypes, SearchResult, InvestmentCategoryTypes
-from hargreaves.utils import clock
+from hargreaves.search.models import InvestmentTypes, SearchResult, InvestmentCategoryTypes, SearchResults, \
+    SearchResultIndex
+from hargreaves.utils import clock, jsonp
 from hargreaves.utils.logs import LogHelper
 from requests_tracker.mocks import MockWebSession
 
@@ -136,6 +140,14 @@ def test_parse_search_results_found():
     assert goog.category == 'O'
 
 
+def test_parse_search_results_from_bytes():
+    search_results_found_jsonp = Path(Path(__file__).parent / 'files/search-results-found.jsonp').read_bytes()
+
+    search_results = parse_search_results(search_results_found_jsonp)
+
+    assert [search_result.sedol_code for search_result in search_results] == ['BYY88Y7', 'BYVY8G0']
+
+
 def test_parse_search_results_found_without_stock_ticker():
     search_results_found_jsonp = Path(Path(__file__).parent / 'files/search-results-found-without-stock-ticker.jsonp') \
         .read_text()
@@ -236,3 +248,196 @@ def test_security_filter_invalid_cases():
         security_filter(search_results=search_results, sedol_code='XXX')
     with pytest.raises(SearchFilterError, match='Could not find security, results filtered to 2'):
         security_filter(search_results=search_results, stock_ticker='2FB')
+
+
+def test_search_results_are_created_on_access():
+    search_results_found_jsonp = Path(Path(__file__).parent / 'files/search-results-found.jsonp').read_bytes()
+
+    search_results = parse_search_results(search_results_found_jsonp)
+
+    assert isinstance(search_results, SearchResults)
+    assert search_results._results == [None, None]
+    assert search_results[-1].sedol_code == 'BYVY8G0'
+    assert search_results[-1] is search_results[1]
+    assert search_results._results[0] is None
+    assert [search_result.stock_ticker for search_result in search_results[0:2]] == ['GOOG', 'GOOGL']
+
+
+def test_security_filter_on_raw_docs():
+    search_results = SearchResults([
+        {'id': 'B7TL820', 'identifier': 'Meta Platforms Inc Com USD0.000006', 'category': 'O', 'epic': 'FB',
+         'stock_ticker': 'FB', 'internet_allowed': 'Y'},
+        {'id': '0329028', 'identifier': 'FBD Holdings plc Ordinary EUR0.60', 'category': 'E', 'epic': 'FBH',
+         'internet_allowed': 'Y'},
+    ])
+
+    assert security_filter(search_results=search_results, stock_ticker='fbh').sedol_code == '0329028'
+    assert search_results._results == [None, None]
+    assert len(search_results.filter(sedol_code='b7tl820')) == 1
+
+    with pytest.raises(SearchFilterError, match='Could not find security, results filtered to 0'):
+        security_filter(search_results=search_results, stock_ticker='FB', sedol_code='0329028')
+
+
+def test_search_results_behave_as_a_list():
+    search_results = parse_search_results(Path(Path(__file__).parent / 'files/search-results-found.jsonp').read_text())
+    no_search_results = parse_search_results(
+        Path(Path(__file__).parent / 'files/search-results-not-found.jsonp').read_text())
+
+    assert isinstance(search_results, list)
+    assert search_results != []
+    assert no_search_results == []
+    assert json.dumps(no_search_results) == '[]'
+    assert [search_result.sedol_code for search_result in [] + search_results] == ['BYY88Y7', 'BYVY8G0']
+    assert len(search_results + search_results) == 4
+
+    # changing the list fills it, after which it is filtered on the results rather than the docs
+    search_results.append(SearchResult('FB', 'Meta Platforms Inc Com USD0.000006', 'B7TL820', True, 'O'))
+    assert [search_result.sedol_code for search_result in search_results] == ['BYY88Y7', 'BYVY8G0', 'B7TL820']
+    assert search_results.docs is None
+    assert security_filter(search_results=search_results, stock_ticker='fb').sedol_code == 'B7TL820'
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_parse_jsonp(monkeypatch, use_orjson: bool):
+    if use_orjson and jsonp.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr(jsonp, 'orjson', None)
+
+    assert jsonp.parse_jsonp(b'jsonp123({"docs": [{"id": "B7TL820"}]})') == {'docs': [{'id': 'B7TL820'}]}
+    assert jsonp.parse_jsonp('search.handle_response({"docs": []})\n') == {'docs': []}
+
+
+def test_resolve_securities():
+    search_results_found_jsonp = Path(Path(__file__).parent / 'files/search-results-found.jsonp').read_text()
+    security_index = SecurityIndex()
+
+    with MockWebSession() as web_session:
+        web_session.mock_get(
+            url='https://online.hl.co.uk/ajaxx/stocks.php',
+            response_text=search_results_found_jsonp,
+            status_code=http.HTTPStatus.OK
+        )
+
+        resolved = SecuritySearchClient(security_index=security_index).resolve_securities(
+            web_session=web_session, stock_tickers=['googl', 'AAPL', 'GOOG ', 'GOOGL', ''], max_concurrency=3)
+
+    assert list(resolved.results) == ['GOOGL', 'GOOG']
+    assert resolved.results['GOOGL'].sedol_code == 'BYVY8G0'
+    assert resolved.results['GOOG'].sedol_code == 'BYY88Y7'
+    # the mocked search does not find AAPL, which fails on its own
+    assert list(resolved.errors) == ['AAPL']
+    assert isinstance(resolved.errors['AAPL'], SearchFilterError)
+    # the results each ticker was filtered from are kept, to narrow them down further without searching again
+    assert list(resolved.search_results) == ['GOOGL', 'AAPL', 'GOOG']
+    assert 'BYY88Y7' in [search_result.sedol_code for search_result in resolved.search_results['GOOG']]
+
+    # both securities are now indexed, so no session is needed
+    resolved = SecuritySearchClient(security_index=security_index).resolve_securities(
+        web_session=None, stock_tickers=['GOOG', 'GOOGL'])
+    assert list(resolved.results) == ['GOOG', 'GOOGL']
+    assert resolved.errors == {}
+
+
+class PagedSearchSession:
+    """
+    Serves pages of page_size docs out of num_found, from the offset requested unless ignore_offset
+    """
+
+    def __init__(self, num_found: int, page_size: int = 50, ignore_offset: bool = False):
+        self.num_found = num_found
+        self.page_size = page_size
+        self.ignore_offset = ignore_offset
+        self.offsets = []
+
+    def get(self, url, request_type=None, params=None, headers=None):
+        self.offsets.append(params['offset'])
+        start = 0 if self.ignore_offset else params['offset']
+        docs = [{'id': f'S{index:06d}', 'identifier': f'Fund {index}', 'internet_allowed': 'Y',
+                 'stock_ticker': f'F{index}', 'category': 'E'}
+                for index in range(start, min(start + self.page_size, self.num_found))]
+        response = {'response': {'numFound': self.num_found, 'start': start, 'docs': docs}}
+
+        class Response:
+            content = f'search.handle_response({json.dumps(response)})'.encode('utf-8')
+
+        return Response()
+
+
+@pytest.mark.parametrize('prefetch', [False, True])
+def test_iter_investment_search_walks_every_page(prefetch: bool):
+    web_session = PagedSearchSession(num_found=120)
+
+    search_results = SecuritySearchClient().iter_investment_search(
+        web_session=web_session, search_string='fund', investment_types=[InvestmentTypes.FUNDS], prefetch=prefetch)
+
+    assert [search_result.sedol_code for search_result in search_results] == [f'S{index:06d}' for index in range(120)]
+    assert web_session.offsets == [0, 50, 100]
+
+
+def test_iter_investment_search_stops_early():
+    web_session = PagedSearchSession(num_found=1000)
+
+    search_results = SecuritySearchClient().iter_investment_search(
+        web_session=web_session, search_string='fund', investment_types=[InvestmentTypes.FUNDS], prefetch=True)
+    first_results = list(itertools.islice(search_results, 10))
+    search_results.close()
+
+    assert len(first_results) == 10
+    # the first page, and at most the prefetched second one
+    assert web_session.offsets[0] == 0 and len(web_session.offsets) <= 2
+
+
+def test_iter_investment_search_when_offset_is_ignored():
+    web_session = PagedSearchSession(num_found=120, ignore_offset=True)
+
+    search_results = list(SecuritySearchClient().iter_investment_search(
+        web_session=web_session, search_string='fund', investment_types=[InvestmentTypes.FUNDS]))
+
+    assert len(search_results) == 50
+    assert web_session.offsets == [0, 50]
+
+
+@pytest.mark.parametrize('from_docs', [False, True])
+def test_search_result_index(from_docs: bool):
+    search_results = [
+        SearchResultBuilder().with_overseas(stock_ticker='FB',
+                                            security_name='Meta Platforms Inc Com USD0.000006',
+                                            sedol_code='B7TL820').build(),
+        SearchResultBuilder().with_equity(stock_ticker='FBH',
+                                          security_name='FBD Holdings plc Ordinary EUR0.60',
+                                          sedol_code='0329028').build(),
+        SearchResultBuilder().with_equity(stock_ticker='2FB',
+                                          security_name='Leverage Shares Plc 2X Facebook ETP 03/04/67 GBP',
+                                          sedol_code='BYX84Z1').build(),
+        SearchResultBuilder().with_overseas(stock_ticker='2FB',
+                                            security_name='Dummy Duplicate',
+                                            sedol_code='123456').build()
+    ]
+    if from_docs:
+        search_results = SearchResults([{'id': search_result.sedol_code, 'identifier': search_result.security_name,
+                                         'internet_allowed': 'Y', 'stock_ticker': search_result.stock_ticker,
+                                         'category': search_result.category} for search_result in search_results])
+
+    search_result_index = SearchResultIndex(search_results)
+
+    assert search_result_index.filter(stock_ticker='fb').sedol_code == 'B7TL820'
+    assert security_filter(search_results=search_result_index, sedol_code='0329028').stock_ticker == 'FBH'
+    assert search_result_index.filter(stock_ticker='2fb', sedol_code='123456').security_name == 'Dummy Duplicate'
+    assert [search_result.sedol_code for search_result in search_result_index.find(stock_ticker='2FB')] == \
+           ['BYX84Z1', '123456']
+    assert [search_result.stock_ticker for search_result in
+            search_result_index.filter_many([('FB', None), (None, 'byx84z1'), ('FBH', '0329028')])] == \
+           ['FB', '2FB', 'FBH']
+
+    with pytest.raises(SearchFilterError, match='Could not find security, results filtered to 0'):
+        search_result_index.filter(stock_ticker='FB', sedol_code='XXX')
+    with pytest.raises(SearchFilterError, match='Could not find security, results filtered to 0'):
+        search_result_index.filter(stock_ticker='XXX')
+    with pytest.raises(SearchFilterError, match='Could not find security, results filtered to 2'):
+        search_result_index.filter(stock_ticker='2FB')
+    with pytest.raises(SearchFilterError, match='Could not find security, results filtered to 4'):
+        search_result_index.filter()
+    with pytest.raises(SearchFilterError, match='Could not find security, results filtered to 0'):
+        search_result_index.filter_many([('FB', None), ('XXX', None)])
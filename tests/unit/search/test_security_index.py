@@ -0,0 +1,97 @@
+import http
+from pathlib import Path
+
+import pytest
+
+from hargreaves.account.models import Investment
+from hargreaves.search import index
+from hargreaves.search.clients import parse_search_results, SecuritySearchClient, security_filter
+from hargreaves.search.index import SecurityIndex
+from hargreaves.search.models import IndexedSecurity, InvestmentTypes
+from hargreaves.utils import clock
+from requests_tracker.mocks import MockWebSession
+
+clock.freeze_time()
+
+SEARCH_RESULTS_FOUND_JSONP = Path(Path(__file__).parent / 'files/search-results-found.jsonp').read_text()
+
+
+def test_find_indexed_search_results():
+    security_index = SecurityIndex()
+    assert security_index.add_search_results(parse_search_results(SEARCH_RESULTS_FOUND_JSONP)) == 2
+
+    assert len(security_index) == 2
+    [goog] = security_index.find('goog')
+    assert goog.sedol_code == 'BYY88Y7'
+    assert goog.security_name == 'Alphabet Inc NPV C'
+    assert goog.category == 'O'
+    assert goog.internet_allowed
+    assert [security.stock_ticker for security in security_index.find('byvy8g0')] == ['GOOGL']
+    assert [security.sedol_code for security in security_index.lookup(stock_ticker='GOOGL')] == ['BYVY8G0']
+    assert security_index.lookup(stock_ticker='GOOGL', sedol_code='BYY88Y7') == []
+    assert [security.stock_ticker for security in security_index.search_name('alphabet inc')] == ['GOOGL', 'GOOG']
+    assert security_index.search_name('Alphabet_') == []
+
+    with pytest.raises(ValueError, match=r"^At least one identifier is required$"):
+        security_index.lookup()
+
+
+@pytest.mark.parametrize('upsert_supported', [True, False])
+def test_index_completes_known_securities(tmp_path, monkeypatch, upsert_supported: bool):
+    # SQLite older than 3.24 has no upsert, the index inserts and then updates instead
+    monkeypatch.setattr(index, 'UPSERT_SUPPORTED', upsert_supported)
+    path = str(tmp_path / 'securities.db')
+    security_index = SecurityIndex(path)
+    security_index.add_investments([Investment(stock_ticker='GOOGL', security_name='Alphabet Inc NPV A *R',
+                                               sedol_code='BYVY8G0', units_held=5, price_pence=2226.73,
+                                               value_gbp=111.34, cost_gbp=75.5, gain_loss_gbp=35.84,
+                                               gain_loss_percentage=47.47)])
+    security_index.add([IndexedSecurity(sedol_code='BYVY8G0', stock_ticker=None, epic_code=None,
+                                        isin_code='US02079K3059', security_name=None, category='O',
+                                        internet_allowed=True)])
+    security_index.close()
+
+    [googl] = SecurityIndex(path).find('US02079K3059')
+    assert googl.stock_ticker == 'GOOGL'
+    assert googl.security_name == 'Alphabet Inc NPV A *R'
+    assert googl.category == 'O'
+    assert googl.internet_allowed
+
+
+def test_search_answered_from_the_index():
+    security_index = SecurityIndex()
+    client = SecuritySearchClient(security_index=security_index)
+
+    with MockWebSession() as web_session:
+        web_session.mock_get(
+            url='https://online.hl.co.uk/ajaxx/stocks.php',
+            response_text=SEARCH_RESULTS_FOUND_JSONP,
+            status_code=http.HTTPStatus.OK
+        )
+        assert len(client.investment_search(web_session=web_session, search_string='GOOG',
+                                            investment_types=InvestmentTypes.ALL)) == 2
+
+    # no request is sent, so no session is needed
+    search_results = client.investment_search(web_session=None, search_string='googl',
+                                              investment_types=InvestmentTypes.ALL)
+    found_security = security_filter(search_results=search_results, stock_ticker='GOOGL')
+    assert found_security.sedol_code == 'BYVY8G0'
+    assert found_security.category == 'O'
+
+    # the investment types of a security are not indexed, nor are unknown identifiers
+    assert security_index.search_results('GOOGL', [InvestmentTypes.SHARES]) is None
+    assert security_index.search_results('AAPL', InvestmentTypes.ALL) is None
+
+
+def test_process_wide_index_is_fed_by_the_clients():
+    assert index.manager.get_instance() is None
+    index.record_search_results(parse_search_results(SEARCH_RESULTS_FOUND_JSONP))
+
+    security_index = SecurityIndex()
+    index.manager.set_instance(security_index)
+    try:
+        index.record_search_results(parse_search_results(SEARCH_RESULTS_FOUND_JSONP))
+        assert len(security_index) == 2
+        assert index.indexed_search_results('GOOG', InvestmentTypes.ALL)[0].sedol_code == 'BYY88Y7'
+    finally:
+        index.manager.set_instance(None)
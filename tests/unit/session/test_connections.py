@@ -0,0 +1,88 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+
+from hargreaves.session.connections import configure_connection_pool, PooledHTTPAdapter
+from hargreaves.utils.logs import LogHelper
+
+LogHelper.configure_std_out()
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'OK'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeWebSession:
+    def __init__(self):
+        self.session = requests.Session()
+
+
+def run_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_connection_reused_across_requests():
+    server = run_server()
+    web_session = FakeWebSession()
+    try:
+        connection_stats = configure_connection_pool(web_session, tcp_keepalive=True)
+
+        for step in range(5):
+            assert web_session.session.get(f'http://127.0.0.1:{server.server_port}/step/{step}').text == 'OK'
+
+        assert connection_stats.requests == 5
+        assert connection_stats.new_connections == 1
+        assert connection_stats.reused_connections == 4
+    finally:
+        web_session.session.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_retry_policy_kept():
+    web_session = FakeWebSession()
+    web_session.session.mount('https://', HTTPAdapter(max_retries=3))
+
+    configure_connection_pool(web_session, pool_maxsize=2)
+
+    adapter = web_session.session.get_adapter('https://online.hl.co.uk/my-accounts')
+    assert isinstance(adapter, PooledHTTPAdapter)
+    assert adapter.max_retries.total == 3
+
+
+def test_untuned_without_options():
+    web_session = FakeWebSession()
+    default_adapter = web_session.session.get_adapter('https://online.hl.co.uk/my-accounts')
+
+    assert configure_connection_pool(web_session) is None
+
+    assert web_session.session.get_adapter('https://online.hl.co.uk/my-accounts') is default_adapter
+
+
+def test_requests_pool_size_kept_by_default():
+    web_session = FakeWebSession()
+
+    configure_connection_pool(web_session, tcp_keepalive=True)
+
+    adapter = web_session.session.get_adapter('https://online.hl.co.uk/my-accounts')
+    assert isinstance(adapter, PooledHTTPAdapter)
+    assert adapter._pool_connections == DEFAULT_POOLSIZE
+    assert adapter._pool_maxsize == DEFAULT_POOLSIZE
+
+
+def test_untuned_without_requests_session():
+    assert configure_connection_pool(object(), tcp_keepalive=True) is None
@@ -0,0 +1,148 @@
+import threading
+import time
+from http.cookiejar import CookieJar
+
+from hargreaves.authentication.clients import AuthenticationClient
+from hargreaves.config.models import ApiConfiguration
+from hargreaves.session.shared import LoggedInSession
+from requests_tracker.session import IWebSession
+
+ACCOUNTS_URL = 'https://online.hl.co.uk/my-accounts'
+
+
+class FakeResponse:
+    def __init__(self, url: str):
+        self.url = url
+
+
+class ExpiringWebSession(IWebSession):
+    """
+    Bounces every request to the login page until logged_in is set
+    """
+
+    def __init__(self, barrier: threading.Barrier = None):
+        self.logged_in = False
+        self.requests = []
+        self._barrier = barrier
+        self._cookies = CookieJar()
+
+    def get(self, url, request_type=None, params=None, headers=None):
+        self.requests.append(url)
+        if self.logged_in:
+            return FakeResponse(url)
+        if self._barrier is not None:
+            self._barrier.wait()
+        return FakeResponse(AuthenticationClient.LOGIN_URL)
+
+    def post(self, url, request_type=None, data=None, headers=None):
+        return self.get(url)
+
+    @property
+    def cookies(self):
+        return self._cookies
+
+
+class CountingAuthenticationClient(AuthenticationClient):
+    def __init__(self, post_login_url: str = ACCOUNTS_URL):
+        super().__init__()
+        self.calls = 0
+        self._post_login_url = post_login_url
+
+    def login(self, web_session, config, redirect_response=None):
+        self.calls += 1
+        time.sleep(0.05)
+        web_session.logged_in = True
+        return FakeResponse(self._post_login_url)
+
+
+def test_login_on_redirect():
+    web_session = ExpiringWebSession()
+    authentication_client = CountingAuthenticationClient()
+    logged_in_session = LoggedInSession(web_session, __get_config(), authentication_client)
+
+    response = logged_in_session.get(ACCOUNTS_URL)
+
+    assert response.url == ACCOUNTS_URL
+    assert authentication_client.calls == 1
+    assert logged_in_session.login_count == 1
+    assert logged_in_session.logins_avoided == 0
+    # post-login redirect landed on the requested URL, so no replay was needed
+    assert web_session.requests == [ACCOUNTS_URL]
+
+
+def test_replay_after_unexpected_post_login_url():
+    web_session = ExpiringWebSession()
+    authentication_client = CountingAuthenticationClient(post_login_url='https://online.hl.co.uk/my-accounts/other')
+    logged_in_session = LoggedInSession(web_session, __get_config(), authentication_client)
+
+    response = logged_in_session.post('https://online.hl.co.uk/my-accounts/pending_orders')
+
+    assert response.url == 'https://online.hl.co.uk/my-accounts/pending_orders'
+    assert len(web_session.requests) == 2
+
+
+def test_concurrent_requests_share_one_login():
+    thread_count = 5
+    web_session = ExpiringWebSession(barrier=threading.Barrier(thread_count))
+    authentication_client = CountingAuthenticationClient()
+    logged_in_session = LoggedInSession(web_session, __get_config(), authentication_client)
+
+    responses = []
+
+    def request(index: int):
+        responses.append(logged_in_session.get(f"{ACCOUNTS_URL}/{index}"))
+
+    threads = [threading.Thread(target=request, args=(index,)) for index in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert authentication_client.calls == 1
+    assert logged_in_session.login_count == 1
+    assert logged_in_session.logins_avoided == thread_count - 1
+    assert sorted(response.url for response in responses) == \
+           sorted(f"{ACCOUNTS_URL}/{index}" for index in range(thread_count))
+
+
+class ReplayBarrierWebSession(ExpiringWebSession):
+    """
+    Holds every replay until all of them are in flight, which deadlocks if they are replayed one at a time
+    """
+
+    def __init__(self, thread_count: int):
+        super().__init__(barrier=threading.Barrier(thread_count))
+        self._replay_barrier = threading.Barrier(thread_count, timeout=5)
+
+    def get(self, url, request_type=None, params=None, headers=None):
+        if self.logged_in:
+            self._replay_barrier.wait()
+        return super().get(url, request_type, params, headers)
+
+
+def test_concurrent_requests_replay_in_parallel():
+    thread_count = 3
+    web_session = ReplayBarrierWebSession(thread_count)
+    logged_in_session = LoggedInSession(web_session, __get_config(), CountingAuthenticationClient())
+
+    errors = []
+
+    def request(index: int):
+        try:
+            logged_in_session.get(f"{ACCOUNTS_URL}/{index}")
+        except threading.BrokenBarrierError as ex:
+            errors.append(ex)
+
+    threads = [threading.Thread(target=request, args=(index,)) for index in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert logged_in_session.login_count == 1
+    assert logged_in_session.last_activity is not None
+
+
+def __get_config():
+    return ApiConfiguration('test', 'password', '010204', '567890')
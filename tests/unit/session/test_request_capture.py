@@ -0,0 +1,106 @@
+import json
+
+import pytest
+import requests
+import requests_mock
+
+from hargreaves.session.capture import CaptureMode, RequestCapture, trim_request_session_context
+from hargreaves.session.shared import LoggedInSession
+from hargreaves.utils.logs import LogHelper
+
+LogHelper.configure_std_out()
+
+ACCOUNTS_URL = 'https://online.hl.co.uk/my-accounts'
+LOGIN_URL = 'https://online.hl.co.uk/my-accounts/login-step-two'
+
+
+class FakeRequestSessionContext:
+    def __init__(self):
+        self.request_contexts = []
+        self.pending_redirects = [1, 2, 3, 4]
+
+
+def send_requests(request_capture: RequestCapture, count: int, request_session_context=None):
+    session = requests.Session()
+    with requests_mock.Mocker(session=session) as mocker:
+        mocker.get(ACCOUNTS_URL, text='<html>Welcome username</html>', headers={'Set-Cookie': 'hl_vt=123'})
+        mocker.post(LOGIN_URL, text='OK')
+        for request_number in range(count):
+            if request_session_context is not None:
+                request_session_context.request_contexts.append(request_number)
+            response = session.get(ACCOUNTS_URL, params={'request': request_number})
+            request_capture.record(response, request_session_context)
+        response = session.post(LOGIN_URL, data={'secure-number[1]': '4', 'pwd': 'password'})
+        request_capture.record(response, request_session_context)
+
+
+def test_ring_buffer_keeps_last_requests():
+    request_session_context = FakeRequestSessionContext()
+    request_capture = RequestCapture(mode=CaptureMode.RING_BUFFER, max_entries=3,
+                                     sensitive_values=['username', 'password'],
+                                     sensitive_params=['secure-number['])
+
+    send_requests(request_capture, 10, request_session_context)
+
+    entries = request_capture.entries
+    assert len(entries) == 3
+    assert [entry['request']['url'] for entry in entries[:2]] == [f'{ACCOUNTS_URL}?request=8',
+                                                                  f'{ACCOUNTS_URL}?request=9']
+    assert entries[0]['response']['content']['text'] == '<html>Welcome ********</html>'
+    assert {'name': 'Set-Cookie', 'value': '********'} in entries[0]['response']['headers']
+    assert entries[2]['request']['postData']['text'] == 'secure-number%5B1%5D=********&pwd=********'
+    assert request_session_context.request_contexts == [7, 8, 9]
+    # only the request history is trimmed
+    assert request_session_context.pending_redirects == [1, 2, 3, 4]
+
+
+def test_off_keeps_nothing():
+    request_session_context = FakeRequestSessionContext()
+    request_capture = RequestCapture(mode=CaptureMode.OFF)
+
+    send_requests(request_capture, 5, request_session_context)
+
+    assert request_capture.entries == []
+    assert request_session_context.request_contexts == []
+
+
+def test_stream_writes_valid_har_after_every_entry(tmp_path):
+    har_path = tmp_path / 'session.har'
+    request_capture = RequestCapture(mode=CaptureMode.STREAM, path=str(har_path))
+
+    with open(har_path, encoding='utf-8') as har_file:
+        assert json.load(har_file)['log']['entries'] == []
+
+    send_requests(request_capture, 2)
+
+    with open(har_path, encoding='utf-8') as har_file:
+        har = json.load(har_file)
+    assert har['log']['version'] == '1.2'
+    assert [entry['request']['method'] for entry in har['log']['entries']] == ['GET', 'GET', 'POST']
+    assert request_capture.entries == []
+
+    request_capture.close()
+
+
+def test_trimming_an_unknown_context_fails_loudly():
+    with pytest.raises(AttributeError, match=r"has no 'request_contexts' list"):
+        trim_request_session_context(object(), 10)
+
+
+def test_stream_never_overwrites_an_earlier_capture(tmp_path):
+    har_path = tmp_path / 'session.har'
+    har_path.write_text('earlier capture')
+
+    with pytest.raises(FileExistsError):
+        RequestCapture(mode=CaptureMode.STREAM, path=str(har_path))
+    assert har_path.read_text() == 'earlier capture'
+
+
+def test_closing_the_session_closes_the_stream(tmp_path):
+    request_capture = RequestCapture(mode=CaptureMode.STREAM, path=str(tmp_path / 'session.har'))
+
+    with LoggedInSession(web_session=None, config=None, request_capture=request_capture):
+        pass
+
+    with pytest.raises(ValueError, match=r"is closed"):
+        send_requests(request_capture, 1)
@@ -0,0 +1,158 @@
+from http.cookiejar import CookieJar
+
+from hargreaves.config.models import ApiConfiguration
+from hargreaves.session.cache import ResponseCache, CacheRule, ACCOUNT_PAGE_PATTERN
+from hargreaves.session.shared import LoggedInSession
+from requests_tracker.session import IWebSession
+
+ACCOUNTS_URL = 'https://online.hl.co.uk/my-accounts'
+ACCOUNT_URL = 'https://online.hl.co.uk/my-accounts/account_summary/account/{}'
+CSV_URL = 'https://online.hl.co.uk/my-accounts/account_summary_csv/sort/stock/sortdir/asc'
+SEARCH_URL = 'https://online.hl.co.uk/ajaxx/stocks.php'
+
+
+class FakeResponse:
+    def __init__(self, url: str, text: str):
+        self.url = url
+        self.text = text
+        self.status_code = 200
+
+
+class RecordingWebSession(IWebSession):
+    """
+    Serves the CSV of the account page visited last, like HL does
+    """
+
+    def __init__(self):
+        self.requests = []
+        self._current_account = None
+        self._cookies = CookieJar()
+
+    def get(self, url, request_type=None, params=None, headers=None):
+        self.requests.append(('GET', url))
+        if url.startswith(ACCOUNT_URL.format('')):
+            self._current_account = url.rsplit('/', 1)[1]
+        if url == CSV_URL:
+            return FakeResponse(url, f'csv for account {self._current_account}')
+        return FakeResponse(url, f'page {url} {params}')
+
+    def post(self, url, request_type=None, data=None, headers=None):
+        self.requests.append(('POST', url))
+        return FakeResponse(url, 'posted')
+
+    @property
+    def cookies(self):
+        return self._cookies
+
+
+class FakeTime:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_repeated_gets_served_from_cache():
+    web_session, logged_in_session, response_cache, fake_time = __create_session()
+
+    assert logged_in_session.get(ACCOUNTS_URL).text == logged_in_session.get(ACCOUNTS_URL).text
+    assert web_session.requests == [('GET', ACCOUNTS_URL)]
+    assert response_cache.hits == 1
+    assert response_cache.misses == 1
+
+    fake_time.now += 61
+    logged_in_session.get(ACCOUNTS_URL)
+    assert len(web_session.requests) == 2
+
+
+def test_search_cached_ignoring_pid():
+    web_session, logged_in_session, response_cache, fake_time = __create_session()
+
+    logged_in_session.get(SEARCH_URL, params={'pid': 1, 'sq': 'GSK'})
+    logged_in_session.get(SEARCH_URL, params={'pid': 2, 'sq': 'GSK'})
+    logged_in_session.get(SEARCH_URL, params={'pid': 3, 'sq': 'AZN'})
+
+    assert web_session.requests == [('GET', SEARCH_URL), ('GET', SEARCH_URL)]
+    assert response_cache.hits == 1
+
+
+def test_csv_cached_per_account_page():
+    web_session, logged_in_session, response_cache, fake_time = __create_session()
+
+    for account_id in [1, 2, 1, 2]:
+        logged_in_session.get(ACCOUNT_URL.format(account_id))
+        assert logged_in_session.get(CSV_URL).text == f'csv for account {account_id}'
+
+    assert len(web_session.requests) == 4
+    assert response_cache.hits == 4
+
+
+def test_csv_miss_revisits_account_page():
+    web_session, logged_in_session, response_cache, fake_time = __create_session()
+
+    for account_id in [1, 2]:
+        logged_in_session.get(ACCOUNT_URL.format(account_id))
+        logged_in_session.get(CSV_URL)
+
+    fake_time.now += 20  # the CSV has expired but not the account pages
+    web_session.requests.clear()
+
+    logged_in_session.get(ACCOUNT_URL.format(1))
+    assert logged_in_session.get(CSV_URL).text == 'csv for account 1'
+    assert web_session.requests == [('GET', ACCOUNT_URL.format(1)), ('GET', CSV_URL)]
+
+
+def test_order_submission_invalidates():
+    web_session, logged_in_session, response_cache, fake_time = __create_session()
+
+    logged_in_session.get(ACCOUNTS_URL)
+    logged_in_session.post('https://online.hl.co.uk/my-accounts/confirm_equity_deal')
+    logged_in_session.get(ACCOUNTS_URL)
+    assert response_cache.hits == 1
+
+    logged_in_session.post('https://online.hl.co.uk/my-accounts/equity_confirmation')
+    logged_in_session.get(ACCOUNTS_URL)
+    assert response_cache.hits == 1
+    assert response_cache.invalidations == 1
+    assert web_session.requests.count(('GET', ACCOUNTS_URL)) == 2
+
+
+def test_expired_and_least_recently_used_entries_dropped():
+    web_session, logged_in_session, response_cache, fake_time = __create_session(max_entries=3)
+
+    for search_string in ['GSK', 'AZN']:
+        logged_in_session.get(SEARCH_URL, params={'sq': search_string})
+    logged_in_session.get(ACCOUNTS_URL)
+    assert len(response_cache) == 3
+
+    # the account list expires, and is dropped by the next search stored rather than kept until it is requested again
+    fake_time.now += 61
+    logged_in_session.get(SEARCH_URL, params={'sq': 'VOD'})
+    assert len(response_cache) == 3
+
+    # GSK was used more recently than AZN, so AZN is evicted to make room
+    logged_in_session.get(SEARCH_URL, params={'sq': 'GSK'})
+    logged_in_session.get(SEARCH_URL, params={'sq': 'BP.'})
+    assert len(response_cache) == 3
+    requests_sent = len(web_session.requests)
+    logged_in_session.get(SEARCH_URL, params={'sq': 'GSK'})
+    assert len(web_session.requests) == requests_sent
+    logged_in_session.get(SEARCH_URL, params={'sq': 'AZN'})
+    assert len(web_session.requests) == requests_sent + 1
+
+
+def __create_session(max_entries: int = 256):
+    fake_time = FakeTime(now=1000)
+    response_cache = ResponseCache(rules=[
+        CacheRule(pattern=r'^https://online\.hl\.co\.uk/my-accounts$', ttl_seconds=60),
+        CacheRule(pattern=ACCOUNT_PAGE_PATTERN, ttl_seconds=60),
+        CacheRule(pattern=r'^https://online\.hl\.co\.uk/my-accounts/account_summary_csv/', ttl_seconds=10,
+                  context_pattern=ACCOUNT_PAGE_PATTERN),
+        CacheRule(pattern=r'^https://online\.hl\.co\.uk/ajaxx/stocks\.php$', ttl_seconds=300),
+    ], time_source=fake_time, max_entries=max_entries)
+    web_session = RecordingWebSession()
+    logged_in_session = LoggedInSession(web_session, ApiConfiguration(
+        username='username', password='password', secure_number='123456', date_of_birth='010170'),
+        response_cache=response_cache)
+    return web_session, logged_in_session, response_cache, fake_time
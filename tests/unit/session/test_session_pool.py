@@ -0,0 +1,122 @@
+import threading
+
+import pytest
+
+from hargreaves.config.models import ApiConfiguration
+from hargreaves.session.errors import SessionPoolError
+from hargreaves.session.pool import SessionPool
+
+
+class FakeCookiesStorage:
+    def __init__(self, profile: str):
+        self.profile = profile
+        self.saved = 0
+
+    def save(self, cookies):
+        self.saved += 1
+
+
+class FakeLoggedInSession:
+    login_count = 1
+    logins_avoided = 0
+
+    def __init__(self, cookies_storage, config):
+        self.cookies_storage = cookies_storage
+        self.config = config
+        self.cookies = []
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeTime:
+    def __init__(self, now: float = 0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def create_pool(max_sessions: int = 2, fake_time: FakeTime = None):
+    pool = SessionPool(cookies_storage_factory=FakeCookiesStorage,
+                       max_sessions=max_sessions,
+                       idle_timeout_seconds=60,
+                       session_factory=FakeLoggedInSession,
+                       time_source=fake_time or FakeTime())
+    for profile in ['alice', 'bob', 'carol']:
+        pool.register(profile, ApiConfiguration(profile, 'password', '010204', '567890'))
+    return pool
+
+
+def test_lease_reuses_warm_session():
+    pool = create_pool()
+
+    with pool.session('alice') as first:
+        pass
+    with pool.session('alice') as second:
+        pass
+
+    assert first is second
+    assert first.cookies_storage.profile == 'alice'
+    assert pool.stats()['alice'].lease_count == 2
+    assert pool.stats()['alice'].leased is False
+
+
+def test_unknown_profile():
+    with pytest.raises(SessionPoolError, match="Unknown profile 'dave'"):
+        create_pool().lease('dave')
+
+
+def test_full_pool_evicts_least_recently_used():
+    fake_time = FakeTime()
+    pool = create_pool(max_sessions=2, fake_time=fake_time)
+
+    alice = pool.lease('alice')
+    pool.release('alice')
+    fake_time.now = 10
+    pool.lease('bob')
+    pool.release('bob')
+
+    pool.lease('carol')
+
+    assert sorted(pool.stats().keys()) == ['bob', 'carol']
+    assert alice.cookies_storage.saved == 1
+
+
+def test_full_pool_of_leased_sessions_times_out():
+    pool = create_pool(max_sessions=1)
+    pool.lease('alice')
+
+    with pytest.raises(SessionPoolError, match="Timed out waiting for a session for profile 'bob'"):
+        pool.lease('bob', timeout=0.05)
+
+
+def test_lease_waits_for_release():
+    pool = create_pool()
+    pool.lease('alice')
+    leased = []
+
+    thread = threading.Thread(target=lambda: leased.append(pool.lease('alice', timeout=5)))
+    thread.start()
+    pool.release('alice')
+    thread.join()
+
+    assert len(leased) == 1
+    assert pool.stats()['alice'].lease_count == 2
+
+
+def test_evict_idle():
+    fake_time = FakeTime()
+    pool = create_pool(fake_time=fake_time)
+
+    with pool.session('alice') as alice_session:
+        pass
+    fake_time.now = 30
+    with pool.session('bob'):
+        pass
+
+    fake_time.now = 70
+    assert pool.evict_idle() == 1
+    assert list(pool.stats().keys()) == ['bob']
+    assert alice_session.closed
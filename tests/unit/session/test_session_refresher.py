@@ -0,0 +1,147 @@
+import pytest
+from requests.cookies import RequestsCookieJar
+
+from hargreaves.config.models import ApiConfiguration
+from hargreaves.session.cache import ResponseCache
+from hargreaves.session.errors import SessionError
+from hargreaves.session.refresher import KEEPALIVE_URL, SessionRefresher
+from hargreaves.session.shared import LoggedInSession
+from hargreaves.utils import clock
+from hargreaves.utils.cookies import HLCookieHelper
+
+clock.freeze_time()
+
+
+class FakeLoggedInSession:
+    def __init__(self, last_activity=None):
+        self.last_activity = last_activity
+        self.cookies = RequestsCookieJar()
+        HLCookieHelper.set_default_cookies(self.cookies)
+
+
+class FakeResponse:
+    def __init__(self, url: str):
+        self.url = url
+        self.status_code = 200
+
+
+class MockSession:
+    def __init__(self):
+        self.cookies = RequestsCookieJar()
+        HLCookieHelper.set_default_cookies(self.cookies)
+
+    def get(self, url, request_type=None, params=None, headers=None):
+        return FakeResponse(url)
+
+
+class Keepalives(list):
+    """
+    Records the keepalives, each of which reaches HL at the current time
+    """
+
+    def __init__(self, fake_time=None):
+        super().__init__()
+        self._fake_time = fake_time
+
+    def __call__(self, web_session):
+        self.append(web_session)
+        web_session.last_activity = 0 if self._fake_time is None else self._fake_time()
+
+
+class FakeTime:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_session_timeout_from_hltimer_cookie():
+    cookie_jar = RequestsCookieJar()
+    assert HLCookieHelper.get_session_timeout(cookie_jar) == 900
+
+    HLCookieHelper.set_logged_in_cookies(cookie_jar)
+    assert HLCookieHelper.get_session_timeout(cookie_jar) == 900
+
+
+def test_refresh_only_when_close_to_timeout():
+    web_session = FakeLoggedInSession(last_activity=1000)
+    fake_time = FakeTime(now=1000)
+    keepalives = Keepalives(fake_time)
+
+    refresher = SessionRefresher(web_session, keepalive=keepalives, margin_seconds=180,
+                                 time_source=fake_time)
+
+    assert refresher.seconds_until_refresh() == 720
+    assert refresher.refresh_if_due() is False
+
+    fake_time.now = 1000 + 719
+    assert refresher.refresh_if_due() is False
+
+    fake_time.now = 1000 + 720
+    assert refresher.refresh_if_due() is True
+    assert keepalives == [web_session]
+    assert refresher.refresh_count == 1
+
+
+def test_refresh_before_first_request():
+    web_session = FakeLoggedInSession(last_activity=None)
+    fake_time = FakeTime(now=1000)
+    keepalives = Keepalives(fake_time)
+
+    refresher = SessionRefresher(web_session, keepalive=keepalives, margin_seconds=180, time_source=fake_time)
+
+    # an unused session is given the full interval rather than logged in straight away
+    assert refresher.seconds_until_refresh() == 720
+    assert refresher.refresh_if_due() is False
+
+    fake_time.now = 1000 + 720
+    assert refresher.refresh_if_due() is True
+    assert len(keepalives) == 1
+
+
+@pytest.mark.parametrize('error', [ConnectionError("Connection refused"), SessionError("Unable to log in")])
+def test_refresh_failure_is_counted(error):
+    def failing_keepalive(web_session):
+        raise error
+
+    refresher = SessionRefresher(FakeLoggedInSession(last_activity=1000), keepalive=failing_keepalive,
+                                 time_source=FakeTime(now=2000))
+
+    assert refresher.refresh_if_due() is True
+    assert refresher.refresh_count == 0
+    assert refresher.failure_count == 1
+
+
+def test_refresh_interrupt_is_raised():
+    def interrupted_keepalive(web_session):
+        raise KeyboardInterrupt()
+
+    refresher = SessionRefresher(FakeLoggedInSession(last_activity=1000), keepalive=interrupted_keepalive,
+                                 time_source=FakeTime(now=2000))
+
+    with pytest.raises(KeyboardInterrupt):
+        refresher.refresh_if_due()
+
+
+def test_refresh_not_counted_unless_it_reached_hl():
+    web_session = FakeLoggedInSession(last_activity=1000)
+    hltimer = web_session.cookies.get('hltimer')
+
+    # a keepalive answered from the response cache leaves last_activity alone
+    refresher = SessionRefresher(web_session, keepalive=lambda session: None, time_source=FakeTime(now=2000))
+
+    assert refresher.refresh_if_due() is True
+    assert refresher.refresh_count == 0
+    assert web_session.cookies.get('hltimer') == hltimer
+
+
+def test_default_keepalive_bypasses_response_cache():
+    web_session = LoggedInSession(MockSession(), ApiConfiguration('test', 'password', '010204', '567890'),
+                                  response_cache=ResponseCache())
+    web_session.get(KEEPALIVE_URL)
+
+    refresher = SessionRefresher(web_session, time_source=lambda: web_session.last_activity + 900)
+    assert refresher.refresh_if_due() is True
+    assert refresher.refresh_count == 1
+    assert web_session.response_cache.hits == 0
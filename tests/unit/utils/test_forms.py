@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from hargreaves.orders.manual.parsers import parse_manual_order_entry_page
+from hargreaves.search.models import InvestmentCategoryTypes
+from hargreaves.utils import forms
+from hargreaves.utils.forms import extract_hidden_inputs, HiddenInputExtractor
+from hargreaves.utils.logs import LogHelper
+
+LogHelper.configure_std_out()
+
+FILES = Path(__file__).parent.parent
+
+
+def test_extract_hidden_inputs():
+    html = """<html><body>
+<form id="search"><input type="hidden" name="hl_vt" value="1"/></form>
+<form id="oh_form" method="post">
+    <input type="hidden" name="hl_vt" value="123"/>
+    <input type="text" name="quantity" value="10"/>
+    <input type="hidden" name="security_name" value="Marks &amp; Spencer">
+</form>
+<form id="oh_form"><input type="hidden" name="hl_vt" value="456"/></form>
+</body></html>"""
+
+    assert extract_hidden_inputs(html, 'oh_form') == {'hl_vt': '123', 'security_name': 'Marks & Spencer'}
+
+
+def test_extract_hidden_inputs_fallback_reasons():
+    assert HiddenInputExtractor('oh_form').extract('<form id="other"></form>') is None
+
+    cases = [
+        ('<form id="other"></form>', forms.FORM_NOT_FOUND),
+        ('<form id="oh_form"><input type="hidden" name="hl_vt" value="1"/>', forms.FORM_NOT_CLOSED),
+        ('<form id="oh_form"><input type="hidden" name="hl_vt"/></form>', forms.INCOMPLETE_INPUT),
+        ('<form id="oh_form"><form id="inner"></form></form>', forms.MALFORMED_HTML),
+    ]
+    for html, reason in cases:
+        extractor = HiddenInputExtractor('oh_form')
+        assert extractor.extract(html) is None
+        assert extractor.fallback_reason == reason
+
+
+def test_parser_fast_path_stats():
+    forms.stats.reset()
+
+    order_html = (FILES / 'orders/manual/files/all/manual-order-entry-uk-equity.html').read_text()
+    parse_manual_order_entry_page(order_html=order_html, category_code=InvestmentCategoryTypes.EQUITIES)
+
+    error_html = (FILES / 'orders/manual/files/all/manual-order-entry-error.html').read_text()
+    try:
+        parse_manual_order_entry_page(order_html=error_html, category_code=InvestmentCategoryTypes.EQUITIES)
+    except BaseException:
+        pass
+
+    assert forms.stats.hits == 1
+    assert forms.stats.fallbacks == {forms.FORM_NOT_FOUND: 1}
+    assert forms.stats.hit_rate == 0.5
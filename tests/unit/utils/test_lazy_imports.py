@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+from hargreaves import orders, session
+
+PROBE = "import sys, hargreaves.{module}; print(','.join(name for name in ('bs4', 'requests') if name in sys.modules))"
+
+
+def test_packages_import_without_heavy_dependencies():
+    for module in ['config', 'search', 'account', 'session', 'orders', 'deals', 'aio']:
+        loaded = subprocess.run([sys.executable, '-c', PROBE.format(module=module)],
+                                check=True, capture_output=True, text=True).stdout.strip()
+        assert loaded == '', f"importing hargreaves.{module} loaded {loaded}"
+
+
+def test_lazy_attributes_resolve_on_first_use():
+    from hargreaves.orders.market.clients import MarketOrderClient
+    from hargreaves.session.pool import SessionPool
+
+    assert orders.MarketOrderClient is MarketOrderClient
+    assert session.SessionPool is SessionPool
+    assert 'SessionPool' in dir(session)
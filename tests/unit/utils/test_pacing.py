@@ -0,0 +1,185 @@
+import asyncio
+import threading
+import time
+from http.cookiejar import CookieJar
+
+from requests import Response
+
+from hargreaves.config.models import ApiConfiguration
+from hargreaves.session.shared import LoggedInSession
+from hargreaves.utils import clock, pacing
+from hargreaves.utils.logs import LogHelper
+from hargreaves.utils.pacing import AdaptivePacing, FixedPacing, NoPacing, TokenBucketPacing
+
+LogHelper.configure_std_out()
+clock.freeze_time()
+
+
+class FakeTime:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeWebSession:
+    def __init__(self, pacing_policy=None):
+        self.pacing_policy = pacing_policy
+
+
+class OverlapClock(clock.MockClock):
+    """
+    Counts the most pauses in progress at once
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.pausing = 0
+        self.most_pausing = 0
+        self.lock = threading.Lock()
+
+    def enter(self):
+        with self.lock:
+            self.pausing += 1
+            self.most_pausing = max(self.most_pausing, self.pausing)
+
+    def leave(self):
+        with self.lock:
+            self.pausing -= 1
+
+    def pause(self, seconds: float):
+        self.enter()
+        time.sleep(0.05)
+        self.leave()
+
+    async def pause_async(self, seconds: float):
+        self.enter()
+        await asyncio.sleep(0.05)
+        self.leave()
+
+
+def create_response(status_code: int, headers: dict = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+def test_fixed_pacing_between_bounds():
+    fixed_pacing = FixedPacing(minimum=1, maximum=2)
+
+    assert all(1 <= fixed_pacing.delay() <= 2 for _ in range(20))
+
+
+def test_token_bucket_allows_burst_then_paces():
+    fake_time = FakeTime(now=100)
+    token_bucket = TokenBucketPacing(rate=2, burst=3, time_source=fake_time)
+
+    assert [token_bucket.delay() for _ in range(3)] == [0, 0, 0]
+    assert token_bucket.delay() == 0.5
+    assert token_bucket.delay() == 1.0
+
+    fake_time.now = 110
+    assert token_bucket.delay() == 0
+
+
+def test_token_bucket_is_per_host():
+    token_bucket = TokenBucketPacing(rate=1, burst=1, time_source=FakeTime(now=0))
+
+    assert token_bucket.delay('https://online.hl.co.uk/my-accounts') == 0
+    assert token_bucket.delay('https://online.hl.co.uk/my-accounts') == 1
+    assert token_bucket.delay('https://www.hl.co.uk/ajax/funds/fund-search/search') == 0
+
+
+def test_adaptive_pacing_backs_off_and_recovers():
+    adaptive_pacing = AdaptivePacing(minimum_delay=0, maximum_delay=8, initial_backoff=1, backoff_factor=2)
+    assert adaptive_pacing.delay() == 0
+
+    for expected_delay in [1, 2, 4, 8, 8]:
+        adaptive_pacing.observe('https://online.hl.co.uk/my-accounts', create_response(429))
+        assert adaptive_pacing.delay() == expected_delay
+
+    for expected_delay in [4, 2, 1, 0.5, 0.25, 0]:
+        adaptive_pacing.observe('https://online.hl.co.uk/my-accounts', create_response(200))
+        assert adaptive_pacing.delay() == expected_delay
+
+
+def test_adaptive_pacing_honours_retry_after():
+    adaptive_pacing = AdaptivePacing(maximum_delay=30)
+
+    adaptive_pacing.observe('https://online.hl.co.uk/my-accounts',
+                            create_response(503, headers={'Retry-After': '12'}))
+
+    assert adaptive_pacing.current_delay == 12
+
+
+def test_policy_for_session_or_default():
+    no_pacing = NoPacing()
+
+    assert pacing.policy_for(FakeWebSession(pacing_policy=no_pacing)) is no_pacing
+    assert pacing.policy_for(FakeWebSession()) is pacing.manager.get_instance()
+    assert isinstance(pacing.policy_for(object()), FixedPacing)
+
+
+class PushBackWebSession:
+    cookies = CookieJar()
+
+    def get(self, url, request_type=None, params=None, headers=None):
+        response = create_response(429)
+        response.url = url
+        return response
+
+
+def test_process_wide_adaptive_pacing_observes_responses():
+    adaptive_pacing = AdaptivePacing(initial_backoff=1)
+    default_policy = pacing.manager.get_instance()
+    pacing.manager.set_instance(adaptive_pacing)
+    try:
+        logged_in_session = LoggedInSession(PushBackWebSession(), ApiConfiguration('test', 'password', '010204',
+                                                                                   '567890'))
+        logged_in_session.get('https://online.hl.co.uk/my-accounts')
+
+        assert adaptive_pacing.current_delay == 1
+    finally:
+        pacing.manager.set_instance(default_policy)
+
+
+def test_spaced_pauses_take_turns(monkeypatch):
+    overlap_clock = OverlapClock()
+    monkeypatch.setattr(clock.manager, '_instance', overlap_clock)
+    web_session = FakeWebSession(pacing_policy=FixedPacing(minimum=1, maximum=1))
+
+    def pause_together(pause_lock=None):
+        barrier = threading.Barrier(4)
+
+        def pause():
+            barrier.wait()
+            if pause_lock is None:
+                pacing.pause(web_session)
+            else:
+                with pacing.spaced_pauses(pause_lock):
+                    pacing.pause(web_session)
+
+        threads = [threading.Thread(target=pause) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # sessions sharing a policy pause independently
+    pause_together()
+    assert overlap_clock.most_pausing == 4
+
+    # a batch takes turns
+    overlap_clock.most_pausing = 0
+    pause_together(threading.Lock())
+    assert overlap_clock.most_pausing == 1
+
+    async def pause_tasks():
+        with pacing.spaced_pauses(asyncio.Lock()):
+            await asyncio.gather(*(pacing.pause_async(web_session) for _ in range(4)))
+
+    overlap_clock.most_pausing = 0
+    asyncio.run(pause_tasks())
+    assert overlap_clock.most_pausing == 1
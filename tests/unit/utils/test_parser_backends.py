@@ -0,0 +1,154 @@
+from pathlib import Path
+
+import pytest
+
+from hargreaves.account.models import AccountSummary
+from hargreaves.account.parsers.parsers import parse_account_list, parse_account_detail
+from hargreaves.authentication.login.step_one import parse_security_token
+from hargreaves.authentication.login.step_two import parse_secure_numbers
+from hargreaves.orders.manual.parsers import parse_manual_order_entry_page, parse_manual_order_confirmation_page
+from hargreaves.orders.market.parsers import parse_market_order_entry_page, parse_market_order_quote_page, \
+    parse_market_order_confirmation_page
+from hargreaves.orders.models import OrderAmountType
+from hargreaves.orders.pending.parsers import parse_pending_orders, parse_cancel_order_confirmation
+from hargreaves.search.models import InvestmentCategoryTypes
+from hargreaves.utils import soup
+from hargreaves.utils.soup import ParserBackend
+
+FILES = Path(__file__).parent.parent
+
+
+def read(file_name: str) -> str:
+    return (FILES / file_name).read_text()
+
+
+PARSE_CASES = [
+    (parse_account_list, lambda: dict(my_accounts_html=read('account/files/my-accounts.html'))),
+    (parse_account_detail, lambda: dict(account_detail_html=read('account/files/account-summary.html'),
+                                        account_detail_csv=read('account/files/account-summary.csv'),
+                                        account_summary=AccountSummary(account_id=55, account_type='SIPP'))),
+    (parse_security_token, lambda: dict(stage_one_html=read('authentication/files/stage-one-login-mock.html'))),
+    (parse_secure_numbers, lambda: dict(stage_two_html=read('authentication/files/stage-two-login-mock.html'))),
+    (parse_pending_orders, lambda: dict(account_id=70,
+                                        pending_orders_html=read('orders/pending/files/pending-orders-2.html'))),
+    (parse_cancel_order_confirmation, lambda: dict(
+        confirm_html=read('orders/pending/files/pending-order-cancel-1-out-of-2-confirmation.html'))),
+] + [
+    (parse_manual_order_entry_page, lambda file_name=file_name, category_code=category_code: dict(
+        order_html=read(f'orders/manual/files/all/{file_name}'), category_code=category_code))
+    for file_name, category_code in [('manual-order-entry-uk-equity.html', InvestmentCategoryTypes.EQUITIES),
+                                     ('manual-order-entry-us-equity.html', InvestmentCategoryTypes.OVERSEAS)]
+] + [
+    (parse_manual_order_confirmation_page, lambda path=path: dict(
+        confirm_html=read(path), amount_type=OrderAmountType.Quantity))
+    for path in ['orders/manual/files/all/manual-order-entry-error.html',
+                 'orders/manual/files/buy/manual-buy-order-confirmation-uk-equity.html',
+                 'orders/manual/files/buy/manual-buy-order-confirmation-us-equity.html',
+                 'orders/manual/files/sell/manual-sell-order-confirmation-uk-equity.html',
+                 'orders/manual/files/sell/manual-sell-order-confirmation-us-equity.html']
+] + [
+    (parse_market_order_entry_page, lambda path=path: dict(
+        order_html=read(path), category_code=InvestmentCategoryTypes.EQUITIES))
+    for path in ['orders/market/files/all/market-order-entry-uk-equity.html',
+                 'orders/market/files/all/market-order-entry-uk-market-closed.html',
+                 'orders/market/files/all/market-order-entry-us-market-closed.html']
+] + [
+    (parse_market_order_quote_page, lambda path=path, category_code=category_code: dict(
+        quote_html=read(path), category_code=category_code))
+    for path, category_code in [
+        ('orders/market/files/all/market-order-quote-no-live-quote.html', InvestmentCategoryTypes.OVERSEAS),
+        ('orders/market/files/buy/market-buy-order-quote-uk-equity.html', InvestmentCategoryTypes.EQUITIES),
+        ('orders/market/files/buy/market-buy-order-quote-us-equity.html', InvestmentCategoryTypes.OVERSEAS),
+        ('orders/market/files/sell/market-sell-order-quote-uk-equity.html', InvestmentCategoryTypes.EQUITIES),
+        ('orders/market/files/sell/market-sell-order-quote-uk-equity-larger-amount.html',
+         InvestmentCategoryTypes.EQUITIES),
+        ('orders/market/files/sell/market-sell-order-quote-us-equity.html', InvestmentCategoryTypes.OVERSEAS)]
+] + [
+    (parse_market_order_confirmation_page, lambda path=path, category_code=category_code: dict(
+        confirm_html=read(path), category_code=category_code))
+    for path, category_code in [
+        ('orders/market/files/all/market-order-confirmation-failed.html', InvestmentCategoryTypes.EQUITIES),
+        ('orders/market/files/all/market-order-confirmation-no-live-quote.html', InvestmentCategoryTypes.EQUITIES),
+        ('orders/market/files/buy/market-buy-order-confirmation-uk-equity.html', InvestmentCategoryTypes.EQUITIES),
+        ('orders/market/files/buy/market-buy-order-confirmation-us-equity.html', InvestmentCategoryTypes.OVERSEAS),
+        ('orders/market/files/sell/market-sell-order-confirmation-uk-equity.html', InvestmentCategoryTypes.EQUITIES),
+        ('orders/market/files/sell/market-sell-order-confirmation-uk-equity-2.html',
+         InvestmentCategoryTypes.EQUITIES),
+        ('orders/market/files/sell/market-sell-order-confirmation-us-equity.html', InvestmentCategoryTypes.OVERSEAS)]
+]
+
+
+def public_state(value):
+    """
+    The value of every public property, so that results can be compared without relying on __eq__
+    """
+    if isinstance(value, (list, tuple)):
+        return [public_state(item) for item in value]
+    properties = [name for name in dir(type(value)) if isinstance(getattr(type(value), name, None), property)]
+    if not properties:
+        return value
+    return {name: public_state(getattr(value, name)) for name in properties}
+
+
+def parse(parse_function, kwargs: dict, parser: ParserBackend):
+    try:
+        return public_state(parse_function(**kwargs, parser=parser))
+    except BaseException as ex:
+        return type(ex), str(ex)
+
+
+@pytest.mark.parametrize('parser', [parser for parser in ParserBackend if parser != ParserBackend.HTML_PARSER])
+def test_backends_parse_identically(parser: ParserBackend):
+    if not soup.is_available(parser):
+        pytest.skip(f"{parser.value} is not installed")
+
+    for parse_function, kwargs in PARSE_CASES:
+        expected = parse(parse_function, kwargs(), ParserBackend.HTML_PARSER)
+        assert parse(parse_function, kwargs(), parser) == expected, parse_function.__name__
+
+
+def test_default_parser_backend():
+    assert soup.manager.get_instance() == ParserBackend.HTML_PARSER
+
+    try:
+        soup.manager.set_instance('html.parser')
+        assert soup.make_soup('<p id="a">b</p>').find(id='a').text == 'b'
+    finally:
+        soup.manager.set_instance(ParserBackend.HTML_PARSER)
+
+
+@pytest.mark.parametrize('parser', [ParserBackend.HTML_PARSER, ParserBackend.LXML])
+def test_make_soup_parses_only_fragments(parser: ParserBackend):
+    if not soup.is_available(parser):
+        pytest.skip(f"{parser.value} is not installed")
+
+    html = """<html><body><p>Market closed</p>
+<form id="order_entry"><input type="hidden" name="hl_vt" value="123"/></form>
+<form id="search"><input type="hidden" name="hl_vt" value="456"/></form>
+<div class="box error-box spacer-bottom">Order failed</div>
+</body></html>"""
+    fragments = [soup.Fragment('form', id='order_entry'), soup.Fragment('div', class_='error-box')]
+    partial_soup = soup.make_soup(html, parser, fragments)
+
+    assert partial_soup.find('p') is None
+    assert [form['id'] for form in partial_soup.find_all('form')] == ['order_entry']
+    assert partial_soup.find('input', {'name': 'hl_vt'})['value'] == '123'
+    assert partial_soup.select_one('div[class="box error-box spacer-bottom"]').text == 'Order failed'
+
+
+def test_parsers_accept_bytes():
+    for parse_function, kwargs in PARSE_CASES:
+        expected = parse(parse_function, kwargs(), ParserBackend.HTML_PARSER)
+        bytes_kwargs = {name: value.encode('utf-8') if name.endswith(('_html', '_csv')) else value
+                        for name, value in kwargs().items()}
+        assert parse(parse_function, dict(bytes_kwargs, encoding='utf-8'), ParserBackend.HTML_PARSER) == expected, \
+            parse_function.__name__
+
+
+def test_make_soup_decodes_bytes_with_the_given_encoding():
+    markup = '<p>Total value: £1,234</p>'
+
+    assert soup.make_soup(markup.encode('utf-8')).p.text == 'Total value: £1,234'
+    assert soup.make_soup(markup.encode('iso-8859-1'), encoding='iso-8859-1').p.text == 'Total value: £1,234'
+    assert soup.decode(markup.encode('iso-8859-1'), 'iso-8859-1') == markup
+    assert soup.find_all_text('£(\\d),', markup.encode('utf-8')) == ['1']